@@ -18,7 +18,37 @@ along with this program. If not, see <https://www.gnu.org/licenses/>.
 
 
 from .analyzer import Analyzer
+from .batch_runner import BatchConfigResult, BatchRunner
+from .chunked_analyzer import ChunkedAnalyzer
+from .contribution_simulator import ContributionSimulator
+from .correlation_matrix import CorrelationMatrixCalculator
+from .money_weighted_return import compute_xirr
 from .portfolio_performance_generator import PortfolioPerformanceGenerator
+from .precision_report import PrecisionReport
+from .sapi_backends import (
+    SAPI_BACKEND_CHOICES,
+    SAPIBackend,
+    check_sapi_backends,
+    get_sapi_backend,
+)
+from .scenario_replay import ScenarioReplay
+from .universe_screener import UniverseScreener
 
 
-__all__ = ["Analyzer", "PortfolioPerformanceGenerator"]
+__all__ = [
+    "Analyzer",
+    "BatchConfigResult",
+    "BatchRunner",
+    "ChunkedAnalyzer",
+    "ContributionSimulator",
+    "CorrelationMatrixCalculator",
+    "PortfolioPerformanceGenerator",
+    "PrecisionReport",
+    "SAPI_BACKEND_CHOICES",
+    "SAPIBackend",
+    "ScenarioReplay",
+    "check_sapi_backends",
+    "compute_xirr",
+    "get_sapi_backend",
+    "UniverseScreener",
+]
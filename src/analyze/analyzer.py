@@ -20,12 +20,22 @@ along with this program. If not, see <https://www.gnu.org/licenses/>.
 from typing import List
 
 from .portfolio_performance_generator import PortfolioPerformanceGenerator
-from data_struct import PerformancePortfolioComparison, PortfolioComparison
+from .sapi_backends import SAPI_BACKEND_CHOICES
+from data_struct import Asset, PerformancePortfolioComparison, PortfolioComparison
 
 
 class Analyzer:
-    def __init__(self, portfolio_comparison: PortfolioComparison):
+    def __init__(
+        self,
+        portfolio_comparison: PortfolioComparison,
+        precision: str = 'float64',
+        sapi_backend: str = 'auto',
+        attribution: bool = False,
+    ):
         self.portfolio_comparison = portfolio_comparison
+        self.precision = precision
+        self.sapi_backend = sapi_backend
+        self.attribution = attribution
         self._check_validity()
 
         self.performance_portfolio_comparison_list = self.generate_performance_portfolio_comparison_list()
@@ -49,6 +59,9 @@ class Analyzer:
                 portfolio_performance_generator = PortfolioPerformanceGenerator(
                     portfolio=portfolio,
                     date_range=date_range,
+                    precision=self.precision,
+                    sapi_backend=self.sapi_backend,
+                    attribution=self.attribution,
                 )
                 performance_asset = portfolio_performance_generator.get_portfolio_performance_asset()
                 performance_assets.append(performance_asset)
@@ -66,4 +79,8 @@ class Analyzer:
             raise ValueError("Portfolio comparison cannot be empty.")
         if not isinstance(self.portfolio_comparison, PortfolioComparison):
             raise ValueError("Portfolio comparison must be an instance of the PortfolioComparison class.")
+        if self.precision not in Asset.PRECISIONS:
+            raise ValueError(f"Precision must be one of {', '.join(Asset.PRECISIONS)}.")
+        if self.sapi_backend not in SAPI_BACKEND_CHOICES:
+            raise ValueError(f"SAPI backend must be one of {', '.join(SAPI_BACKEND_CHOICES)}.")
         return True
@@ -0,0 +1,213 @@
+"""
+custom-portfolio-analyzer - A tool to model, back-test, and compare the performance of your own custom portfolios.
+Copyright (C) 2025  Fevzi Babaoğlu
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Lesser General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""
+
+
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .portfolio_performance_generator import PortfolioPerformanceGenerator
+from data_struct import (
+    Asset,
+    DateRange,
+    PerformanceAsset,
+    PerformancePortfolioComparison,
+    Portfolio,
+    PortfolioComparison,
+)
+
+
+class BatchConfigResult:
+    def __init__(
+        self,
+        config_path: str,
+        comparison_results: Optional[List[Tuple[PortfolioComparison, List[PerformancePortfolioComparison]]]] = None,
+        error: Optional[str] = None,
+    ):
+        self.config_path = config_path
+        self.comparison_results = comparison_results or []
+        self.error = error
+
+    def get_config_path(self) -> str:
+        return self.config_path
+
+    def get_comparison_results(self) -> List[Tuple[PortfolioComparison, List[PerformancePortfolioComparison]]]:
+        return self.comparison_results
+
+    def get_error(self) -> Optional[str]:
+        return self.error
+
+    def is_successful(self) -> bool:
+        return self.error is None
+
+
+class BatchRunner:
+    """Analyze many comparison config files against one loaded asset universe.
+
+    All configs are parsed first, then every (portfolio, date range) cell is
+    planned across all of them, so that identical cells appearing in several
+    files are computed only once. Cells run on a bounded thread pool. A
+    config that fails to parse, or that contains a failing cell, is reported
+    as failed without stopping the others.
+    """
+
+    def __init__(
+        self,
+        config_paths: List[str],
+        load_comparisons: Callable[[str], List[PortfolioComparison]],
+        max_workers: int = 4,
+    ):
+        self.config_paths = config_paths
+        self.load_comparisons = load_comparisons
+        self.max_workers = max_workers
+        self._check_validity()
+
+        self.planned_cell_count = 0
+        self.unique_cell_count = 0
+        self.results = self.run()
+
+    def get_results(self) -> List[BatchConfigResult]:
+        return self.results
+
+    def get_planned_cell_count(self) -> int:
+        return self.planned_cell_count
+
+    def get_unique_cell_count(self) -> int:
+        return self.unique_cell_count
+
+    def run(self) -> List[BatchConfigResult]:
+        parsed_configs: Dict[str, List[PortfolioComparison]] = {}
+        errors: Dict[str, str] = {}
+        for config_path in self.config_paths:
+            try:
+                parsed_configs[config_path] = self.load_comparisons(config_path)
+            except Exception as e:
+                logging.error(f"Failed to load {config_path}: {e}")
+                errors[config_path] = f"{type(e).__name__}: {e}"
+
+        cells = self._plan_cells(parsed_configs.values())
+        cell_results = self._execute_cells(cells)
+
+        results = []
+        for config_path in self.config_paths:
+            if config_path in errors:
+                results.append(BatchConfigResult(config_path, error=errors[config_path]))
+                continue
+
+            try:
+                comparison_results = [
+                    (portfolio_comparison, self._assemble_comparison(portfolio_comparison, cell_results))
+                    for portfolio_comparison in parsed_configs[config_path]
+                ]
+                results.append(BatchConfigResult(config_path, comparison_results=comparison_results))
+            except Exception as e:
+                logging.error(f"Failed to analyze {config_path}: {e}")
+                results.append(BatchConfigResult(config_path, error=f"{type(e).__name__}: {e}"))
+
+        return results
+
+    @staticmethod
+    def get_cell_key(portfolio: Portfolio, date_range: DateRange) -> tuple:
+        """Identify a cell by what determines its result, ignoring the portfolio title."""
+        return (
+            tuple(
+                (
+                    portfolio_asset.get_asset().get_code(),
+                    portfolio_asset.get_weight(),
+                    portfolio_asset.get_withholding_tax_rate(),
+                )
+                for portfolio_asset in portfolio.get_assets()
+            ),
+            date_range.get_start_date(),
+            date_range.get_end_date(),
+            date_range.get_frequency(),
+        )
+
+    def _plan_cells(self, comparison_lists) -> Dict[tuple, Tuple[Portfolio, DateRange]]:
+        cells = {}
+        for portfolio_comparisons in comparison_lists:
+            for portfolio_comparison in portfolio_comparisons:
+                for date_range in portfolio_comparison.get_date_ranges():
+                    for portfolio in portfolio_comparison.get_portfolios():
+                        self.planned_cell_count += 1
+                        cells.setdefault(self.get_cell_key(portfolio, date_range), (portfolio, date_range))
+
+        self.unique_cell_count = len(cells)
+        logging.info(f"Planned {self.planned_cell_count} cells, {self.unique_cell_count} unique")
+        return cells
+
+    def _execute_cells(self, cells: Dict[tuple, Tuple[Portfolio, DateRange]]) -> Dict[tuple, object]:
+        """Run every cell, keeping either its performance asset or the exception it raised."""
+        def execute(cell):
+            portfolio, date_range = cell
+            try:
+                return PortfolioPerformanceGenerator(
+                    portfolio=portfolio,
+                    date_range=date_range,
+                ).get_portfolio_performance_asset().get_asset()
+            except Exception as e:
+                return e
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            return dict(zip(cells.keys(), executor.map(execute, cells.values())))
+
+    def _assemble_comparison(
+        self,
+        portfolio_comparison: PortfolioComparison,
+        cell_results: Dict[tuple, object],
+    ) -> List[PerformancePortfolioComparison]:
+        performance_portfolio_comparison_list = []
+
+        for date_range in portfolio_comparison.get_date_ranges():
+            performance_assets = []
+
+            for portfolio in portfolio_comparison.get_portfolios():
+                cell_result = cell_results[self.get_cell_key(portfolio, date_range)]
+                if isinstance(cell_result, Exception):
+                    raise cell_result
+
+                # Shared cells are re-labelled, and each comparison gets its own PerformanceAsset
+                title = portfolio.get_title()
+                performance_asset = PerformanceAsset(
+                    asset=Asset.from_arrays(
+                        code=PortfolioPerformanceGenerator.get_portfolio_code(title),
+                        name=title,
+                        dates=cell_result.get_dates(),
+                        values=cell_result.get_values(),
+                    ),
+                    is_set_default=portfolio.is_set_default(),
+                )
+                performance_assets.append(performance_asset)
+
+            performance_portfolio_comparison_list.append(PerformancePortfolioComparison(
+                date_range=date_range,
+                performance_assets=performance_assets,
+            ))
+
+        return performance_portfolio_comparison_list
+
+    def _check_validity(self) -> bool:
+        if not self.config_paths:
+            raise ValueError("Config paths cannot be empty.")
+        if not isinstance(self.config_paths, list):
+            raise ValueError("Config paths must be a list.")
+        if not callable(self.load_comparisons):
+            raise ValueError("load_comparisons must be callable.")
+        if not isinstance(self.max_workers, int) or self.max_workers < 1:
+            raise ValueError("Max workers must be a positive integer.")
+        return True
@@ -0,0 +1,214 @@
+"""
+custom-portfolio-analyzer - A tool to model, back-test, and compare the performance of your own custom portfolios.
+Copyright (C) 2025  Fevzi Babaoğlu
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Lesser General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""
+
+
+import logging
+import numpy as np
+import os
+import tempfile
+from typing import Dict, Iterator, List, Optional
+
+from .portfolio_performance_generator import PortfolioPerformanceGenerator
+from .sapi_backends import SAPI_BACKEND_CHOICES
+from data_struct import (
+    Asset,
+    DateRange,
+    PerformanceAsset,
+    PerformancePortfolioComparison,
+    Portfolio,
+    PortfolioComparison,
+)
+
+
+class ChunkedAnalyzer:
+    """Analyze a comparison whose assets do not all fit in memory at once.
+
+    Portfolios are grouped into chunks whose aligned (days x assets) price
+    matrix fits in half of the memory limit. Each chunk matrix is spilled to a
+    memory-mapped file, filled one asset at a time and then evaluated one
+    portfolio at a time. The prices of a portfolio are gathered from the
+    matrix column by column into the other half, which they always fit in as
+    the portfolio holds at most the assets of its chunk. Combined with
+    ``StoredAsset`` only the prices of the current chunk are ever read from
+    the store. The results are identical to
+    those of ``Analyzer``.
+    """
+
+    def __init__(
+        self,
+        portfolio_comparison: PortfolioComparison,
+        memory_limit: int,
+        spill_dir: Optional[str] = None,
+        precision: str = 'float64',
+        sapi_backend: str = 'auto',
+        attribution: bool = False,
+    ):
+        self.portfolio_comparison = portfolio_comparison
+        self.memory_limit = memory_limit
+        self.spill_dir = spill_dir
+        self.precision = precision
+        self.sapi_backend = sapi_backend
+        self.attribution = attribution
+        self._check_validity()
+
+        self.performance_portfolio_comparison_list = self.generate_performance_portfolio_comparison_list()
+
+    def get_portfolio_comparison(self) -> PortfolioComparison:
+        return self.portfolio_comparison
+
+    def get_performance_portfolio_comparison_list(self) -> List[PerformancePortfolioComparison]:
+        return self.performance_portfolio_comparison_list
+
+    def generate_performance_portfolio_comparison_list(self) -> List[PerformancePortfolioComparison]:
+        performance_portfolio_comparison_list = []
+
+        for date_range in self.portfolio_comparison.get_date_ranges():
+            performance_assets = self._generate_performance_assets(date_range)
+
+            performance_portfolio_comparison = PerformancePortfolioComparison(
+                date_range=date_range,
+                performance_assets=performance_assets,
+            )
+            performance_portfolio_comparison_list.append(performance_portfolio_comparison)
+
+        return performance_portfolio_comparison_list
+
+    def get_max_chunk_assets(self, day_count: int) -> int:
+        """Largest number of asset columns whose aligned matrix fits in half of the memory limit."""
+        bytes_per_price = np.dtype(self.precision).itemsize
+        return max(1, (self.memory_limit // 2) // (day_count * bytes_per_price))
+
+    def _generate_performance_assets(self, date_range: DateRange) -> List[PerformanceAsset]:
+        start_day = np.datetime64(date_range.get_start_date(), 'D')
+        day_count = (date_range.get_end_date() - date_range.get_start_date()).days + 1
+        portfolios = self.portfolio_comparison.get_portfolios()
+        chunks = list(self._iter_chunks(portfolios, self.get_max_chunk_assets(day_count)))
+        logging.info(f"Processing {len(portfolios)} portfolios in {len(chunks)} chunks")
+
+        performance_assets = []
+        with tempfile.TemporaryDirectory(dir=self.spill_dir) as temp_dir:
+            for chunk_index, (chunk, assets) in enumerate(chunks):
+                matrix_path = os.path.join(temp_dir, f'chunk_{chunk_index}.npy')
+                matrix = self._write_price_matrix(
+                    matrix_path, assets, date_range, start_day, day_count, self.precision,
+                )
+                columns = {asset.get_code(): column for column, asset in enumerate(assets)}
+
+                for portfolio in chunk:
+                    performance_assets.append(
+                        self._generate_performance_asset(portfolio, date_range, matrix, columns, start_day)
+                    )
+
+                # Unmap before the next chunk so its pages can be released
+                del matrix
+
+        return performance_assets
+
+    @staticmethod
+    def _iter_chunks(portfolios: List[Portfolio], max_chunk_assets: int) -> Iterator[tuple]:
+        """Greedily group consecutive portfolios while their distinct assets fit in one chunk."""
+        chunk: List[Portfolio] = []
+        codes: Dict[str, Asset] = {}
+
+        for portfolio in portfolios:
+            portfolio_assets = {
+                portfolio_asset.get_asset().get_code(): portfolio_asset.get_asset()
+                for portfolio_asset in portfolio.get_assets()
+            }
+            new_codes = portfolio_assets.keys() - codes.keys()
+            if chunk and len(codes) + len(new_codes) > max_chunk_assets:
+                yield chunk, list(codes.values())
+                chunk, codes = [], {}
+            if len(portfolio_assets) > max_chunk_assets:
+                logging.warning(
+                    f"Portfolio {portfolio.get_title()} alone needs more memory than the memory limit allows"
+                )
+
+            chunk.append(portfolio)
+            for code, asset in portfolio_assets.items():
+                codes.setdefault(code, asset)
+
+        if chunk:
+            yield chunk, list(codes.values())
+
+    @staticmethod
+    def _write_price_matrix(
+        matrix_path: str,
+        assets: List[Asset],
+        date_range: DateRange,
+        start_day: np.datetime64,
+        day_count: int,
+        precision: str,
+    ) -> np.ndarray:
+        """Write the (days x assets) price matrix of a chunk to disk, NaN where an asset has no price."""
+        # Column-major, so that each asset column is contiguous on disk
+        matrix = np.lib.format.open_memmap(
+            matrix_path, mode='w+', dtype=precision, shape=(day_count, len(assets)),
+            fortran_order=True,
+        )
+        matrix.fill(np.nan)
+
+        for column, asset in enumerate(assets):
+            dates, values = asset.get_dated_series(date_range)
+            rows = (dates - start_day).astype(np.int64)
+            matrix[rows, column] = values
+
+        matrix.flush()
+        return matrix
+
+    def _generate_performance_asset(
+        self,
+        portfolio: Portfolio,
+        date_range: DateRange,
+        matrix: np.ndarray,
+        columns: Dict[str, int],
+        start_day: np.datetime64,
+    ) -> PerformanceAsset:
+        portfolio_columns = [
+            columns[portfolio_asset.get_asset().get_code()]
+            for portfolio_asset in portfolio.get_assets()
+        ]
+
+        # Align the assets on the days they all have prices for, one contiguous column at a time
+        has_prices = np.ones(len(matrix), dtype=bool)
+        for column in portfolio_columns:
+            has_prices &= ~np.isnan(matrix[:, column])
+        rows = np.flatnonzero(has_prices)
+
+        return PortfolioPerformanceGenerator.compute_performance_asset(
+            portfolio,
+            date_range,
+            start_day + rows,
+            lambda column, indices: matrix[rows[indices], portfolio_columns[column]],
+            self.precision,
+            self.sapi_backend,
+            self.attribution,
+        )
+
+    def _check_validity(self) -> bool:
+        if not self.portfolio_comparison:
+            raise ValueError("Portfolio comparison cannot be empty.")
+        if not isinstance(self.portfolio_comparison, PortfolioComparison):
+            raise ValueError("Portfolio comparison must be an instance of the PortfolioComparison class.")
+        if not isinstance(self.memory_limit, int) or self.memory_limit <= 0:
+            raise ValueError("Memory limit must be a positive integer number of bytes.")
+        if self.precision not in Asset.PRECISIONS:
+            raise ValueError(f"Precision must be one of {', '.join(Asset.PRECISIONS)}.")
+        if self.sapi_backend not in SAPI_BACKEND_CHOICES:
+            raise ValueError(f"SAPI backend must be one of {', '.join(SAPI_BACKEND_CHOICES)}.")
+        return True
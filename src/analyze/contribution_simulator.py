@@ -0,0 +1,268 @@
+"""
+custom-portfolio-analyzer - A tool to model, back-test, and compare the performance of your own custom portfolios.
+Copyright (C) 2025  Fevzi Babaoğlu
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Lesser General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""
+
+
+import numpy as np
+import pandas as pd
+from collections import defaultdict
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from .money_weighted_return import DAYS_PER_YEAR, compute_xirr
+from .portfolio_performance_generator import PortfolioPerformanceGenerator
+from .scenario_replay import ScenarioReplay
+from .total_return import get_after_tax_ratios
+from .universe_screener import UniverseScreener
+from data_struct import Asset, ContributionSchedule, DateRange, DateUtils, PortfolioComparison, TradingCalendar
+
+
+class _ValuePaths(NamedTuple):
+    date_range: DateRange
+    columns: np.ndarray
+    dates: np.ndarray
+    valid: np.ndarray
+    contributed: np.ndarray
+    values: np.ndarray
+
+
+class ContributionSimulator:
+    """Simulate periodic contributions (dollar-cost averaging) into every configured portfolio.
+
+    Each contribution is split between the holdings by the portfolio weights
+    and buys units at that day's prices, which are then held. Portfolios
+    without a contribution schedule invest a single unit at the start. As in
+    the analyzer, a portfolio is only valued on the dates all of its holdings
+    have prices for, contributions are made on the first such date of every
+    period, and distributions are reinvested. The withholding tax of every
+    holding is charged on its gain over the amounts contributed to and
+    reinvested in it.
+
+    The value paths of all portfolios that share a date range are computed
+    together over (dates x portfolios) arrays, and their money-weighted
+    returns are solved for in one batched XIRR over the (portfolio x
+    cashflow) matrix.
+    """
+
+    TABLE_COLUMNS = [
+        'comparison', 'start_date', 'end_date', 'portfolio_code', 'portfolio_title', 'set_default',
+        'contribution_frequency', 'first_date', 'last_date', 'contribution_count', 'total_contributed',
+        'final_value', 'profit', 'money_weighted_return', 'lump_sum_return', 'annualized_lump_sum_return',
+    ]
+    VALUE_PATH_COLUMNS = [
+        'comparison', 'start_date', 'end_date', 'portfolio_code', 'date', 'contributed', 'value',
+    ]
+
+    def __init__(self, assets: List[Asset], portfolio_comparisons: List[PortfolioComparison]):
+        self.assets = assets
+        self.portfolio_comparisons = portfolio_comparisons
+        self._check_validity()
+
+        self.portfolios = [
+            (portfolio_comparison.get_title(), portfolio)
+            for portfolio_comparison in self.portfolio_comparisons
+            for portfolio in portfolio_comparison.get_portfolios()
+        ]
+        self.value_paths: List[_ValuePaths] = []
+        self.contribution_table = self.generate_contribution_table()
+
+    def get_contribution_table(self) -> pd.DataFrame:
+        return self.contribution_table
+
+    def get_value_path_table(self) -> pd.DataFrame:
+        """Contributed amount and after-tax value of every portfolio on every date it is valued on."""
+        tables = []
+        for value_paths in self.value_paths:
+            columns, rows = np.nonzero(value_paths.valid.T)
+            portfolio_columns = value_paths.columns[columns]
+            tables.append(pd.DataFrame({
+                'comparison': [self.portfolios[column][0] for column in portfolio_columns],
+                'start_date': value_paths.date_range.get_start_date(),
+                'end_date': value_paths.date_range.get_end_date(),
+                'portfolio_code': [
+                    PortfolioPerformanceGenerator.get_portfolio_code(self.portfolios[column][1].get_title())
+                    for column in portfolio_columns
+                ],
+                'date': value_paths.dates[rows].astype(object),
+                'contributed': value_paths.contributed[rows, columns],
+                'value': value_paths.values[rows, columns],
+            }, columns=self.VALUE_PATH_COLUMNS))
+        if not tables:
+            return pd.DataFrame(columns=self.VALUE_PATH_COLUMNS)
+        return pd.concat(tables, ignore_index=True)
+
+    def generate_contribution_table(self) -> pd.DataFrame:
+        if not self.portfolios:
+            return pd.DataFrame(columns=self.TABLE_COLUMNS)
+
+        assets, weights, withholding_tax_rates = ScenarioReplay.build_holdings(
+            self.assets, [portfolio for _, portfolio in self.portfolios]
+        )
+        prices, reinvested = UniverseScreener.build_price_matrix(assets, withholding_tax_rates)
+
+        # Portfolios of every comparison that share a date range are simulated together
+        columns_by_range: Dict[Tuple, List[int]] = defaultdict(list)
+        date_ranges = {}
+        column = 0
+        for portfolio_comparison in self.portfolio_comparisons:
+            comparison_columns = range(column, column + len(portfolio_comparison.get_portfolios()))
+            column += len(comparison_columns)
+            for date_range in portfolio_comparison.get_date_ranges():
+                key = (date_range.get_start_date(), date_range.get_end_date())
+                date_ranges.setdefault(key, date_range)
+                columns_by_range[key].extend(comparison_columns)
+
+        tables = [
+            self._simulate_date_range(
+                date_ranges[key], np.array(columns), prices, reinvested,
+                weights[:, columns], withholding_tax_rates,
+            )
+            for key, columns in columns_by_range.items()
+        ]
+        return pd.concat(tables, ignore_index=True)
+
+    def _get_contributions(self, columns: np.ndarray, dates: np.ndarray, valid: np.ndarray) -> np.ndarray:
+        """(dates x portfolios) amounts contributed on the first valid date of every period."""
+        schedules = [self.portfolios[column][1].get_contribution_schedule() for column in columns]
+        frequencies = ContributionSchedule.FREQUENCIES
+        periods = np.stack(
+            [DateUtils.get_periods(dates, frequency).astype(np.int64) for frequency in frequencies], axis=1
+        )[:, [frequencies.index(schedule.get_frequency() if schedule else 'daily') for schedule in schedules]]
+
+        # Periods only grow, so a period starts where it is past every earlier valid one
+        lowest = np.iinfo(np.int64).min
+        previous_periods = np.maximum.accumulate(np.where(valid, periods, lowest), axis=0)
+        previous_periods = np.vstack([np.full((1, len(columns)), lowest), previous_periods[:-1]])
+        is_period_start = valid & (periods > previous_periods)
+
+        # Without a schedule, a single unit is invested so that the value path is the index
+        amounts = np.array([schedule.get_amount() if schedule else 0.0 for schedule in schedules])
+        initial_amounts = np.array([schedule.get_initial_amount() if schedule else 1.0 for schedule in schedules])
+        contributions = np.where(is_period_start, amounts, 0.0)
+        measured = valid.any(axis=0)
+        first_rows = np.argmax(valid, axis=0)
+        contributions[first_rows[measured], np.flatnonzero(measured)] = initial_amounts[measured]
+        return contributions
+
+    def _simulate_date_range(
+        self,
+        date_range: DateRange,
+        columns: np.ndarray,
+        prices: np.ndarray,
+        reinvested: Optional[np.ndarray],
+        weights: np.ndarray,
+        withholding_tax_rates: np.ndarray,
+    ) -> pd.DataFrame:
+        start, end = TradingCalendar.get_offset_bounds(date_range)
+        held = weights > 0
+        window = ScenarioReplay.select_window(
+            prices, reinvested, held, start, end, end,
+            f"{DateUtils.format_date(date_range.get_start_date())}-{DateUtils.format_date(date_range.get_end_date())}",
+            'simulated',
+        )
+        window_prices, window_reinvested, dates, _, valid, measured, first_rows, last_rows = window
+        column_indices = np.arange(len(columns))
+
+        contributions = self._get_contributions(columns, dates, valid)
+        contributed = np.cumsum(contributions, axis=0)
+
+        # One holding at a time, over every portfolio that holds it
+        values = np.zeros(contributions.shape)
+        lump_sum_values = np.zeros(len(columns))
+        for row in np.flatnonzero(held.any(axis=1)):
+            holders = np.flatnonzero(held[row])
+            asset_prices = window_prices[:, row, np.newaxis]
+            purchases = contributions[:, holders]
+            units = weights[row, holders] * np.cumsum(
+                np.divide(purchases, asset_prices, out=np.zeros(purchases.shape), where=purchases > 0), axis=0
+            )
+            holding_values = units * asset_prices
+            cost_bases = weights[row, holders] * contributed[:, holders]
+            if window_reinvested is not None:
+                # The amounts only grow, so a running maximum carries them over the dates without a price
+                asset_reinvested = np.maximum.accumulate(window_reinvested[:, row])
+                # A distribution is paid on the units held before the purchases of its date
+                held_units = np.vstack([np.zeros((1, len(holders))), units[:-1]])
+                cost_bases = cost_bases + np.cumsum(
+                    held_units * np.diff(asset_reinvested, prepend=asset_reinvested[0])[:, np.newaxis], axis=0,
+                )
+            gains = np.maximum(holding_values - cost_bases, 0.0)
+            values[:, holders] += holding_values - withholding_tax_rates[row] * gains
+
+            # The same holding bought once at the start and held, valued as in the analyzer
+            has_reinvested = window_reinvested is not None
+            lump_sum_values[holders] += weights[row, holders] * get_after_tax_ratios(
+                window_prices[first_rows[holders], row],
+                window_prices[last_rows[holders], row],
+                withholding_tax_rates[row],
+                window_reinvested[first_rows[holders], row] if has_reinvested else None,
+                window_reinvested[last_rows[holders], row] if has_reinvested else None,
+            )
+        values = np.where(valid, values, np.nan)
+        self.value_paths.append(_ValuePaths(date_range, columns, dates, valid, contributed, values))
+
+        final_values = np.where(measured, values[last_rows, column_indices], np.nan)
+        total_contributed = np.where(measured, contributed[last_rows, column_indices], np.nan)
+
+        # Contributions are paid in and the final value is taken out on the last valued date
+        cashflows = -contributions
+        cashflows[last_rows[measured], column_indices[measured]] += final_values[measured]
+        flow_rows = np.flatnonzero((cashflows != 0).any(axis=1))
+        flow_years = (dates[flow_rows] - dates[flow_rows[:1]]).astype(np.float64) / DAYS_PER_YEAR
+        money_weighted_returns = compute_xirr(cashflows[flow_rows].T, flow_years)
+
+        lump_sum_returns = np.where(measured, lump_sum_values - 1, np.nan)
+        held_years = (dates[last_rows] - dates[first_rows]).astype(np.float64) / DAYS_PER_YEAR
+        with np.errstate(divide='ignore', invalid='ignore'):
+            annualized_lump_sum_returns = np.where(
+                held_years > 0, np.power(1 + lump_sum_returns, 1 / held_years) - 1, np.nan
+            )
+
+        portfolios = [self.portfolios[column] for column in columns]
+        return pd.DataFrame({
+            'comparison': [title for title, _ in portfolios],
+            'start_date': date_range.get_start_date(),
+            'end_date': date_range.get_end_date(),
+            'portfolio_code': [PortfolioPerformanceGenerator.get_portfolio_code(p.get_title()) for _, p in portfolios],
+            'portfolio_title': [portfolio.get_title() for _, portfolio in portfolios],
+            'set_default': [portfolio.is_set_default() for _, portfolio in portfolios],
+            'contribution_frequency': [
+                schedule.get_frequency() if schedule else None
+                for schedule in (portfolio.get_contribution_schedule() for _, portfolio in portfolios)
+            ],
+            'first_date': window.to_dates(first_rows),
+            'last_date': window.to_dates(last_rows),
+            'contribution_count': np.count_nonzero(contributions, axis=0),
+            'total_contributed': total_contributed,
+            'final_value': final_values,
+            'profit': final_values - total_contributed,
+            'money_weighted_return': money_weighted_returns,
+            'lump_sum_return': lump_sum_returns,
+            'annualized_lump_sum_return': annualized_lump_sum_returns,
+        }, columns=self.TABLE_COLUMNS)
+
+    def _check_validity(self) -> bool:
+        if not self.assets:
+            raise ValueError("Assets cannot be empty.")
+        if not isinstance(self.assets, list):
+            raise ValueError("Assets must be a list.")
+        if not all(isinstance(asset, Asset) for asset in self.assets):
+            raise ValueError("All assets must be instances of the Asset class.")
+        if not isinstance(self.portfolio_comparisons, list):
+            raise ValueError("Portfolio comparisons must be a list.")
+        if not all(isinstance(pc, PortfolioComparison) for pc in self.portfolio_comparisons):
+            raise ValueError("All portfolio comparisons must be instances of the PortfolioComparison class.")
+        return True
@@ -0,0 +1,223 @@
+"""
+custom-portfolio-analyzer - A tool to model, back-test, and compare the performance of your own custom portfolios.
+Copyright (C) 2025  Fevzi Babaoğlu
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Lesser General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""
+
+
+import numpy as np
+import os
+import tempfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Iterator, List, Optional, Tuple
+
+from data_struct import Asset, DateRange, TradingCalendar
+
+
+def _compute_block(
+    returns_path: str,
+    columns: Tuple[int, int],
+    rows: Tuple[int, int],
+    covariance: bool,
+) -> Tuple[Tuple[int, int], Tuple[int, int], np.ndarray]:
+    """Compute one block of the matrix from the shared returns file.
+
+    Kept at module level so that worker processes can import it.
+    """
+    returns = np.load(returns_path, mmap_mode='r')
+    block = _pairwise_block(
+        np.asarray(returns[:, columns[0]:columns[1]]),
+        np.asarray(returns[:, rows[0]:rows[1]]),
+        covariance,
+    )
+    return columns, rows, block
+
+def _pairwise_block(left: np.ndarray, right: np.ndarray, covariance: bool) -> np.ndarray:
+    """Correlation or covariance of every left/right column pair over the dates both have."""
+    left_mask = (~np.isnan(left)).astype(np.float64)
+    right_mask = (~np.isnan(right)).astype(np.float64)
+    left = np.nan_to_num(left)
+    right = np.nan_to_num(right)
+
+    count = left_mask.T @ right_mask
+    left_sum = left.T @ right_mask
+    right_sum = left_mask.T @ right
+    cross_sum = left.T @ right
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        centered_cross = cross_sum - left_sum * right_sum / count
+        if covariance:
+            result = centered_cross / (count - 1)
+        else:
+            left_squares = (left * left).T @ right_mask - left_sum * left_sum / count
+            right_squares = left_mask.T @ (right * right) - right_sum * right_sum / count
+            result = centered_cross / np.sqrt(left_squares * right_squares)
+
+    result[count < 2] = np.nan
+    return result
+
+
+class CorrelationMatrixCalculator:
+    """Pairwise return correlation (or covariance) over a universe of assets.
+
+    Each asset's returns are taken between its own consecutive prices and laid
+    out on the shared calendar at the date of the later price, with NaN
+    elsewhere, so that an asset priced less often than daily still has a
+    return on each of its price dates. The returns are spilled to a
+    memory-mapped file. The matrix is then
+    built block by block, each pair of column blocks using only the dates
+    both columns have a return on. The block width is chosen so that one
+    block computation stays within the memory budget, and blocks can be
+    spread over a process pool.
+    """
+
+    # Float64 copies of the returns and masks of two column blocks, plus their squares
+    BYTES_PER_BLOCK_CELL = 8 * 6
+
+    # Float64 pair statistics held for every cell of a result block
+    BYTES_PER_RESULT_CELL = 8 * 8
+
+    def __init__(
+        self,
+        assets: List[Asset],
+        date_range: Optional[DateRange] = None,
+        memory_budget: int = 256 * 1024 * 1024,
+        output_path: Optional[str] = None,
+        max_workers: int = 1,
+        covariance: bool = False,
+    ):
+        self.assets = assets
+        self.date_range = date_range
+        self.memory_budget = memory_budget
+        self.output_path = output_path
+        self.max_workers = max_workers
+        self.covariance = covariance
+        self._check_validity()
+
+        self.matrix = self.generate_matrix()
+
+    def get_matrix(self) -> np.ndarray:
+        return self.matrix
+
+    def get_codes(self) -> List[str]:
+        return [asset.get_code() for asset in self.assets]
+
+    def generate_matrix(self) -> np.ndarray:
+        asset_count = len(self.assets)
+        if self.output_path:
+            matrix = np.lib.format.open_memmap(
+                self.output_path, mode='w+', dtype=np.float64, shape=(asset_count, asset_count),
+            )
+        else:
+            matrix = np.empty((asset_count, asset_count), dtype=np.float64)
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            returns_path = os.path.join(temp_dir, 'returns.npy')
+            date_count = self._write_returns(returns_path)
+            block_size = self.get_block_size(date_count)
+            blocks = list(self._iter_blocks(asset_count, block_size))
+
+            if self.max_workers > 1:
+                self._compute_blocks_in_parallel(matrix, returns_path, blocks)
+            else:
+                for columns, rows in blocks:
+                    self._store_block(matrix, *_compute_block(returns_path, columns, rows, self.covariance))
+
+        if isinstance(matrix, np.memmap):
+            matrix.flush()
+        return matrix
+
+    def _compute_blocks_in_parallel(self, matrix: np.ndarray, returns_path: str, blocks: list):
+        # Only a bounded number of finished blocks may wait to be stored at once
+        pending = set()
+        with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+            for columns, rows in blocks:
+                if len(pending) >= 2 * self.max_workers:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        self._store_block(matrix, *future.result())
+                pending.add(executor.submit(_compute_block, returns_path, columns, rows, self.covariance))
+
+            for future in pending:
+                self._store_block(matrix, *future.result())
+
+    def get_block_size(self, date_count: int) -> int:
+        """Largest block width whose working set fits in the memory budget."""
+        a = self.BYTES_PER_RESULT_CELL
+        b = self.BYTES_PER_BLOCK_CELL * date_count
+        block_size = int((-b + np.sqrt(b * b + 4 * a * self.memory_budget)) / (2 * a))
+        return max(1, min(block_size, len(self.assets)))
+
+    def _write_returns(self, returns_path: str) -> int:
+        """Write the (dates x assets) return matrix to disk one asset at a time."""
+        calendar_dates, _ = TradingCalendar.get_snapshot()
+        if self.date_range is None:
+            lower, upper = 0, len(calendar_dates)
+        else:
+            lower, upper = TradingCalendar.get_offset_bounds(self.date_range, calendar_dates)
+        # The first date of the range cannot end a return
+        return_dates = calendar_dates[lower + 1:upper]
+        date_count = len(return_dates)
+
+        # Column-major, so that each asset column and each column block is contiguous on disk
+        returns = np.lib.format.open_memmap(
+            returns_path, mode='w+', dtype=np.float64, shape=(date_count, len(self.assets)),
+            fortran_order=True,
+        )
+        column_returns = np.empty(date_count, dtype=np.float64)
+        for column, asset in enumerate(self.assets):
+            column_returns.fill(np.nan)
+            dates, values = asset.get_dated_series(self.date_range)
+            # From each price of the asset to its next one, however many calendar dates lie between
+            values = values.astype(np.float64, copy=False)
+            column_returns[np.searchsorted(return_dates, dates[1:])] = values[1:] / values[:-1] - 1
+            returns[:, column] = column_returns
+
+        returns.flush()
+        del returns
+        return date_count
+
+    @staticmethod
+    def _iter_blocks(asset_count: int, block_size: int) -> Iterator[Tuple[Tuple[int, int], Tuple[int, int]]]:
+        """Upper-triangular column block pairs; the lower triangle is mirrored."""
+        starts = range(0, asset_count, block_size)
+        for column_start in starts:
+            for row_start in starts:
+                if row_start < column_start:
+                    continue
+                yield (
+                    (column_start, min(column_start + block_size, asset_count)),
+                    (row_start, min(row_start + block_size, asset_count)),
+                )
+
+    @staticmethod
+    def _store_block(matrix: np.ndarray, columns: Tuple[int, int], rows: Tuple[int, int], block: np.ndarray):
+        matrix[columns[0]:columns[1], rows[0]:rows[1]] = block
+        matrix[rows[0]:rows[1], columns[0]:columns[1]] = block.T
+
+    def _check_validity(self) -> bool:
+        if not self.assets:
+            raise ValueError("Assets cannot be empty.")
+        if not isinstance(self.assets, list):
+            raise ValueError("Assets must be a list.")
+        if not all(isinstance(asset, Asset) for asset in self.assets):
+            raise ValueError("All assets must be instances of the Asset class.")
+        if self.date_range is not None and not isinstance(self.date_range, DateRange):
+            raise ValueError("Date range must be an instance of the DateRange class.")
+        if not isinstance(self.memory_budget, int) or self.memory_budget <= 0:
+            raise ValueError("Memory budget must be a positive integer number of bytes.")
+        if not isinstance(self.max_workers, int) or self.max_workers < 1:
+            raise ValueError("Max workers must be a positive integer.")
+        return True
@@ -0,0 +1,92 @@
+"""
+custom-portfolio-analyzer - A tool to model, back-test, and compare the performance of your own custom portfolios.
+Copyright (C) 2025  Fevzi Babaoğlu
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Lesser General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""
+
+
+import numpy as np
+
+
+DAYS_PER_YEAR = 365.0
+
+
+def compute_xirr(
+    cashflows: np.ndarray,
+    years: np.ndarray,
+    tolerance: float = 1e-12,
+    max_iterations: int = 100,
+) -> np.ndarray:
+    """Annual money-weighted return of every row of a (series x cashflow) matrix.
+
+    ``years`` holds the time of every cashflow column in years from the
+    first one. The rate of every row is found at once: a bracket around the
+    root is widened until the net present value changes sign, then Newton
+    steps are taken and replaced by bisection wherever they would leave the
+    bracket. The root is searched for in the continuously compounded rate,
+    with the present values scaled by their largest discount factor, so
+    long horizons and extreme rates do not overflow. Rows without a sign
+    change, or that do not converge, are NaN.
+    """
+    cashflows = np.asarray(cashflows, dtype=np.float64)
+    years = np.broadcast_to(np.asarray(years, dtype=np.float64), cashflows.shape)
+    row_count = cashflows.shape[0]
+    if not cashflows.shape[1]:
+        return np.full(row_count, np.nan)
+
+    def evaluate(rates: np.ndarray):
+        exponents = -rates[:, np.newaxis] * years
+        discounts = np.exp(exponents - exponents.max(axis=1, keepdims=True))
+        values = (cashflows * discounts).sum(axis=1)
+        derivatives = -(cashflows * years * discounts).sum(axis=1)
+        return values, derivatives
+
+    # Widen [lo, hi] until the net present value has opposite signs at its ends
+    lo = np.full(row_count, -1.0)
+    hi = np.full(row_count, 1.0)
+    lo_values, _ = evaluate(lo)
+    hi_values, _ = evaluate(hi)
+    for _ in range(16):
+        unbracketed = np.sign(lo_values) == np.sign(hi_values)
+        if not unbracketed.any():
+            break
+        lo = np.where(unbracketed, lo * 2, lo)
+        hi = np.where(unbracketed, hi * 2, hi)
+        lo_values, _ = evaluate(lo)
+        hi_values, _ = evaluate(hi)
+    lo_signs = np.sign(lo_values)
+    bracketed = (lo_signs != np.sign(hi_values)) & (lo_signs != 0)
+
+    rates = np.zeros(row_count)
+    converged = ~bracketed
+    for _ in range(max_iterations):
+        values, derivatives = evaluate(rates)
+        below_root = np.sign(values) == lo_signs
+        lo = np.where(below_root, rates, lo)
+        hi = np.where(below_root, hi, rates)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            newton_rates = rates - values / derivatives
+        # Fall back to bisection where the Newton step leaves the bracket
+        bisect = ~np.isfinite(newton_rates) | (newton_rates <= lo) | (newton_rates >= hi)
+        next_rates = np.where(bisect, (lo + hi) / 2, newton_rates)
+
+        step = np.abs(next_rates - rates)
+        converged |= (values == 0) | (step <= tolerance * np.maximum(1.0, np.abs(rates)))
+        rates = np.where(converged, rates, next_rates)
+        if converged.all():
+            break
+
+    return np.where(bracketed & converged, np.expm1(rates), np.nan)
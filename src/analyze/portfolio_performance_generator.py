@@ -17,15 +17,30 @@ along with this program. If not, see <https://www.gnu.org/licenses/>.
 """
 
 
-from typing import List
+import numpy as np
+from functools import reduce
+from typing import Callable
 
-from data_struct import PerformanceAsset, Asset, DateRange, Portfolio, Price
+from .sapi_backends import SAPI_BACKEND_CHOICES, get_sapi_backend
+from .total_return import apply_distributions
+from data_struct import PerformanceAsset, Asset, DateRange, DateUtils, Portfolio, Price, ReturnAttribution
 
 
 class PortfolioPerformanceGenerator:
-    def __init__(self, portfolio: Portfolio, date_range: DateRange):
+    def __init__(
+        self,
+        portfolio: Portfolio,
+        date_range: DateRange,
+        precision: str = 'float64',
+        sapi_backend: str = 'auto',
+        attribution: bool = False,
+    ):
         self.portfolio = portfolio
         self.date_range = date_range
+        self.precision = precision
+        self.sapi_backend = sapi_backend
+        # Also keep each holding's contribution to the profit ratios
+        self.attribution = attribution
         self._check_validity()
 
         self.portfolio_performance_asset = self.generate_performance_asset()
@@ -34,76 +49,99 @@ class PortfolioPerformanceGenerator:
         return self.portfolio_performance_asset
 
     def generate_performance_asset(self) -> PerformanceAsset:
-        portfolio_performance_prices: List[Price] = []
-
-        # Get assets, their weights and withholding tax rates from the portfolio
-        asset_data_tuples = [
-            (asset.get_asset(), asset.get_weight(), asset.get_withholding_tax_rate())
-            for asset in self.portfolio.get_assets()
-        ]
-        assets, weights, withholding_tax_rates = map(list, zip(*asset_data_tuples))
+        assets = [portfolio_asset.get_asset() for portfolio_asset in self.portfolio.get_assets()]
 
-        # Get the price history for each asset over the given date range
-        asset_prices_list = [
-            asset.get_prices(self.date_range)
+        # Align the assets on the dates they all have prices for. Dates rather than calendar offsets
+        # are compared, as the shared calendar may grow from another thread in the meantime.
+        asset_dates_list = [
+            asset.get_dates(self.date_range)
             for asset in assets
         ]
+        common_dates = reduce(
+            lambda left, right: np.intersect1d(left, right, assume_unique=True),
+            asset_dates_list,
+        )
 
-        # Transpose the list to group prices by date
-        prices_by_date = list(zip(*asset_prices_list))
-        initial_prices = prices_by_date[0]
+        return self.compute_performance_asset(
+            self.portfolio,
+            self.date_range,
+            common_dates,
+            lambda column, indices: assets[column].get_values_on(common_dates[indices]),
+            self.precision,
+            self.sapi_backend,
+            self.attribution,
+        )
 
-        for prices_on_date in prices_by_date:
-            sapi = self._static_allocation_performance_index(
-                weights=weights,
-                withholding_tax_rates=withholding_tax_rates,
-                initial_prices=[price.get_value() for price in initial_prices],
-                final_prices=[price.get_value() for price in prices_on_date],
+    @staticmethod
+    def compute_performance_asset(
+        portfolio: Portfolio,
+        date_range: DateRange,
+        dates: np.ndarray,
+        get_values: Callable[[int, np.ndarray], np.ndarray],
+        precision: str,
+        sapi_backend: str,
+        attribution: bool,
+    ) -> PerformanceAsset:
+        """Compute the performance asset of a portfolio from the dates all of its holdings have prices for.
+
+        ``get_values(column, indices)`` returns the prices of the holding at
+        that position of the portfolio on ``dates[indices]``. It is called once
+        per holding after resampling, so that callers can gather the prices
+        from wherever they keep them.
+        """
+        if not len(dates):
+            raise ValueError(
+                f"Portfolio {portfolio.get_title()} has no dates on which all of its assets have prices "
+                f"between {date_range.get_start_date()} and {date_range.get_end_date()}."
             )
-
-            portfolio_performance_price = Price(
-                date=prices_on_date[0].get_date(),
-                value=sapi,
+        portfolio_assets = portfolio.get_assets()
+        assets = [portfolio_asset.get_asset() for portfolio_asset in portfolio_assets]
+        weights = [portfolio_asset.get_weight() for portfolio_asset in portfolio_assets]
+        withholding_tax_rates = [portfolio_asset.get_withholding_tax_rate() for portfolio_asset in portfolio_assets]
+
+        # Resample before the values are gathered, so that the work follows the frequency
+        resample_indices = DateUtils.get_resample_indices(dates, date_range.get_frequency())
+        dates = dates[resample_indices]
+        prices = np.empty((len(dates), len(assets)), dtype=precision)
+        for column in range(len(assets)):
+            prices[:, column] = get_values(column, resample_indices)
+
+        # Holdings that pay distributions are followed as reinvested total-return series
+        cost_bases, distribution_tax_ratios = apply_distributions(dates, prices, assets, withholding_tax_rates)
+        backend = get_sapi_backend(sapi_backend, prices.size, precision, attribution)
+        return_attribution = None
+        if attribution:
+            sapi, contributions, tax_costs = backend.compute_attribution(
+                weights, withholding_tax_rates, prices, cost_bases,
             )
-            portfolio_performance_prices.append(portfolio_performance_price)
+            if distribution_tax_ratios is not None:
+                tax_costs += distribution_tax_ratios * (np.asarray(weights) / sum(weights))
+            return_attribution = ReturnAttribution(
+                asset_codes=[asset.get_code() for asset in assets],
+                contributions=contributions,
+                tax_costs=tax_costs,
+            )
+        else:
+            sapi = backend.compute(weights, withholding_tax_rates, prices, cost_bases)
+        Price.validate_batch(dates, sapi)
 
-        title = self.portfolio.get_title()
-        portfolio_code = ''.join(word[0].upper() for word in title.split())
-        portfolio_performance_asset = Asset(
-            code=portfolio_code,
+        title = portfolio.get_title()
+        portfolio_performance_asset = Asset.from_arrays(
+            code=PortfolioPerformanceGenerator.get_portfolio_code(title),
             name=title,
-            prices=portfolio_performance_prices,
+            dates=dates,
+            values=sapi,
         )
 
         return PerformanceAsset(
             asset=portfolio_performance_asset,
-            is_set_default=self.portfolio.is_set_default(),
-        )
-
-    def _static_allocation_performance_index(
-        self,
-        weights: List[float],
-        withholding_tax_rates: List[float],
-        initial_prices: List[float],
-        final_prices: List[float],
-    ) -> float:
-        """Calculate the performance index of the portfolio based on static allocation."""
-        if len({
-            len(weights), len(withholding_tax_rates), len(initial_prices), len(final_prices),
-        }) != 1:
-            raise ValueError("Weights, withholding tax rates, initial prices, and final prices must have the same amount of elements.")
-
-        nominator = sum(
-            weight * ((final / initial) * (1 - tax) + tax if final > initial else final / initial)
-            for weight, tax, initial, final in zip(weights, withholding_tax_rates, initial_prices, final_prices)
-        )
-
-        denominator = sum(
-            weight / initial_price
-            for weight, initial_price in zip(weights, initial_prices)
+            is_set_default=portfolio.is_set_default(),
+            attribution=return_attribution,
         )
 
-        return nominator / denominator
+    @staticmethod
+    def get_portfolio_code(title: str) -> str:
+        return ''.join(word[0].upper() for word in title.split())
 
     def _check_validity(self) -> bool:
         if not self.portfolio:
@@ -114,4 +152,8 @@ class PortfolioPerformanceGenerator:
             raise ValueError("Date range cannot be empty.")
         if not isinstance(self.date_range, DateRange):
             raise ValueError("Date range must be an instance of the DateRange class.")
+        if self.precision not in Asset.PRECISIONS:
+            raise ValueError(f"Precision must be one of {', '.join(Asset.PRECISIONS)}.")
+        if self.sapi_backend not in SAPI_BACKEND_CHOICES:
+            raise ValueError(f"SAPI backend must be one of {', '.join(SAPI_BACKEND_CHOICES)}.")
         return True
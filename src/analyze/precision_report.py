@@ -0,0 +1,98 @@
+"""
+custom-portfolio-analyzer - A tool to model, back-test, and compare the performance of your own custom portfolios.
+Copyright (C) 2025  Fevzi Babaoğlu
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Lesser General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""
+
+
+import numpy as np
+import pandas as pd
+from typing import List
+
+from data_struct import PerformancePortfolioComparison
+
+
+class PrecisionReport:
+    """Deviation of reduced precision results from float64 results on the same input.
+
+    For every date range and portfolio the report holds the maximum absolute
+    deviation of the profit ratios and the maximum relative deviation of the
+    performance index values.
+    """
+
+    TABLE_COLUMNS = [
+        'start_date',
+        'end_date',
+        'portfolio_code',
+        'max_abs_profit_ratio_deviation',
+        'max_rel_index_deviation',
+    ]
+
+    def __init__(
+        self,
+        reference: List[PerformancePortfolioComparison],
+        reduced: List[PerformancePortfolioComparison],
+    ):
+        self.reference = reference
+        self.reduced = reduced
+        self._check_validity()
+
+        self.deviation_table = self.generate_deviation_table()
+
+    def get_deviation_table(self) -> pd.DataFrame:
+        return self.deviation_table
+
+    def get_max_deviation(self) -> float:
+        """Largest absolute profit ratio deviation over the whole report."""
+        if self.deviation_table.empty:
+            return 0.0
+        return float(self.deviation_table['max_abs_profit_ratio_deviation'].max())
+
+    def generate_deviation_table(self) -> pd.DataFrame:
+        rows = []
+
+        for reference_comparison, reduced_comparison in zip(self.reference, self.reduced):
+            date_range = reference_comparison.get_date_range()
+            for reference_asset, reduced_asset in zip(
+                reference_comparison.get_performance_assets(),
+                reduced_comparison.get_performance_assets(),
+            ):
+                reference_ratios = np.asarray(reference_asset.get_profit_ratios(), dtype=np.float64)
+                reduced_ratios = np.asarray(reduced_asset.get_profit_ratios(), dtype=np.float64)
+                reference_values = reference_asset.get_asset().get_values()
+                reduced_values = reduced_asset.get_asset().get_values().astype(np.float64)
+
+                rows.append((
+                    date_range.get_start_date(),
+                    date_range.get_end_date(),
+                    reference_asset.get_asset().get_code(),
+                    float(np.max(np.abs(reduced_ratios - reference_ratios))),
+                    float(np.max(np.abs(reduced_values / reference_values - 1))),
+                ))
+
+        return pd.DataFrame(rows, columns=self.TABLE_COLUMNS)
+
+    def _check_validity(self) -> bool:
+        if len(self.reference) != len(self.reduced):
+            raise ValueError("Reference and reduced results must cover the same date ranges.")
+        for reference_comparison, reduced_comparison in zip(self.reference, self.reduced):
+            reference_assets = reference_comparison.get_performance_assets()
+            reduced_assets = reduced_comparison.get_performance_assets()
+            if len(reference_assets) != len(reduced_assets):
+                raise ValueError("Reference and reduced results must cover the same portfolios.")
+            for reference_asset, reduced_asset in zip(reference_assets, reduced_assets):
+                if len(reference_asset.get_profit_ratios()) != len(reduced_asset.get_profit_ratios()):
+                    raise ValueError("Reference and reduced results must cover the same dates.")
+        return True
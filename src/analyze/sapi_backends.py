@@ -0,0 +1,348 @@
+"""
+custom-portfolio-analyzer - A tool to model, back-test, and compare the performance of your own custom portfolios.
+Copyright (C) 2025  Fevzi Babaoğlu
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Lesser General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""
+
+
+import logging
+import numpy as np
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+
+class SAPIBackend(ABC):
+    """Computes the static allocation performance index of a (dates x assets) price matrix.
+
+    Every row is evaluated against the first row, which holds the initial prices.
+    Withholding tax is charged on the gain over the cost basis of a holding,
+    which is its initial price unless a (dates x assets) ``cost_bases`` matrix
+    says otherwise, e.g. after reinvested distributions.
+    """
+
+    name = None
+    precisions = ('float64', 'float32')
+    supports_attribution = False
+
+    def is_available(self) -> bool:
+        return True
+
+    @abstractmethod
+    def compute(
+        self,
+        weights: List[float],
+        withholding_tax_rates: List[float],
+        prices: np.ndarray,
+        cost_bases: Optional[np.ndarray] = None,
+    ) -> np.ndarray:
+        """Return the index of every date."""
+
+    def compute_attribution(
+        self,
+        weights: List[float],
+        withholding_tax_rates: List[float],
+        prices: np.ndarray,
+        cost_bases: Optional[np.ndarray] = None,
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Return the index together with the (dates x assets) profit ratio contributions and tax costs.
+
+        Only backends that set ``supports_attribution`` override this.
+        """
+        raise ValueError(f"The {self.name} SAPI backend does not support return attribution.")
+
+    @staticmethod
+    def _check_inputs(
+        weights: List[float],
+        withholding_tax_rates: List[float],
+        prices: np.ndarray,
+        cost_bases: Optional[np.ndarray] = None,
+    ) -> bool:
+        if prices.ndim != 2:
+            raise ValueError("Prices must be a (dates x assets) matrix.")
+        if not (len(weights) == len(withholding_tax_rates) == prices.shape[1]):
+            raise ValueError("Weights, withholding tax rates, and price columns must have the same amount of elements.")
+        if cost_bases is not None and cost_bases.shape != prices.shape:
+            raise ValueError("Cost bases must have the same shape as the price matrix.")
+        return True
+
+
+class PythonSAPIBackend(SAPIBackend):
+    """Reference implementation with one scalar evaluation per date."""
+
+    name = 'python'
+    # Python floats are always double precision
+    precisions = ('float64',)
+
+    def compute(self, weights, withholding_tax_rates, prices, cost_bases=None):
+        self._check_inputs(weights, withholding_tax_rates, prices, cost_bases)
+        prices_by_date = prices.tolist()
+        initial_prices = prices_by_date[0]
+        cost_bases_by_date = cost_bases.tolist() if cost_bases is not None else [None] * len(prices_by_date)
+
+        return np.array([
+            self.static_allocation_performance_index(
+                weights, withholding_tax_rates, initial_prices, final_prices, final_cost_bases,
+            )
+            for final_prices, final_cost_bases in zip(prices_by_date, cost_bases_by_date)
+        ], dtype=np.float64)
+
+    @staticmethod
+    def static_allocation_performance_index(
+        weights: List[float],
+        withholding_tax_rates: List[float],
+        initial_prices: List[float],
+        final_prices: List[float],
+        cost_bases: Optional[List[float]] = None,
+    ) -> float:
+        """Calculate the performance index of the portfolio based on static allocation."""
+        if cost_bases is None:
+            cost_bases = initial_prices
+        if len({
+            len(weights), len(withholding_tax_rates), len(initial_prices), len(final_prices), len(cost_bases),
+        }) != 1:
+            raise ValueError("Weights, withholding tax rates, initial prices, and final prices must have the same amount of elements.")
+
+        nominator = sum(
+            weight * ((final / initial) * (1 - tax) + tax * (basis / initial) if final > basis else final / initial)
+            for weight, tax, initial, final, basis in zip(
+                weights, withholding_tax_rates, initial_prices, final_prices, cost_bases,
+            )
+        )
+
+        denominator = sum(
+            weight / initial_price
+            for weight, initial_price in zip(weights, initial_prices)
+        )
+
+        return nominator / denominator
+
+
+class NumpySAPIBackend(SAPIBackend):
+    """Vectorized over dates, in the precision of the price matrix.
+
+    The terms are accumulated asset by asset in the same order as the
+    reference, so both give bitwise identical results for float64 prices.
+    """
+
+    name = 'numpy'
+    supports_attribution = True
+
+    def compute(self, weights, withholding_tax_rates, prices, cost_bases=None):
+        return self._compute(weights, withholding_tax_rates, prices, cost_bases, attribution=False)[0]
+
+    def compute_attribution(self, weights, withholding_tax_rates, prices, cost_bases=None):
+        return self._compute(weights, withholding_tax_rates, prices, cost_bases, attribution=True)
+
+    def _compute(
+        self,
+        weights: List[float],
+        withholding_tax_rates: List[float],
+        prices: np.ndarray,
+        cost_bases: Optional[np.ndarray],
+        attribution: bool,
+    ) -> Tuple[np.ndarray, Optional[np.ndarray], Optional[np.ndarray]]:
+        self._check_inputs(weights, withholding_tax_rates, prices, cost_bases)
+        weights = np.asarray(weights, dtype=prices.dtype)
+        withholding_tax_rates = np.asarray(withholding_tax_rates, dtype=prices.dtype)
+
+        initial_prices = prices[0]
+        nominator = 0
+        denominator = 0
+
+        contributions = tax_costs = None
+        if attribution:
+            # Each holding contributes its weight share of its own (after tax) profit ratio
+            weight_shares = weights / weights.sum()
+            contributions = np.empty(prices.shape, dtype=prices.dtype, order='F')
+            tax_costs = np.empty(prices.shape, dtype=prices.dtype, order='F')
+
+        for column, (weight, tax) in enumerate(zip(weights, withholding_tax_rates)):
+            final = prices[:, column]
+            initial = initial_prices[column]
+            basis = cost_bases[:, column] if cost_bases is not None else initial
+            basis_ratio = basis / initial
+            ratio = final / initial
+            gain = final > basis
+            adjusted = np.where(gain, ratio * (1 - tax) + tax * basis_ratio, ratio)
+            nominator = nominator + weight * adjusted
+            denominator = denominator + weight / initial
+
+            if attribution:
+                contributions[:, column] = weight_shares[column] * (adjusted - 1)
+                tax_costs[:, column] = weight_shares[column] * np.where(gain, tax * (ratio - basis_ratio), 0)
+
+        return nominator / denominator, contributions, tax_costs
+
+
+def _sapi_kernel(weights, withholding_tax_rates, prices, cost_bases, out):
+    """Loop kernel compiled by the numba backend; same operation order as the reference.
+
+    ``cost_bases`` holds either one row per date or the single row of initial prices.
+    """
+    date_count, asset_count = prices.shape
+    denominator = weights[0] * 0
+    for column in range(asset_count):
+        denominator += weights[column] / prices[0, column]
+
+    for row in range(date_count):
+        basis_row = row if cost_bases.shape[0] == date_count else 0
+        nominator = weights[0] * 0
+        for column in range(asset_count):
+            initial = prices[0, column]
+            final = prices[row, column]
+            basis = cost_bases[basis_row, column]
+            ratio = final / initial
+            if final > basis:
+                ratio = ratio * (1 - withholding_tax_rates[column]) + withholding_tax_rates[column] * (basis / initial)
+            nominator += weights[column] * ratio
+        out[row] = nominator / denominator
+
+
+class NumbaSAPIBackend(SAPIBackend):
+    """JIT-compiled loop kernel, available when numba is installed."""
+
+    name = 'numba'
+
+    def __init__(self):
+        self.kernel = None
+
+    def is_available(self) -> bool:
+        return numba is not None
+
+    def compute(self, weights, withholding_tax_rates, prices, cost_bases=None):
+        self._check_inputs(weights, withholding_tax_rates, prices, cost_bases)
+        if not self.is_available():
+            raise RuntimeError("The numba SAPI backend requires the numba package.")
+        # Compiled on first use so that importing this module stays cheap
+        if self.kernel is None:
+            self.kernel = numba.njit(cache=True, nogil=True)(_sapi_kernel)
+
+        prices = np.ascontiguousarray(prices)
+        cost_bases = np.ascontiguousarray(cost_bases if cost_bases is not None else prices[:1], dtype=prices.dtype)
+        out = np.empty(prices.shape[0], dtype=prices.dtype)
+        self.kernel(
+            np.asarray(weights, dtype=prices.dtype),
+            np.asarray(withholding_tax_rates, dtype=prices.dtype),
+            prices,
+            cost_bases,
+            out,
+        )
+        return out
+
+
+SAPI_BACKENDS: Dict[str, SAPIBackend] = {
+    backend.name: backend
+    for backend in (PythonSAPIBackend(), NumpySAPIBackend(), NumbaSAPIBackend())
+}
+
+SAPI_BACKEND_CHOICES = ('auto',) + tuple(SAPI_BACKENDS)
+
+# Below this many price cells the per-call overhead of NumPy outweighs the Python loop
+PYTHON_MAX_CELLS = 32
+# Above this many price cells the JIT kernel pays off, when it is available
+NUMBA_MIN_CELLS = 100_000
+
+# Largest relative deviation from the reference accepted by the conformance check
+CHECK_TOLERANCES = {'float64': 1e-12, 'float32': 1e-5}
+
+
+def get_sapi_backend(
+    name: str = 'auto',
+    cell_count: int = 0,
+    precision: str = 'float64',
+    attribution: bool = False,
+) -> SAPIBackend:
+    """Return the named backend, or pick one by input size and precision for ``auto``."""
+    if name not in SAPI_BACKEND_CHOICES:
+        raise ValueError(f"SAPI backend must be one of {', '.join(SAPI_BACKEND_CHOICES)}.")
+    if attribution and name == 'auto':
+        name = 'numpy'
+
+    if name != 'auto':
+        backend = SAPI_BACKENDS[name]
+        if not backend.is_available():
+            raise ValueError(f"The {name} SAPI backend is not available in this environment.")
+        if precision not in backend.precisions:
+            raise ValueError(f"The {name} SAPI backend does not support {precision} precision.")
+        if attribution and not backend.supports_attribution:
+            raise ValueError(f"The {name} SAPI backend does not support return attribution.")
+        return backend
+
+    if cell_count <= PYTHON_MAX_CELLS and precision in PythonSAPIBackend.precisions:
+        return SAPI_BACKENDS['python']
+    if cell_count >= NUMBA_MIN_CELLS and SAPI_BACKENDS['numba'].is_available():
+        return SAPI_BACKENDS['numba']
+    return SAPI_BACKENDS['numpy']
+
+
+def check_sapi_backends(
+    trials: int = 200,
+    seed: int = 0,
+    precision: str = 'float64',
+    tolerance: Optional[float] = None,
+) -> Dict[str, Optional[float]]:
+    """Check every available backend against the float64 reference on randomized inputs.
+
+    Returns the maximum relative deviation of each backend, or None for a
+    backend that is not available. Raises ValueError if a backend deviates
+    by more than ``tolerance`` (by default that of ``CHECK_TOLERANCES``).
+    """
+    tolerance = CHECK_TOLERANCES[precision] if tolerance is None else tolerance
+    rng = np.random.default_rng(seed)
+    reference = SAPI_BACKENDS['python']
+    deviations: Dict[str, Optional[float]] = {
+        name: (0.0 if backend.is_available() and precision in backend.precisions else None)
+        for name, backend in SAPI_BACKENDS.items()
+    }
+
+    for trial in range(trials):
+        date_count = int(rng.integers(1, 200))
+        asset_count = int(rng.integers(1, 12))
+        weights = rng.uniform(0.01, 1.0, asset_count).tolist()
+        withholding_tax_rates = rng.choice([0.0, 0.1, 0.15, 0.3], asset_count).tolist()
+        # Random walks around the initial prices, so that gains and losses both occur
+        prices = np.exp(np.cumsum(rng.normal(0.0, 0.02, (date_count, asset_count)), axis=0))
+        prices *= rng.uniform(0.5, 500.0, asset_count)
+        # Every other trial raises the cost bases as reinvested distributions do
+        cost_bases = None
+        if trial % 2:
+            cost_bases = prices[0] * np.cumprod(1 + rng.exponential(0.002, (date_count, asset_count)), axis=0)
+
+        expected = reference.compute(weights, withholding_tax_rates, prices, cost_bases)
+        for name, backend in SAPI_BACKENDS.items():
+            if deviations[name] is None:
+                continue
+            result = backend.compute(
+                weights, withholding_tax_rates, prices.astype(precision),
+                cost_bases.astype(precision) if cost_bases is not None else None,
+            )
+            deviation = float(np.max(np.abs(result.astype(np.float64) / expected - 1)))
+            deviations[name] = max(deviations[name], deviation)
+
+    for name, deviation in deviations.items():
+        if deviation is None:
+            logging.info(f"SAPI backend {name}: not available")
+        else:
+            logging.info(f"SAPI backend {name}: max relative deviation {deviation:.3e}")
+
+    failed = [name for name, deviation in deviations.items() if deviation is not None and deviation > tolerance]
+    if failed:
+        raise ValueError(f"SAPI backends deviate from the reference beyond {tolerance:g}: {', '.join(failed)}")
+    return deviations
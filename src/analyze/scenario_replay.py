@@ -0,0 +1,301 @@
+"""
+custom-portfolio-analyzer - A tool to model, back-test, and compare the performance of your own custom portfolios.
+Copyright (C) 2025  Fevzi Babaoğlu
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Lesser General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""
+
+
+import logging
+import numpy as np
+import pandas as pd
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from .portfolio_performance_generator import PortfolioPerformanceGenerator
+from .total_return import get_after_tax_ratios
+from .universe_screener import UniverseScreener
+from data_struct import Asset, DateRange, Portfolio, PortfolioComparison, Scenario, TradingCalendar
+
+
+class PortfolioWindow(NamedTuple):
+    """Prices of a date window and the dates every portfolio is valued on within it."""
+    prices: np.ndarray
+    reinvested: Optional[np.ndarray]
+    dates: np.ndarray
+    length: int
+    valid: np.ndarray
+    measured: np.ndarray
+    first_rows: np.ndarray
+    last_rows: np.ndarray
+
+    def to_dates(self, selected_rows: np.ndarray, mask: Optional[np.ndarray] = None) -> List:
+        """Dates of the selected row of every portfolio, None where it is not set (default: not measured)."""
+        mask = self.measured if mask is None else mask
+        return [
+            row_date if is_set else None
+            for row_date, is_set in zip(self.dates[selected_rows].astype(object), mask)
+        ]
+
+
+class ScenarioReplay:
+    """Replay every configured portfolio through a library of named historical episodes.
+
+    The holdings of all portfolios are laid out once as a (dates x assets)
+    price matrix on the shared calendar, and each scenario evaluates the
+    performance index of every portfolio together, adding up one holding at
+    a time into (dates x portfolios) arrays. As in the analyzer, a portfolio
+    is only measured on the dates all of its holdings have prices for, from
+    the first such date in the window, and distributions are reinvested.
+
+    A drawdown is measured from the running peak within the window. Its
+    recovery is the first date, possibly after the window, on which the
+    index is back at the peak before the trough.
+    """
+
+    TABLE_COLUMNS = [
+        'scenario', 'start_date', 'end_date', 'comparison', 'portfolio_code', 'portfolio_title',
+        'set_default', 'return', 'max_drawdown', 'peak_date', 'trough_date', 'recovery_date',
+        'recovery_days', 'default_return', 'default_max_drawdown', 'relative_return', 'relative_drawdown',
+    ]
+
+    def __init__(
+        self,
+        assets: List[Asset],
+        portfolio_comparisons: List[PortfolioComparison],
+        scenarios: List[Scenario],
+        recovery_horizon_days: Optional[int] = None,
+    ):
+        self.assets = assets
+        self.portfolio_comparisons = portfolio_comparisons
+        self.scenarios = scenarios
+        # How long after a window to look for a recovery; None looks until the end of the data
+        self.recovery_horizon_days = recovery_horizon_days
+        self._check_validity()
+
+        self.scenario_table = self.generate_scenario_table()
+
+    def get_scenario_table(self) -> pd.DataFrame:
+        return self.scenario_table
+
+    def generate_scenario_table(self) -> pd.DataFrame:
+        portfolios = [
+            (portfolio_comparison.get_title(), portfolio)
+            for portfolio_comparison in self.portfolio_comparisons
+            for portfolio in portfolio_comparison.get_portfolios()
+        ]
+        if not portfolios or not self.scenarios:
+            return pd.DataFrame(columns=self.TABLE_COLUMNS)
+
+        assets, weights, withholding_tax_rates = self.build_holdings(
+            self.assets, [portfolio for _, portfolio in portfolios]
+        )
+        prices, reinvested = UniverseScreener.build_price_matrix(assets, withholding_tax_rates)
+        default_columns = self._get_default_columns(portfolios)
+
+        tables = [
+            self._replay_scenario(
+                scenario, portfolios, prices, reinvested, weights, withholding_tax_rates, default_columns,
+            )
+            for scenario in self.scenarios
+        ]
+        return pd.concat(tables, ignore_index=True)
+
+    @staticmethod
+    def build_holdings(assets: List[Asset], portfolios: List[Portfolio]) -> Tuple[List[Asset], np.ndarray, np.ndarray]:
+        """Return the holdings of any portfolio with their (holdings x portfolios) weights and withholding tax rates.
+
+        A holding is an asset held at one withholding tax rate, since the
+        rate decides how much of a distribution is reinvested. Prices come
+        from the full asset histories rather than the portfolio assets, which
+        may only cover the date ranges of their comparison.
+        """
+        asset_index = {asset.get_code(): asset for asset in assets}
+        rows: Dict[Tuple[str, float], int] = {}
+        for portfolio in portfolios:
+            for portfolio_asset in portfolio.get_assets():
+                code = portfolio_asset.get_asset().get_code()
+                if code not in asset_index:
+                    raise ValueError(f"Asset {code} of portfolio {portfolio.get_title()} is not in the asset data.")
+                rows.setdefault((code, portfolio_asset.get_withholding_tax_rate()), len(rows))
+
+        weights = np.zeros((len(rows), len(portfolios)))
+        for column, portfolio in enumerate(portfolios):
+            for portfolio_asset in portfolio.get_assets():
+                row = rows[(portfolio_asset.get_asset().get_code(), portfolio_asset.get_withholding_tax_rate())]
+                weights[row, column] += portfolio_asset.get_weight()
+
+        withholding_tax_rates = np.array([withholding_tax_rate for _, withholding_tax_rate in rows])
+        return [asset_index[code] for code, _ in rows], weights, withholding_tax_rates
+
+    @staticmethod
+    def select_window(
+        prices: np.ndarray,
+        reinvested: Optional[np.ndarray],
+        held: np.ndarray,
+        start: int,
+        end: int,
+        stop: int,
+        label: str,
+        action: str,
+    ) -> PortfolioWindow:
+        """Slice the calendar rows from ``start`` to ``stop`` and find the dates each portfolio is valued on.
+
+        ``prices`` and ``reinvested`` come from ``UniverseScreener.build_price_matrix``
+        and ``held`` is the (assets x portfolios) holding mask. The first and
+        last valued rows of every portfolio are searched before ``end`` only,
+        while the validity mask covers the whole slice.
+        """
+        window_length = end - start
+        # An empty window has nothing to measure, but its dates must still be indexable
+        window_rows = slice(start, stop) if window_length else slice(0, 1)
+        window_prices = prices[window_rows]
+        window_reinvested = reinvested[window_rows] if reinvested is not None else None
+        dates = TradingCalendar.get_dates()[window_rows]
+
+        # A portfolio has a value on the dates all of its holdings have prices for
+        valid = (np.isnan(window_prices) @ held) == 0
+        if not window_length:
+            window_length = 1
+            valid = np.zeros((1, held.shape[1]), dtype=bool)
+        window_valid = valid[:window_length]
+        measured = window_valid.any(axis=0)
+        if not measured.all():
+            logging.info(
+                f"{label}: {np.count_nonzero(~measured)} portfolios have no common prices "
+                f"in the window and are not {action}."
+            )
+        first_rows = np.argmax(window_valid, axis=0)
+        last_rows = window_length - 1 - np.argmax(window_valid[::-1], axis=0)
+        return PortfolioWindow(
+            window_prices, window_reinvested, dates, window_length, valid, measured, first_rows, last_rows,
+        )
+
+    @staticmethod
+    def _get_default_columns(portfolios: List[Tuple[str, Portfolio]]) -> np.ndarray:
+        """Column of the default portfolio of each portfolio's comparison, or -1 without one."""
+        default_by_title: Dict[str, int] = {}
+        for column, (title, portfolio) in enumerate(portfolios):
+            if portfolio.is_set_default():
+                default_by_title.setdefault(title, column)
+        return np.array([default_by_title.get(title, -1) for title, _ in portfolios])
+
+    def _replay_scenario(
+        self,
+        scenario: Scenario,
+        portfolios: List[Tuple[str, Portfolio]],
+        prices: np.ndarray,
+        reinvested: Optional[np.ndarray],
+        weights: np.ndarray,
+        withholding_tax_rates: np.ndarray,
+        default_columns: np.ndarray,
+    ) -> pd.DataFrame:
+        date_range = scenario.get_date_range()
+        start, end = TradingCalendar.get_offset_bounds(date_range)
+        recovery_end = len(prices)
+        if self.recovery_horizon_days is not None:
+            _, recovery_end = TradingCalendar.get_offset_bounds(DateRange.from_trusted(
+                start_date=date_range.get_start_date(),
+                end_date=(np.datetime64(date_range.get_end_date(), 'D') + self.recovery_horizon_days).astype(object),
+            ))
+        held = weights > 0
+        window = self.select_window(
+            prices, reinvested, held, start, end, recovery_end, scenario.get_name(), 'measured',
+        )
+        window_prices, window_reinvested, dates, window_length, valid, measured, first_rows, last_rows = window
+
+        # Performance index of every portfolio on every date, as in the static allocation backends,
+        # one holding at a time over every portfolio that holds it
+        nominator = np.zeros(valid.shape)
+        denominator = np.zeros(valid.shape[1])
+        for row in np.flatnonzero(held.any(axis=1)):
+            holders = np.flatnonzero(held[row])
+            initial_prices = window_prices[first_rows[holders], row]
+            has_reinvested = window_reinvested is not None
+            adjusted = get_after_tax_ratios(
+                initial_prices,
+                window_prices[:, row, np.newaxis],
+                withholding_tax_rates[row],
+                window_reinvested[first_rows[holders], row] if has_reinvested else None,
+                window_reinvested[:, row, np.newaxis] if has_reinvested else None,
+            )
+            nominator[:, holders] += weights[row, holders] * adjusted
+            denominator[holders] += weights[row, holders] / initial_prices
+        index = np.where(valid, nominator / denominator, np.nan)
+
+        # Drawdowns from the running peak within the window
+        window_index = index[:window_length]
+        running_peaks = np.fmax.accumulate(window_index, axis=0)
+        drawdowns = window_index / running_peaks - 1
+        trough_rows = np.argmin(np.where(np.isnan(drawdowns), np.inf, drawdowns), axis=0)
+        columns = np.arange(index.shape[1])
+        max_drawdowns = np.where(measured, drawdowns[trough_rows, columns], np.nan)
+        peak_values = running_peaks[trough_rows, columns]
+        peak_rows = np.argmax(window_index == peak_values, axis=0)
+        returns = np.where(measured, index[last_rows, columns] / index[first_rows, columns] - 1, np.nan)
+
+        # The first date from the trough on that is back at the peak
+        rows = np.arange(len(index))[:, np.newaxis]
+        recovered = (index >= peak_values) & (rows >= trough_rows)
+        has_recovered = measured & recovered.any(axis=0)
+        recovery_rows = np.argmax(recovered, axis=0)
+        recovery_days = np.where(
+            has_recovered,
+            (dates[recovery_rows] - dates[trough_rows]).astype(np.int64),
+            np.nan,
+        )
+
+        has_default = default_columns >= 0
+        default_returns = np.where(has_default, returns[default_columns], np.nan)
+        default_max_drawdowns = np.where(has_default, max_drawdowns[default_columns], np.nan)
+
+        return pd.DataFrame({
+            'scenario': scenario.get_name(),
+            'start_date': date_range.get_start_date(),
+            'end_date': date_range.get_end_date(),
+            'comparison': [title for title, _ in portfolios],
+            'portfolio_code': [PortfolioPerformanceGenerator.get_portfolio_code(p.get_title()) for _, p in portfolios],
+            'portfolio_title': [portfolio.get_title() for _, portfolio in portfolios],
+            'set_default': [portfolio.is_set_default() for _, portfolio in portfolios],
+            'return': returns,
+            'max_drawdown': max_drawdowns,
+            'peak_date': window.to_dates(peak_rows),
+            'trough_date': window.to_dates(trough_rows),
+            'recovery_date': window.to_dates(recovery_rows, has_recovered),
+            'recovery_days': pd.array(recovery_days, dtype='Int64'),
+            'default_return': default_returns,
+            'default_max_drawdown': default_max_drawdowns,
+            'relative_return': returns - default_returns,
+            'relative_drawdown': max_drawdowns - default_max_drawdowns,
+        }, columns=self.TABLE_COLUMNS)
+
+    def _check_validity(self) -> bool:
+        if not self.assets:
+            raise ValueError("Assets cannot be empty.")
+        if not isinstance(self.assets, list):
+            raise ValueError("Assets must be a list.")
+        if not all(isinstance(asset, Asset) for asset in self.assets):
+            raise ValueError("All assets must be instances of the Asset class.")
+        if not isinstance(self.portfolio_comparisons, list):
+            raise ValueError("Portfolio comparisons must be a list.")
+        if not all(isinstance(pc, PortfolioComparison) for pc in self.portfolio_comparisons):
+            raise ValueError("All portfolio comparisons must be instances of the PortfolioComparison class.")
+        if not isinstance(self.scenarios, list):
+            raise ValueError("Scenarios must be a list.")
+        if not all(isinstance(scenario, Scenario) for scenario in self.scenarios):
+            raise ValueError("All scenarios must be instances of the Scenario class.")
+        if self.recovery_horizon_days is not None and (
+            not isinstance(self.recovery_horizon_days, int) or self.recovery_horizon_days < 0
+        ):
+            raise ValueError("Recovery horizon must be a non-negative integer number of days.")
+        return True
@@ -0,0 +1,141 @@
+"""
+custom-portfolio-analyzer - A tool to model, back-test, and compare the performance of your own custom portfolios.
+Copyright (C) 2025  Fevzi Babaoğlu
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Lesser General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""
+
+
+import numpy as np
+from typing import List, Optional, Tuple
+
+from data_struct import Asset, DateRange
+
+
+def reinvest_distributions(
+    dates: np.ndarray,
+    prices: np.ndarray,
+    asset: Asset,
+    withholding_tax_rate: float,
+) -> Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+    """Turn one holding's prices into a total-return series with its distributions reinvested.
+
+    Distributions paid after the first date are taxed when paid, and the rest
+    buys more units at the price of the ex-date. Returns the value of the
+    units bought with one initial unit, their cost basis (the initial price
+    plus every reinvested amount) and the distribution tax paid so far, all
+    on ``dates`` and in price units; or None if no distribution falls into
+    the dates, in which case the prices are used as they are.
+    """
+    first_date, last_date = dates[0], dates[-1]
+    distribution_dates, distribution_amounts = asset.get_distributions(DateRange.from_trusted(
+        start_date=(first_date + 1).astype(object),
+        end_date=last_date.astype(object),
+    ))
+    if not len(distribution_dates):
+        return None
+
+    # Units are bought at the last price known on the ex-date
+    own_dates, own_values = asset.get_dated_series(DateRange.from_trusted(
+        start_date=first_date.astype(object),
+        end_date=last_date.astype(object),
+    ))
+    reinvestment_prices = own_values[np.searchsorted(own_dates, distribution_dates, side='right') - 1].astype(np.float64)
+
+    net_amounts = distribution_amounts * (1 - withholding_tax_rate)
+    unit_factors = np.cumprod(1 + net_amounts / reinvestment_prices)
+    previous_unit_factors = np.concatenate(([1.0], unit_factors[:-1]))
+
+    # Index 0 stands for "no distribution yet", index k for "after the k-th distribution"
+    event_counts = np.searchsorted(distribution_dates, dates, side='right')
+    units = np.concatenate(([1.0], unit_factors))[event_counts]
+    cost_bases = (prices[0] + np.concatenate(([0.0], np.cumsum(previous_unit_factors * net_amounts))))[event_counts]
+    tax_paid = np.concatenate(([0.0], np.cumsum(previous_unit_factors * (distribution_amounts - net_amounts))))[event_counts]
+    return prices * units, cost_bases, tax_paid
+
+
+def build_total_return_series(
+    asset: Asset,
+    withholding_tax_rate: float,
+) -> Tuple[np.ndarray, np.ndarray, Optional[np.ndarray]]:
+    """Return the dates and total-return values of an asset's whole history, with the amounts reinvested so far.
+
+    The reinvested amounts are per unit held since the first date, so the
+    cost basis of a unit bought on a later date ``s`` is, on date ``t``, its
+    price plus ``(reinvested[t] - reinvested[s]) / values[s]`` times that
+    price. They are None if the asset pays no distribution after its first date.
+    """
+    dates, values = asset.get_dated_series()
+    total_return = reinvest_distributions(dates, values.astype(np.float64), asset, withholding_tax_rate)
+    if total_return is None:
+        return dates, values, None
+    total_return_values, cost_bases, _ = total_return
+    return dates, total_return_values, cost_bases - cost_bases[0]
+
+
+def apply_distributions(
+    dates: np.ndarray,
+    prices: np.ndarray,
+    assets: List[Asset],
+    withholding_tax_rates: List[float],
+) -> Tuple[Optional[np.ndarray], Optional[np.ndarray]]:
+    """Replace the price columns of holdings with distributions by their total-return series, in place.
+
+    Returns the (dates x assets) cost bases and distribution tax ratios, or
+    None for both if no holding has a distribution within the dates, so that
+    such portfolios are computed exactly as before.
+    """
+    cost_bases = distribution_tax_ratios = None
+    for column, (asset, withholding_tax_rate) in enumerate(zip(assets, withholding_tax_rates)):
+        total_return = reinvest_distributions(
+            dates, prices[:, column].astype(np.float64), asset, withholding_tax_rate,
+        )
+        if total_return is None:
+            continue
+
+        if cost_bases is None:
+            cost_bases = np.repeat(prices[:1], len(prices), axis=0)
+            distribution_tax_ratios = np.zeros(prices.shape, dtype=prices.dtype)
+        total_return_prices, column_cost_bases, tax_paid = total_return
+        prices[:, column] = total_return_prices
+        cost_bases[:, column] = column_cost_bases
+        distribution_tax_ratios[:, column] = tax_paid / total_return_prices[0]
+
+    return cost_bases, distribution_tax_ratios
+
+
+def get_after_tax_ratios(
+    initial_prices: np.ndarray,
+    prices: np.ndarray,
+    withholding_tax_rates: np.ndarray,
+    initial_reinvested: Optional[np.ndarray] = None,
+    reinvested: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """Value of holdings relative to their initial prices, after the withholding tax on the gain over their cost basis.
+
+    This is the per-holding term of the static allocation backends. The
+    ``reinvested`` amounts are those of ``build_total_return_series``, taken
+    where the holding was bought and where it is valued; without them the
+    cost basis is the initial price.
+    """
+    ratios = prices / initial_prices
+    if reinvested is None:
+        basis_ratios = 1.0
+    else:
+        basis_ratios = 1 + (reinvested - initial_reinvested) / initial_prices
+    return np.where(
+        ratios > basis_ratios,
+        ratios * (1 - withholding_tax_rates) + withholding_tax_rates * basis_ratios,
+        ratios,
+    )
@@ -0,0 +1,222 @@
+"""
+custom-portfolio-analyzer - A tool to model, back-test, and compare the performance of your own custom portfolios.
+Copyright (C) 2025  Fevzi Babaoğlu
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Lesser General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""
+
+
+import logging
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Optional, Tuple
+
+from .portfolio_performance_generator import PortfolioPerformanceGenerator
+from .total_return import build_total_return_series, get_after_tax_ratios
+from data_struct import Asset, DateRange, Portfolio, PortfolioComparison, TradingCalendar
+
+
+class UniverseScreener:
+    """Rank every asset of the universe against the default portfolio of each comparison.
+
+    The universe is laid out as a (dates x assets) price matrix on the shared
+    calendar, so the returns of all assets over all date ranges of a
+    comparison are computed with a handful of array operations. As in the
+    default portfolio, distributions are reinvested.
+    """
+
+    TABLE_COLUMNS = [
+        'comparison', 'start_date', 'end_date', 'rank', 'code', 'name',
+        'return', 'default_return', 'excess_return',
+    ]
+
+    def __init__(
+        self,
+        assets: List[Asset],
+        portfolio_comparisons: List[PortfolioComparison],
+        withholding_tax_rate: float = 0.0,
+        max_stale_days: int = 7,
+    ):
+        self.assets = assets
+        self.portfolio_comparisons = portfolio_comparisons
+        self.withholding_tax_rate = withholding_tax_rate
+        # How old the last real price of an asset may be at the end of a date range
+        self.max_stale_days = max_stale_days
+        self._check_validity()
+
+        self.screening_table = self.generate_screening_table()
+
+    def get_screening_table(self) -> pd.DataFrame:
+        return self.screening_table
+
+    def generate_screening_table(self) -> pd.DataFrame:
+        tax_rates = self._get_withholding_tax_rates()
+        prices, reinvested = self.build_price_matrix(self.assets, tax_rates)
+        filled_prices, last_valid_rows = self._forward_fill(prices)
+        if reinvested is not None:
+            reinvested = np.take_along_axis(reinvested, last_valid_rows, axis=0)
+
+        tables = []
+        for portfolio_comparison in self.portfolio_comparisons:
+            default_portfolio = next((
+                portfolio for portfolio in portfolio_comparison.get_portfolios()
+                if portfolio.is_set_default()
+            ), None)
+            if default_portfolio is None:
+                logging.warning(
+                    f"Skipping '{portfolio_comparison.get_title()}': no default portfolio to screen against."
+                )
+                continue
+
+            for date_range in portfolio_comparison.get_date_ranges():
+                tables.append(self._screen_date_range(
+                    title=portfolio_comparison.get_title(),
+                    default_portfolio=default_portfolio,
+                    date_range=date_range,
+                    filled_prices=filled_prices,
+                    reinvested=reinvested,
+                    last_valid_rows=last_valid_rows,
+                    tax_rates=tax_rates,
+                ))
+
+        if not tables:
+            return pd.DataFrame(columns=self.TABLE_COLUMNS)
+        return pd.concat(tables, ignore_index=True)
+
+    @staticmethod
+    def build_price_matrix(
+        assets: List[Asset],
+        withholding_tax_rates: np.ndarray,
+    ) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        """Scatter the total-return series of every asset onto the calendar, leaving NaN where an asset has no price.
+
+        Also returns the matching (dates x assets) matrix of reinvested
+        amounts (see ``build_total_return_series``), or None if no asset pays
+        a distribution.
+        """
+        calendar_dates = TradingCalendar.get_dates()
+        matrix = np.full((len(calendar_dates), len(assets)), np.nan)
+        reinvested = None
+        for column, (asset, withholding_tax_rate) in enumerate(zip(assets, withholding_tax_rates)):
+            dates, values, reinvested_amounts = build_total_return_series(asset, withholding_tax_rate)
+            rows = np.searchsorted(calendar_dates, dates)
+            matrix[rows, column] = values
+            if reinvested_amounts is not None:
+                if reinvested is None:
+                    reinvested = np.zeros(matrix.shape)
+                reinvested[rows, column] = reinvested_amounts
+        return matrix, reinvested
+
+    def _screen_date_range(
+        self,
+        title: str,
+        default_portfolio: Portfolio,
+        date_range: DateRange,
+        filled_prices: np.ndarray,
+        reinvested: Optional[np.ndarray],
+        last_valid_rows: np.ndarray,
+        tax_rates: np.ndarray,
+    ) -> pd.DataFrame:
+        default_asset = PortfolioPerformanceGenerator(
+            portfolio=default_portfolio,
+            date_range=date_range,
+        ).get_portfolio_performance_asset().get_asset()
+
+        # Measure every asset over the exact dates the default portfolio was measured on
+        default_offsets = default_asset.get_date_offsets()
+        default_values = default_asset.get_values()
+        start_offset, end_offset = default_offsets[0], default_offsets[-1]
+        default_return = default_values[-1] / default_values[0] - 1
+
+        has_reinvested = reinvested is not None
+        returns = get_after_tax_ratios(
+            filled_prices[start_offset],
+            filled_prices[end_offset],
+            tax_rates,
+            reinvested[start_offset] if has_reinvested else None,
+            reinvested[end_offset] if has_reinvested else None,
+        ) - 1
+
+        # Forward filling carries the last price past the end of a history, which would rank as a flat return
+        dates = TradingCalendar.get_dates()
+        end_rows = last_valid_rows[end_offset]
+        has_start = ~np.isnan(filled_prices[start_offset])
+        has_end = has_start & (end_rows >= start_offset)
+        is_current = has_end & ((dates[end_offset] - dates[end_rows]).astype(np.int64) <= self.max_stale_days)
+        covered = is_current & ~np.isnan(returns)
+        for count, reason in (
+            (np.count_nonzero(~has_start), "no price history at the start of the date range"),
+            (np.count_nonzero(has_start & ~has_end), "no price within the date range"),
+            (np.count_nonzero(has_end & ~is_current), f"no price in the last {self.max_stale_days} days of the date range"),
+        ):
+            if count:
+                logging.info(f"{title}: {count} assets have {reason} and are not ranked.")
+
+        order = np.flatnonzero(covered)[np.argsort(-returns[covered], kind='stable')]
+        start_date, end_date = TradingCalendar.to_date_objects(np.array([start_offset, end_offset]))
+
+        return pd.DataFrame({
+            'comparison': title,
+            'start_date': start_date,
+            'end_date': end_date,
+            'rank': np.arange(1, len(order) + 1),
+            'code': [self.assets[index].get_code() for index in order],
+            'name': [self.assets[index].get_name() for index in order],
+            'return': returns[order],
+            'default_return': default_return,
+            'excess_return': returns[order] - default_return,
+        }, columns=self.TABLE_COLUMNS)
+
+    def _get_withholding_tax_rates(self) -> np.ndarray:
+        """Use the tax rate configured for an asset in any portfolio, falling back to the default rate."""
+        configured_rates: Dict[str, float] = {}
+        for portfolio_comparison in self.portfolio_comparisons:
+            for portfolio in portfolio_comparison.get_portfolios():
+                for portfolio_asset in portfolio.get_assets():
+                    configured_rates.setdefault(
+                        portfolio_asset.get_asset().get_code(),
+                        portfolio_asset.get_withholding_tax_rate(),
+                    )
+
+        return np.array([
+            configured_rates.get(asset.get_code(), self.withholding_tax_rate)
+            for asset in self.assets
+        ])
+
+    @staticmethod
+    def _forward_fill(matrix: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Carry the last known price of each asset forward over the dates it has no price on.
+
+        Also returns, for every cell, the row of the real price it was filled from.
+        """
+        rows = np.arange(matrix.shape[0])[:, np.newaxis]
+        last_valid_rows = np.maximum.accumulate(np.where(np.isnan(matrix), 0, rows), axis=0)
+        return np.take_along_axis(matrix, last_valid_rows, axis=0), last_valid_rows
+
+    def _check_validity(self) -> bool:
+        if not self.assets:
+            raise ValueError("Assets cannot be empty.")
+        if not isinstance(self.assets, list):
+            raise ValueError("Assets must be a list.")
+        if not all(isinstance(asset, Asset) for asset in self.assets):
+            raise ValueError("All assets must be instances of the Asset class.")
+        if not isinstance(self.portfolio_comparisons, list):
+            raise ValueError("Portfolio comparisons must be a list.")
+        if not all(isinstance(pc, PortfolioComparison) for pc in self.portfolio_comparisons):
+            raise ValueError("All portfolio comparisons must be instances of the PortfolioComparison class.")
+        if not isinstance(self.withholding_tax_rate, float) or self.withholding_tax_rate < 0:
+            raise ValueError("Withholding tax rate must be a non-negative float number.")
+        if not isinstance(self.max_stale_days, int) or self.max_stale_days < 0:
+            raise ValueError("Maximum stale days must be a non-negative integer.")
+        return True
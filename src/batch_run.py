@@ -0,0 +1,135 @@
+"""
+custom-portfolio-analyzer - A tool to model, back-test, and compare the performance of your own custom portfolios.
+Copyright (C) 2025  Fevzi Babaoğlu
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Lesser General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""
+
+
+import argparse
+import csv
+import glob
+import logging
+import os
+import sys
+from typing import List
+
+from analyze import BatchRunner
+from cli import add_data_arguments, configure_logging
+from data_io import DataLoader, ResultExporter
+from data_struct import DateUtils
+
+
+configure_logging()
+
+
+def expand_config_paths(patterns: List[str]) -> List[str]:
+    """Expand directories and glob patterns into a sorted, de-duplicated list of config files."""
+    config_paths = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            matches = glob.glob(os.path.join(pattern, '*.json'))
+        else:
+            matches = glob.glob(pattern) or [pattern]
+        config_paths.extend(sorted(matches))
+    return list(dict.fromkeys(config_paths))
+
+def get_output_path(output_dir: str, config_path: str, used_names: set) -> str:
+    stem = os.path.splitext(os.path.basename(config_path))[0]
+    name = stem
+    suffix = 2
+    while name in used_names:
+        name = f"{stem}_{suffix}"
+        suffix += 1
+    used_names.add(name)
+    return os.path.join(output_dir, f"{name}.csv")
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Analyze many portfolio comparison configs against one loaded asset universe."
+    )
+    add_data_arguments(parser)
+    parser.add_argument(
+        'configs',
+        nargs='+',
+        help='Config files, directories of config files, or glob patterns',
+    )
+    parser.add_argument(
+        '--output-dir',
+        type=str,
+        default='data/batch_results',
+        help='Directory for the per-config result tables and the batch report',
+    )
+    parser.add_argument(
+        '--max-workers',
+        type=int,
+        default=4,
+        help='Number of portfolio and date range cells computed concurrently (default: 4)',
+    )
+    args = parser.parse_args()
+
+    DateUtils.set_date_format(args.date_format)
+    os.makedirs(args.output_dir, exist_ok=True)
+
+    loader = DataLoader(
+        asset_data_path=args.asset_data_path,
+        portfolio_comparison_config_path=None,
+        storage_backend=args.storage_backend,
+    )
+    runner = BatchRunner(
+        config_paths=expand_config_paths(args.configs),
+        load_comparisons=loader.load_portfolio_comparisons,
+        max_workers=args.max_workers,
+    )
+
+    report_path = os.path.join(args.output_dir, 'batch_report.csv')
+    used_names = {'batch_report'}
+    failure_count = 0
+
+    with open(report_path, 'w', encoding='utf-8', newline='') as report_file:
+        report = csv.writer(report_file)
+        report.writerow(['config_path', 'status', 'output_path', 'error'])
+
+        for result in runner.get_results():
+            output_path = ''
+            error = result.get_error()
+
+            if error is None:
+                output_path = get_output_path(args.output_dir, result.get_config_path(), used_names)
+                try:
+                    with ResultExporter(output_path) as exporter:
+                        for portfolio_comparison, ppcs in result.get_comparison_results():
+                            exporter.write_comparison(portfolio_comparison.get_title(), ppcs)
+                except Exception as e:
+                    logging.error(f"Failed to export {result.get_config_path()}: {e}")
+                    error = f"{type(e).__name__}: {e}"
+
+            failure_count += error is not None
+            report.writerow([
+                result.get_config_path(),
+                'failed' if error else 'succeeded',
+                output_path if error is None else '',
+                error or '',
+            ])
+
+    logging.info(
+        f"Analyzed {len(runner.get_results())} configs ({failure_count} failed), computing "
+        f"{runner.get_unique_cell_count()} of {runner.get_planned_cell_count()} cells. Report: {report_path}"
+    )
+    if failure_count:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+"""
+custom-portfolio-analyzer - A tool to model, back-test, and compare the performance of your own custom portfolios.
+Copyright (C) 2025  Fevzi Babaoğlu
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Lesser General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""
+
+
+import argparse
+import logging
+
+from data_io import DataLoader
+from data_struct import DateUtils
+
+
+def configure_logging():
+    """Configure the root logger shared by every command-line entry point."""
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s [%(levelname)s] %(message)s",
+        handlers=[
+            logging.StreamHandler()
+        ]
+    )
+
+def add_data_arguments(
+    parser: argparse.ArgumentParser,
+    asset_data_path: bool = True,
+    asset_data_path_help: str = 'Path to the asset data CSV file or SQLite price store',
+    storage_backend: bool = True,
+    date_format_help: str = 'Date format string for parsing and writing dates',
+):
+    """Register the asset data and date format arguments shared by the command-line entry points."""
+    if asset_data_path:
+        parser.add_argument(
+            '--asset-data-path',
+            type=str,
+            default='data/asset_data.csv',
+            help=asset_data_path_help,
+        )
+    if storage_backend:
+        parser.add_argument(
+            '--storage-backend',
+            choices=DataLoader.STORAGE_BACKENDS,
+            default=None,
+            help='Asset data storage backend (default: detected from the file extension)',
+        )
+    # argparse formats help strings with %, so the directives are escaped
+    parser.add_argument(
+        '--date-format',
+        type=validate_date_format,
+        default='%d.%m.%Y',
+        help=f'{date_format_help} (default: "%%d.%%m.%%Y")',
+    )
+
+def validate_date_format(fmt: str) -> str:
+    """Validate that the date format is usable with strftime/strptime."""
+    try:
+        DateUtils.get_today().strftime(fmt)
+        return fmt
+    except Exception as e:
+        raise argparse.ArgumentTypeError(f"Invalid date format: {fmt}. Error: {e}")
+
+def parse_memory_size(size: str) -> int:
+    """Parse a memory size such as ``512MB`` or ``2GiB`` into a number of bytes."""
+    units = {
+        '': 1, 'B': 1,
+        'K': 1024, 'KB': 1024, 'KIB': 1024,
+        'M': 1024 ** 2, 'MB': 1024 ** 2, 'MIB': 1024 ** 2,
+        'G': 1024 ** 3, 'GB': 1024 ** 3, 'GIB': 1024 ** 3,
+    }
+    text = size.strip().upper()
+    number = text.rstrip('KMGIB')
+    unit = text[len(number):]
+
+    try:
+        value = int(float(number) * units[unit])
+    except (KeyError, ValueError):
+        raise argparse.ArgumentTypeError(f"Invalid memory size: {size}. Use e.g. 512MB or 2GB.")
+    if value <= 0:
+        raise argparse.ArgumentTypeError(f"Memory size must be positive: {size}")
+    return value
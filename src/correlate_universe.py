@@ -0,0 +1,109 @@
+"""
+custom-portfolio-analyzer - A tool to model, back-test, and compare the performance of your own custom portfolios.
+Copyright (C) 2025  Fevzi Babaoğlu
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Lesser General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""
+
+
+import argparse
+import logging
+import os
+import pandas as pd
+
+from analyze import CorrelationMatrixCalculator
+from cli import add_data_arguments, configure_logging
+from data_io import DataLoader
+from data_struct import DateRange, DateUtils
+
+
+configure_logging()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compute the pairwise return correlation matrix of the asset universe."
+    )
+    add_data_arguments(parser, date_format_help='Date format string for parsing dates')
+    parser.add_argument(
+        '--output-path',
+        type=str,
+        default='data/correlation.npy',
+        help='Path of the .npy matrix to write; asset codes are written next to it as a CSV file',
+    )
+    parser.add_argument(
+        '--start-date',
+        type=str,
+        default=None,
+        help='Only use returns from this date on',
+    )
+    parser.add_argument(
+        '--end-date',
+        type=str,
+        default=None,
+        help='Only use returns up to this date',
+    )
+    parser.add_argument(
+        '--covariance',
+        action='store_true',
+        help='Compute the covariance matrix instead of the correlation matrix',
+    )
+    parser.add_argument(
+        '--memory-budget-mb',
+        type=int,
+        default=256,
+        help='Memory budget for one block computation, in megabytes (default: 256)',
+    )
+    parser.add_argument(
+        '--max-workers',
+        type=int,
+        default=1,
+        help='Number of worker processes computing blocks in parallel (default: 1)',
+    )
+    args = parser.parse_args()
+
+    DateUtils.set_date_format(args.date_format)
+
+    loader = DataLoader(
+        asset_data_path=args.asset_data_path,
+        storage_backend=args.storage_backend,
+        portfolio_comparison_config_path=None,
+    )
+    assets = loader.get_asset_data()
+
+    date_range = None
+    if args.start_date or args.end_date:
+        date_range = DateRange(
+            start_date=DateUtils.parse_date(args.start_date) if args.start_date else min(
+                asset.get_date_range().get_start_date() for asset in assets
+            ),
+            end_date=DateUtils.parse_date(args.end_date) if args.end_date else DateUtils.get_today(),
+        )
+
+    calculator = CorrelationMatrixCalculator(
+        assets=assets,
+        date_range=date_range,
+        memory_budget=args.memory_budget_mb * 1024 * 1024,
+        output_path=args.output_path,
+        max_workers=args.max_workers,
+        covariance=args.covariance,
+    )
+
+    codes_path = os.path.splitext(args.output_path)[0] + '_codes.csv'
+    pd.DataFrame({'code': calculator.get_codes()}).to_csv(codes_path, index=False)
+    logging.info(f"Wrote a {len(assets)}x{len(assets)} matrix to {args.output_path} and its codes to {codes_path}")
+
+
+if __name__ == '__main__':
+    main()
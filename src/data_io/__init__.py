@@ -17,7 +17,25 @@ along with this program. If not, see <https://www.gnu.org/licenses/>.
 """
 
 
+from .attribution_exporter import AttributionExporter
+from .checkpoint_store import CheckpointStore
+from .currency_converter import CurrencyConverter
 from .data_loader import DataLoader
+from .data_quality_scanner import DataQualityScanner
+from .json_stream_reader import JSONStreamReader
+from .result_exporter import ResultExporter
+from .sqlite_price_store import SQLitePriceStore
+from .stored_asset import StoredAsset
 
 
-__all__ = ["DataLoader"]
+__all__ = [
+    "AttributionExporter",
+    "CheckpointStore",
+    "CurrencyConverter",
+    "DataLoader",
+    "DataQualityScanner",
+    "JSONStreamReader",
+    "ResultExporter",
+    "SQLitePriceStore",
+    "StoredAsset",
+]
@@ -0,0 +1,162 @@
+"""
+custom-portfolio-analyzer - A tool to model, back-test, and compare the performance of your own custom portfolios.
+Copyright (C) 2025  Fevzi Babaoğlu
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Lesser General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""
+
+
+import hashlib
+import json
+import numpy as np
+import os
+import tempfile
+from typing import Optional
+
+from data_struct import (
+    Asset,
+    DateRange,
+    PerformanceAsset,
+    PerformancePortfolioComparison,
+    PortfolioComparison,
+    ReturnAttribution,
+)
+
+
+class CheckpointStore:
+    """Persist the result of every (comparison, date range) cell of a run.
+
+    A cell is keyed by a hash of everything its result depends on: the
+    portfolios, the date range and a run-wide fingerprint such as the state of
+    the asset data and the computation options. Each cell is stored as one
+    ``.npz`` file that is written atomically, so an interrupted run never
+    leaves a partial checkpoint behind.
+    """
+
+    # Bump when the stored layout changes, so that old checkpoints are ignored
+    FORMAT_VERSION = 1
+
+    def __init__(self, checkpoint_dir: str, fingerprint: Optional[dict] = None):
+        self.checkpoint_dir = checkpoint_dir
+        self.fingerprint = fingerprint or {}
+        self._check_validity()
+
+        os.makedirs(checkpoint_dir, exist_ok=True)
+
+    def get_checkpoint_dir(self) -> str:
+        return self.checkpoint_dir
+
+    def get_key(self, portfolio_comparison: PortfolioComparison, date_range: DateRange) -> str:
+        inputs = {
+            'format_version': self.FORMAT_VERSION,
+            'fingerprint': self.fingerprint,
+            'date_range': [
+                date_range.get_start_date().isoformat(),
+                date_range.get_end_date().isoformat(),
+                date_range.get_frequency(),
+            ],
+            'portfolios': [
+                [
+                    portfolio.get_title(),
+                    portfolio.is_set_default(),
+                    [
+                        [
+                            portfolio_asset.get_asset().get_code(),
+                            portfolio_asset.get_weight(),
+                            portfolio_asset.get_withholding_tax_rate(),
+                        ]
+                        for portfolio_asset in portfolio.get_assets()
+                    ],
+                ]
+                for portfolio in portfolio_comparison.get_portfolios()
+            ],
+        }
+        return hashlib.sha256(json.dumps(inputs, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+    def load(self, key: str, date_range: DateRange) -> Optional[PerformancePortfolioComparison]:
+        """Rebuild the result of a cell, or return None if it has no checkpoint.
+
+        ``date_range`` must be the range the cell was computed for. It is
+        adjusted to the stored series exactly as in the original run.
+        """
+        path = self._get_path(key)
+        if not os.path.exists(path):
+            return None
+
+        with np.load(path, allow_pickle=False) as checkpoint:
+            metadata = json.loads(str(checkpoint['metadata']))
+            performance_assets = []
+            for index, item in enumerate(metadata['performance_assets']):
+                attribution = None
+                if item['attribution_codes'] is not None:
+                    attribution = ReturnAttribution(
+                        asset_codes=item['attribution_codes'],
+                        contributions=checkpoint[f'contributions_{index}'],
+                        tax_costs=checkpoint[f'tax_costs_{index}'],
+                    )
+
+                performance_assets.append(PerformanceAsset(
+                    asset=Asset.from_arrays(
+                        code=item['code'],
+                        name=item['name'],
+                        dates=checkpoint[f'dates_{index}'],
+                        values=checkpoint[f'values_{index}'],
+                    ),
+                    is_set_default=item['is_set_default'],
+                    attribution=attribution,
+                ))
+
+        return PerformancePortfolioComparison(date_range=date_range, performance_assets=performance_assets)
+
+    def save(self, key: str, performance_portfolio_comparison: PerformancePortfolioComparison):
+        arrays = {}
+        metadata = {'performance_assets': []}
+
+        for index, performance_asset in enumerate(performance_portfolio_comparison.get_performance_assets()):
+            asset = performance_asset.get_asset()
+            attribution = performance_asset.get_attribution()
+            arrays[f'dates_{index}'] = asset.get_dates()
+            arrays[f'values_{index}'] = asset.get_values()
+            if attribution is not None:
+                arrays[f'contributions_{index}'] = attribution.get_contributions()
+                arrays[f'tax_costs_{index}'] = attribution.get_tax_costs()
+
+            metadata['performance_assets'].append({
+                'code': asset.get_code(),
+                'name': asset.get_name(),
+                'is_set_default': performance_asset.is_set_default(),
+                'attribution_codes': attribution.get_asset_codes() if attribution is not None else None,
+            })
+
+        arrays['metadata'] = np.array(json.dumps(metadata))
+
+        # Write next to the final path and rename, so that readers never see a partial file
+        file_descriptor, temp_path = tempfile.mkstemp(dir=self.checkpoint_dir, suffix='.tmp')
+        try:
+            with os.fdopen(file_descriptor, 'wb') as file:
+                np.savez(file, **arrays)
+            os.replace(temp_path, self._get_path(key))
+        except BaseException:
+            os.remove(temp_path)
+            raise
+
+    def _get_path(self, key: str) -> str:
+        return os.path.join(self.checkpoint_dir, f'{key}.npz')
+
+    def _check_validity(self) -> bool:
+        if not self.checkpoint_dir:
+            raise ValueError("Checkpoint directory cannot be empty.")
+        if not isinstance(self.fingerprint, dict):
+            raise ValueError("Fingerprint must be a dictionary.")
+        return True
@@ -0,0 +1,157 @@
+"""
+custom-portfolio-analyzer - A tool to model, back-test, and compare the performance of your own custom portfolios.
+Copyright (C) 2025  Fevzi Babaoğlu
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Lesser General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""
+
+
+import logging
+import numpy as np
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from data_struct import Asset, Price
+
+
+class CurrencyConverter:
+    """Convert asset prices into a base currency using FX rate series.
+
+    FX series are assets whose code names a currency pair, e.g. ``USDTRY``
+    (or ``USD/TRY``) for the price of one US dollar in Turkish lira. A pair is
+    used directly or inverted, whichever is available. Each price is joined
+    to the last FX rate known on or before its date, as long as that rate is
+    at most ``max_stale_days`` old, and the whole series is converted with a
+    single vectorized multiply. Converted assets are cached per asset and base
+    currency.
+    """
+
+    def __init__(self, fx_assets: List[Asset], base_currency: str, max_stale_days: Optional[int] = 7):
+        self.fx_assets = fx_assets
+        self.base_currency = base_currency
+        # Oldest FX rate, in calendar days, that may still be carried forward (None for no limit)
+        self.max_stale_days = max_stale_days
+        self._check_validity()
+
+        self.fx_index: Dict[Tuple[str, str], Asset] = {}
+        for fx_asset in fx_assets:
+            self.fx_index.setdefault(self.parse_pair(fx_asset.get_code()), fx_asset)
+        self.cache: Dict[tuple, Asset] = {}
+        self.cache_lock = threading.Lock()
+
+    def get_base_currency(self) -> str:
+        return self.base_currency
+
+    def get_max_stale_days(self) -> Optional[int]:
+        return self.max_stale_days
+
+    @staticmethod
+    def parse_pair(code: str) -> Tuple[str, str]:
+        """Split a currency pair code such as ``USDTRY`` or ``USD/TRY`` into its two currencies."""
+        pair = code.replace('/', '').strip().upper()
+        if len(pair) != 6 or not pair.isalpha():
+            raise ValueError(f"FX series code must name a currency pair such as USDTRY: {code}")
+        return pair[:3], pair[3:]
+
+    def convert(self, asset: Asset) -> Asset:
+        """Return the asset in the base currency; assets without a known currency are returned as is."""
+        currency = asset.get_currency()
+        if currency is None or currency == self.base_currency:
+            return asset
+
+        date_range = asset.get_date_range()
+        key = (asset.get_code(), date_range.get_start_date(), date_range.get_end_date(), self.base_currency)
+        with self.cache_lock:
+            converted = self.cache.get(key)
+        if converted is None:
+            converted = self._convert(asset)
+            with self.cache_lock:
+                converted = self.cache.setdefault(key, converted)
+        return converted
+
+    def get_rates(self, currency: str, dates: np.ndarray) -> np.ndarray:
+        """Rates from ``currency`` to the base currency as of every date.
+
+        NaN before the first known rate, and where the last known rate is more
+        than ``max_stale_days`` old.
+        """
+        fx_asset = self.fx_index.get((currency, self.base_currency))
+        inverted = fx_asset is None
+        if inverted:
+            fx_asset = self.fx_index.get((self.base_currency, currency))
+        if fx_asset is None:
+            raise ValueError(f"No FX series to convert {currency} into {self.base_currency}.")
+
+        fx_dates = fx_asset.get_dates()
+        fx_values = fx_asset.get_values()
+        positions = np.searchsorted(fx_dates, dates, side='right') - 1
+
+        rates = np.full(len(dates), np.nan)
+        known = positions >= 0
+        if self.max_stale_days is not None:
+            stale = known.copy()
+            stale[known] = dates[known] - fx_dates[positions[known]] > np.timedelta64(self.max_stale_days, 'D')
+            if stale.any():
+                logging.warning(
+                    f"No {fx_asset.get_code()} rate within {self.max_stale_days} days before "
+                    f"{int(stale.sum())} of the dates; they cannot be converted."
+                )
+                known &= ~stale
+        rates[known] = fx_values[positions[known]]
+        return 1 / rates if inverted else rates
+
+    def _convert(self, asset: Asset) -> Asset:
+        dates = asset.get_dates()
+        values = asset.get_values()
+        rates = self.get_rates(asset.get_currency(), dates)
+
+        # Prices older than the first FX rate, or too long after the last one, cannot be converted
+        known = ~np.isnan(rates)
+        if not known.all():
+            dates, values, rates = dates[known], values[known], rates[known]
+        if not len(dates):
+            raise ValueError(
+                f"No FX rates to convert {asset.get_code()} from {asset.get_currency()} into {self.base_currency}."
+            )
+
+        converted_values = values * rates.astype(values.dtype, copy=False)
+        Price.validate_batch(dates, converted_values)
+        converted = Asset.from_arrays(
+            code=asset.get_code(),
+            name=asset.get_name(),
+            dates=dates,
+            values=converted_values,
+            currency=self.base_currency,
+        )
+
+        # Distributions are paid in the asset currency and converted at the rate of their date
+        distribution_dates, distribution_amounts = asset.get_distributions()
+        distribution_rates = self.get_rates(asset.get_currency(), distribution_dates)
+        known = ~np.isnan(distribution_rates)
+        converted.set_distributions(
+            distribution_dates[known],
+            distribution_amounts[known] * distribution_rates[known],
+        )
+        return converted
+
+    def _check_validity(self) -> bool:
+        if not isinstance(self.fx_assets, list):
+            raise ValueError("FX assets must be a list.")
+        if not all(isinstance(fx_asset, Asset) for fx_asset in self.fx_assets):
+            raise ValueError("All FX assets must be instances of the Asset class.")
+        if not (isinstance(self.base_currency, str) and len(self.base_currency) == 3 and self.base_currency.isupper()):
+            raise ValueError("Base currency must be a three-letter uppercase currency code.")
+        if self.max_stale_days is not None and not (isinstance(self.max_stale_days, int) and self.max_stale_days >= 0):
+            raise ValueError("Maximum FX staleness must be a non-negative number of days.")
+        return True
@@ -18,73 +18,296 @@ along with this program. If not, see <https://www.gnu.org/licenses/>.
 
 
 import ast
+import csv
 import json
+import numpy as np
+import os
 import pandas as pd
-from typing import List
+import re
+import threading
+from collections import OrderedDict
+from datetime import date
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
 
 from data_struct import (
     Asset,
+    ContributionSchedule,
     DateRange,
     DateUtils,
     PortfolioAsset,
     PortfolioComparison,
     Portfolio,
     Price,
+    Scenario,
+    TradingCalendar,
 )
+from .currency_converter import CurrencyConverter
+from .json_stream_reader import JSONStreamReader
+from .sqlite_price_store import SQLitePriceStore
+from .stored_asset import StoredAsset
 
 
 class DataLoader:
+    STORAGE_BACKENDS = ('csv', 'sqlite')
+    # A date/value pair of the prices column, with the value as written
+    RAW_PRICE_PATTERN = re.compile(r"""['"]date['"]\s*:\s*['"]([^'"]*)['"]\s*,\s*['"]value['"]\s*:\s*([^,}\s]+)""")
+    SQLITE_EXTENSIONS = ('.db', '.sqlite', '.sqlite3')
+    JSON_LINES_EXTENSIONS = ('.jsonl', '.ndjson')
+
     def __init__(
         self,
         asset_data_path = 'data/asset_data.csv',
         portfolio_comparison_config_path = 'data/portfolio_comparison_config.json',
+        storage_backend: Optional[str] = None,
+        lazy_assets: bool = False,
+        precision: str = 'float64',
+        fx_data_path: Optional[str] = None,
+        base_currency: Optional[str] = None,
+        asset_cache_size: int = 1024,
+        max_fx_stale_days: Optional[int] = 7,
     ):
         self.asset_data_path = asset_data_path
         self.portfolio_comparison_config_path = portfolio_comparison_config_path
-
-        self.asset_data = self.load_asset_data()
-        self.portfolio_comparisons = self.load_portfolio_comparisons()
+        self.storage_backend = storage_backend or self.detect_storage_backend(asset_data_path)
+        # Keep prices in the store and read them on every access (SQLite only)
+        self.lazy_assets = lazy_assets
+        # Precision of the loaded price values
+        self.precision = precision
+        # Portfolio assets are converted into the base currency when one is given
+        self.fx_data_path = fx_data_path
+        self.base_currency = base_currency
+        self.max_fx_stale_days = max_fx_stale_days
+        # Number of (code, date range) assets read from the store that are kept, least recently used first out
+        self.asset_cache_size = asset_cache_size
+        self._check_validity()
+
+        self.price_store = self._open_price_store()
+        self.asset_data = self.load_asset_data() if self.price_store is None else None
+        self.asset_index: Dict[str, Asset] = {}
+        for asset in self.asset_data or []:
+            self.asset_index.setdefault(asset.get_code(), asset)
+        self.asset_cache: OrderedDict = OrderedDict()
+        self.price_store_lock = threading.Lock()
+        self.currency_converter = (
+            CurrencyConverter(self.load_fx_data(), base_currency, max_fx_stale_days) if base_currency else None
+        )
+        # Tools that only need the asset universe may be run without a config file
+        self.portfolio_comparisons = (
+            self.load_portfolio_comparisons() if portfolio_comparison_config_path else []
+        )
 
     def get_asset_data(self) -> List[Asset]:
+        # The SQLite backend only loads the universe on demand
+        if self.asset_data is None:
+            with self.price_store_lock:
+                self.asset_data = self.price_store.load_assets(precision=self.precision)
         return self.asset_data
 
+    def get_currency_converter(self) -> Optional[CurrencyConverter]:
+        return self.currency_converter
+
+    def load_fx_data(self) -> List[Asset]:
+        """Load the FX rate series, stored in the same formats as the asset data."""
+        if not self.fx_data_path:
+            return []
+        if self.detect_storage_backend(self.fx_data_path) == 'sqlite':
+            if not os.path.exists(self.fx_data_path):
+                raise FileNotFoundError(f"FX database not found: {self.fx_data_path}")
+            with SQLitePriceStore(self.fx_data_path) as fx_store:
+                return fx_store.load_assets(precision=self.precision)
+        return self.load_asset_data_csv(self.fx_data_path, self.precision)
+
     def get_portfolio_comparisons(self) -> List[PortfolioComparison]:
         return self.portfolio_comparisons
 
+    def get_price_store(self) -> Optional[SQLitePriceStore]:
+        return self.price_store
+
+    def close(self):
+        """Close the connection to the price store, if there is one."""
+        if self.price_store is not None:
+            with self.price_store_lock:
+                self.price_store.close()
+
+    @classmethod
+    def detect_storage_backend(cls, asset_data_path: str) -> str:
+        extension = os.path.splitext(asset_data_path)[1].lower()
+        return 'sqlite' if extension in cls.SQLITE_EXTENSIONS else 'csv'
+
+    @classmethod
+    def read_data_stamp(cls, asset_data_path: str, storage_backend: Optional[str] = None) -> Tuple[int, int]:
+        """A stamp of the asset data that changes on every write.
+
+        For a SQLite store this is the file identity, which changes when the
+        database is replaced, and its data version, which every merge bumps.
+        For a file it is the modification time and size.
+        """
+        stat = os.stat(asset_data_path)
+        if (storage_backend or cls.detect_storage_backend(asset_data_path)) == 'sqlite':
+            return stat.st_ino, SQLitePriceStore.read_data_version(asset_data_path)
+        return stat.st_mtime_ns, stat.st_size
+
     def load_asset_data(self) -> List[Asset]:
-        assets = []
+        return self.load_asset_data_csv(self.asset_data_path, self.precision)
+
+    @staticmethod
+    def load_asset_data_csv(asset_data_path: str, precision: str = 'float64') -> List[Asset]:
+        series = []
 
-        df = pd.read_csv(self.asset_data_path, encoding='utf-8')
+        df = pd.read_csv(asset_data_path, encoding='utf-8')
 
         for _, row in df.iterrows():
             code = str(row['code']).strip()
             name = str(row['name']).strip()
+            # The currency column is optional, as is a value in it
+            currency = row.get('currency')
+            currency = str(currency).strip() if isinstance(currency, str) and currency.strip() else None
 
             price_list_str = row['prices']
             price_list = ast.literal_eval(price_list_str)
-            prices = [
-                Price(
-                    date=DateUtils.parse_date(price_dict['date']),
-                    value=price_dict['value'],
-                )
-                for price_dict in price_list
-            ]
-
-            asset = Asset(code=code, name=name, prices=prices)
-            assets.append(asset)
+            dates = DateUtils.parse_dates([price_dict['date'] for price_dict in price_list])
+            values = [price_dict['value'] for price_dict in price_list]
+
+            # Validate the whole series at once instead of once per price
+            try:
+                Price.validate_batch(dates, values)
+            except ValueError as e:
+                raise ValueError(f"Asset {code}: {e} Run src/validate_data.py for a full report.") from e
+
+            # The distributions column is optional too, in the same format as the prices
+            distribution_list_str = row.get('distributions')
+            distribution_list = (
+                ast.literal_eval(distribution_list_str)
+                if isinstance(distribution_list_str, str) and distribution_list_str.strip() else ()
+            )
+            if isinstance(distribution_list, dict):
+                distribution_list = (distribution_list,)
+            distributions = (
+                DateUtils.parse_dates([distribution_dict['date'] for distribution_dict in distribution_list]),
+                [float(distribution_dict['amount']) for distribution_dict in distribution_list],
+            )
+            series.append((code, name, currency, dates, np.asarray(values, dtype=precision), distributions))
+
+        # Grow the shared calendar once for the whole universe rather than per asset
+        if series:
+            TradingCalendar.extend(np.concatenate([dates for _, _, _, dates, _, _ in series]))
 
+        assets = []
+        for code, name, currency, dates, values, distributions in series:
+            asset = Asset.from_arrays(code=code, name=name, dates=dates, values=values, currency=currency)
+            asset.set_distributions(*distributions)
+            assets.append(asset)
         return assets
 
-    def load_portfolio_comparisons(self) -> List[PortfolioComparison]:
-        portfolio_comparisons = []
+    @staticmethod
+    def read_raw_series_csv(asset_data_path: str) -> List[Tuple[str, np.ndarray, np.ndarray]]:
+        """Return the ``(code, dates, values)`` of every asset in file order, without validating the prices.
 
-        with open(self.portfolio_comparison_config_path, 'r', encoding='utf-8') as file:
-            portfolio_comparison_data = json.load(file)
+        Values that are not numbers are read as NaN, so that a data check can
+        report them rather than fail on the first one.
+        """
+        series = []
+
+        df = pd.read_csv(asset_data_path, encoding='utf-8')
+
+        for _, row in df.iterrows():
+            code = str(row['code']).strip()
+            price_list_str = row['prices']
+            # Matching the date/value pairs is much faster than evaluating the literal
+            pairs = DataLoader.RAW_PRICE_PATTERN.findall(price_list_str)
+            if len(pairs) != price_list_str.count('{'):
+                pairs = [
+                    (price_dict['date'], price_dict.get('value'))
+                    for price_dict in ast.literal_eval(price_list_str)
+                ]
+            date_strs = [price_date for price_date, _ in pairs]
+            value_strs = [value for _, value in pairs]
+
+            try:
+                dates = DateUtils.parse_dates(date_strs)
+            except ValueError as e:
+                raise ValueError(f"Asset {code} has an invalid date: {e}") from e
+            try:
+                values = np.asarray(value_strs, dtype=np.float64)
+            except (TypeError, ValueError):
+                values = np.array([DataLoader._to_float_or_nan(value) for value in value_strs], dtype=np.float64)
+            series.append((code, dates.astype('datetime64[D]'), values))
+
+        return series
+
+    @staticmethod
+    def _to_float_or_nan(value) -> float:
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            return np.nan
+
+    @staticmethod
+    def load_price_delta_csv(delta_path: str) -> List[Tuple[str, date, float]]:
+        """Read new price observations from a ``code,date,value`` CSV file."""
+        observations = []
+
+        with open(delta_path, 'r', encoding='utf-8', newline='') as file:
+            for row in csv.DictReader(file):
+                observations.append((
+                    row['code'].strip(),
+                    DateUtils.parse_date(row['date'].strip()),
+                    float(row['value']),
+                ))
+
+        return observations
+
+    def load_scenarios(self, scenario_path: str) -> List[Scenario]:
+        """Read a JSON list of named windows, each with ``name``, ``start`` and ``end`` fields."""
+        with open(scenario_path, 'r', encoding='utf-8') as file:
+            scenario_data = json.load(file)
+
+        date_ranges = self._load_date_ranges(scenario_data)
+        return [
+            Scenario(name=item['name'], date_range=date_range)
+            for item, date_range in zip(scenario_data, date_ranges)
+        ]
+
+    def load_portfolio_comparisons(self, config_path: Optional[str] = None) -> List[PortfolioComparison]:
+        return list(self.iter_portfolio_comparisons(config_path))
+
+    def iter_portfolio_comparisons(
+        self,
+        config_path: Optional[str] = None,
+        on_error: Optional[Callable[[dict, Exception], None]] = None,
+    ) -> Iterator[PortfolioComparison]:
+        """Yield the comparisons of a config file one at a time.
+
+        The config is either a JSON array or, for ``.jsonl``/``.ndjson`` files,
+        one comparison per line. Either way only one comparison is decoded and
+        built at a time. If ``on_error`` is given, a comparison that cannot be
+        built is passed to it with the error and skipped instead of raising.
+        """
+        config_path = config_path or self.portfolio_comparison_config_path
+        is_json_lines = os.path.splitext(config_path)[1].lower() in self.JSON_LINES_EXTENSIONS
+
+        with open(config_path, 'r', encoding='utf-8') as file:
+            reader = JSONStreamReader(file)
+            items = reader.iter_lines() if is_json_lines else reader.iter_array()
+            for item in items:
+                try:
+                    portfolio_comparison = self.parse_portfolio_comparisons([item])[0]
+                except Exception as e:
+                    if on_error is None:
+                        raise
+                    on_error(item, e)
+                    continue
+                yield portfolio_comparison
+
+    def parse_portfolio_comparisons(self, portfolio_comparison_data: List[dict]) -> List[PortfolioComparison]:
+        """Build comparisons from already decoded data in the config file schema."""
+        portfolio_comparisons = []
 
         for item in portfolio_comparison_data:
             title = item['title']
-            date_ranges = self._load_date_ranges(item['date_ranges'])
-            portfolios = self._load_portfolios(item['portfolios'])
+            # A comparison-wide frequency applies to every date range that does not set its own
+            date_ranges = self._load_date_ranges(item['date_ranges'], item.get('frequency', 'daily'))
+            portfolios = self._load_portfolios(item['portfolios'], self._get_covering_date_range(date_ranges))
 
             portfolio_comparison = PortfolioComparison(
                 title=title,
@@ -95,7 +318,7 @@ class DataLoader:
 
         return portfolio_comparisons
 
-    def _load_date_ranges(self, date_range_data: List[dict]) -> List[DateRange]:
+    def _load_date_ranges(self, date_range_data: List[dict], frequency: str = 'daily') -> List[DateRange]:
         date_ranges = []
 
         for item in date_range_data:
@@ -112,32 +335,54 @@ class DataLoader:
             else:
                 end_date = DateUtils.parse_date(end_date_str)
 
-            date_range = DateRange(start_date=start_date, end_date=end_date)
+            date_range = DateRange(
+                start_date=start_date,
+                end_date=end_date,
+                frequency=item.get('frequency', frequency),
+            )
             date_ranges.append(date_range)
 
         return date_ranges
 
-    def _load_portfolios(self, portfolio_data: List[dict]) -> List[Portfolio]:
+    def _get_covering_date_range(self, date_ranges: List[DateRange]) -> DateRange:
+        return DateRange(
+            start_date=min(date_range.get_start_date() for date_range in date_ranges),
+            end_date=max(date_range.get_end_date() for date_range in date_ranges),
+        )
+
+    def _load_portfolios(self, portfolio_data: List[dict], date_range: DateRange) -> List[Portfolio]:
         portfolios = []
 
         for item in portfolio_data:
             title = item['title']
-            assets = self._load_portfolio_assets(item['assets'])
+            assets = self._load_portfolio_assets(item['assets'], date_range)
             is_set_default = item.get('set_default', False)
+            contribution_schedule = self._load_contribution_schedule(item.get('contributions'))
 
-            portfolio = Portfolio(title=title, assets=assets, is_set_default=is_set_default)
+            portfolio = Portfolio(
+                title=title,
+                assets=assets,
+                is_set_default=is_set_default,
+                contribution_schedule=contribution_schedule,
+            )
             portfolios.append(portfolio)
 
         return portfolios
     
-    def _load_portfolio_assets(self, portfolio_asset_data: List[dict]) -> List[PortfolioAsset]:
+    def _load_contribution_schedule(self, contribution_data: Optional[dict]) -> Optional[ContributionSchedule]:
+        if contribution_data is None:
+            return None
+        return ContributionSchedule(
+            amount=contribution_data.get('amount'),
+            frequency=contribution_data.get('frequency', 'monthly'),
+            initial_amount=contribution_data.get('initial_amount'),
+        )
+
+    def _load_portfolio_assets(self, portfolio_asset_data: List[dict], date_range: DateRange) -> List[PortfolioAsset]:
         portfolio_assets = []
 
         for item in portfolio_asset_data:
-            asset = next(
-                (a for a in self.asset_data if a.get_code() == item['code']),
-                None
-            )
+            asset = self._find_asset(item['code'], date_range)
             weight = item.get('weight', None)
             withholding_tax_rate = item.get('withholding_tax_rate', 0.0) # Default to 0.0
 
@@ -145,3 +390,65 @@ class DataLoader:
             portfolio_assets.append(portfolio_asset)
 
         return portfolio_assets
+
+    def _find_asset(self, code: str, date_range: DateRange) -> Optional[Asset]:
+        asset = self._find_stored_asset(code, date_range)
+        if asset is None or self.currency_converter is None:
+            return asset
+        return self.currency_converter.convert(asset)
+
+    def _find_stored_asset(self, code: str, date_range: DateRange) -> Optional[Asset]:
+        if self.price_store is None:
+            return self.asset_index.get(code)
+
+        # Only the part of the history covered by the comparison is read from the store
+        key = (code, date_range.get_start_date(), date_range.get_end_date())
+        with self.price_store_lock:
+            if key in self.asset_cache:
+                self.asset_cache.move_to_end(key)
+                return self.asset_cache[key]
+
+            asset = (
+                self._load_stored_asset(code, date_range) if self.lazy_assets
+                else self.price_store.load_asset(code, date_range, self.precision)
+            )
+            self.asset_cache[key] = asset
+            while len(self.asset_cache) > self.asset_cache_size:
+                self.asset_cache.popitem(last=False)
+            return asset
+
+    def _load_stored_asset(self, code: str, date_range: DateRange) -> Optional[StoredAsset]:
+        stored_date_range = self.price_store.get_date_range(code, date_range)
+        if stored_date_range is None:
+            return None
+        return StoredAsset(
+            price_store=self.price_store,
+            price_store_lock=self.price_store_lock,
+            code=code,
+            name=self.price_store.get_name(code),
+            currency=self.price_store.get_currency(code),
+            date_range=stored_date_range,
+            precision=self.precision,
+        )
+
+    def _open_price_store(self) -> Optional[SQLitePriceStore]:
+        if self.storage_backend != 'sqlite':
+            return None
+        if not os.path.exists(self.asset_data_path):
+            raise FileNotFoundError(f"Asset database not found: {self.asset_data_path}")
+        return SQLitePriceStore(self.asset_data_path)
+
+    def _check_validity(self) -> bool:
+        if self.storage_backend not in self.STORAGE_BACKENDS:
+            raise ValueError(f"Storage backend must be one of {', '.join(self.STORAGE_BACKENDS)}.")
+        if self.lazy_assets and self.storage_backend != 'sqlite':
+            raise ValueError("Lazy assets are only supported by the sqlite storage backend.")
+        if self.precision not in Asset.PRECISIONS:
+            raise ValueError(f"Precision must be one of {', '.join(Asset.PRECISIONS)}.")
+        if self.fx_data_path and not self.base_currency:
+            raise ValueError("FX data requires a base currency to convert into.")
+        if self.base_currency and self.lazy_assets:
+            raise ValueError("Currency conversion is not supported with lazy assets.")
+        if not isinstance(self.asset_cache_size, int) or self.asset_cache_size < 0:
+            raise ValueError("Asset cache size must be a non-negative integer.")
+        return True
@@ -0,0 +1,245 @@
+"""
+custom-portfolio-analyzer - A tool to model, back-test, and compare the performance of your own custom portfolios.
+Copyright (C) 2025  Fevzi Babaoğlu
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Lesser General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""
+
+
+import numpy as np
+import pandas as pd
+from typing import List, Sequence, Tuple
+
+
+class DataQualityScanner:
+    """Scan the raw price series of the whole universe for data problems.
+
+    All series are laid end to end in flat arrays, so every check is a
+    handful of array operations over the universe rather than a loop over
+    assets. Series are checked as stored, before any price validation:
+
+    * ``out_of_order``: rows whose date is before the previous row's, one issue per asset.
+    * ``duplicate_date``: dates with more than one row. The value is the spread of their values.
+    * ``non_finite``: missing or non-numeric values.
+    * ``non_positive``: zero or negative values.
+    * ``calendar_gap``: runs of dates of the shared calendar (every date any
+      asset has a price on) missing between the first and last date of an asset.
+    * ``stale``: runs of at least ``stale_run_length`` observations with the same value.
+    * ``outlier_move``: moves from the previous observation whose log return is
+      more than ``outlier_z`` robust standard deviations (scaled median absolute
+      deviations) from the asset's median. The value is the simple return.
+
+    The remaining checks use the first row of every date, in date order.
+    """
+
+    CHECKS = (
+        'out_of_order', 'duplicate_date', 'non_finite', 'non_positive', 'calendar_gap', 'stale', 'outlier_move',
+    )
+    ISSUE_COLUMNS = ['code', 'check', 'start_date', 'end_date', 'count', 'value']
+    SUMMARY_COLUMNS = ['code', 'observations', 'first_date', 'last_date', 'issues', *CHECKS]
+
+    # Scales a median absolute deviation to a standard deviation for normal data
+    MAD_SCALE = 1.4826
+    # Smallest move scale, so that a series with mostly unchanged prices does not flag every move
+    MIN_MOVE_SCALE = 1e-3
+
+    def __init__(
+        self,
+        series: Sequence[Tuple[str, np.ndarray, np.ndarray]],
+        stale_run_length: int = 5,
+        outlier_z: float = 10.0,
+        min_gap_length: int = 1,
+    ):
+        self.series = list(series)
+        self.stale_run_length = stale_run_length
+        self.outlier_z = outlier_z
+        self.min_gap_length = min_gap_length
+        self._check_validity()
+
+        self.codes = np.array([code for code, _, _ in self.series], dtype=object)
+        self.issue_table = self.generate_issue_table()
+
+    def get_issue_table(self) -> pd.DataFrame:
+        return self.issue_table
+
+    def get_summary_table(self) -> pd.DataFrame:
+        """One row per asset with its observation count, date span and the number of issues of every check."""
+        counts = (
+            pd.crosstab(self.issue_table['code'], self.issue_table['check'])
+            .reindex(index=self.codes, columns=list(self.CHECKS), fill_value=0)
+        )
+        spans = [
+            (len(dates), dates.min().astype(object), dates.max().astype(object)) if len(dates) else (0, None, None)
+            for _, dates, _ in self.series
+        ]
+        summary = pd.DataFrame(spans, columns=['observations', 'first_date', 'last_date'])
+        summary.insert(0, 'code', self.codes)
+        summary['issues'] = counts.to_numpy().sum(axis=1)
+        for check in self.CHECKS:
+            summary[check] = counts[check].to_numpy()
+        return summary[self.SUMMARY_COLUMNS]
+
+    def generate_issue_table(self) -> pd.DataFrame:
+        lengths = np.array([len(dates) for _, dates, _ in self.series], dtype=np.int64)
+        if not lengths.sum():
+            return self._to_issue_table([])
+        segments = np.repeat(np.arange(len(self.series)), lengths)
+        dates = np.concatenate([np.asarray(dates, dtype='datetime64[D]') for _, dates, _ in self.series])
+        values = np.concatenate([np.asarray(values, dtype=np.float64) for _, _, values in self.series])
+
+        is_out_of_order = np.append(False, (segments[1:] == segments[:-1]) & (dates[1:] < dates[:-1]))
+        issues = [self._scan_out_of_order(segments, dates, is_out_of_order)]
+
+        if is_out_of_order.any():
+            # Stable, so the first row of every date is the first one in the file
+            order = np.lexsort((dates, segments))
+            segments, dates, values = segments[order], dates[order], values[order]
+        same_segment = segments[1:] == segments[:-1]
+        is_repeat = np.append(False, same_segment & (dates[1:] == dates[:-1]))
+        issues.append(self._scan_duplicates(segments, dates, values, is_repeat))
+
+        issues.append(self._to_issues('non_finite', segments, dates, dates, 1, values, ~np.isfinite(values)))
+        issues.append(self._to_issues('non_positive', segments, dates, dates, 1, values, values <= 0))
+
+        segments, dates, values = segments[~is_repeat], dates[~is_repeat], values[~is_repeat]
+        issues.append(self._scan_calendar_gaps(segments, dates))
+        issues.append(self._scan_stale_runs(segments, dates, values))
+        issues.append(self._scan_outlier_moves(segments, dates, values))
+        return self._to_issue_table(issues)
+
+    def _scan_out_of_order(self, segments: np.ndarray, dates: np.ndarray, flagged: np.ndarray) -> pd.DataFrame:
+        """Rows dated before the previous row, with the earliest and latest of their dates and their count."""
+        flagged_segments = segments[flagged]
+        flagged_days = dates[flagged].astype(np.int64)
+
+        affected, counts = np.unique(flagged_segments, return_counts=True)
+        earliest = np.full(len(self.series), np.iinfo(np.int64).max)
+        latest = np.full(len(self.series), np.iinfo(np.int64).min)
+        np.minimum.at(earliest, flagged_segments, flagged_days)
+        np.maximum.at(latest, flagged_segments, flagged_days)
+        return self._to_issues(
+            'out_of_order', affected, earliest[affected].astype('datetime64[D]'),
+            latest[affected].astype('datetime64[D]'), counts, np.nan,
+        )
+
+    def _scan_duplicates(
+        self,
+        segments: np.ndarray,
+        dates: np.ndarray,
+        values: np.ndarray,
+        is_repeat: np.ndarray,
+    ) -> pd.DataFrame:
+        starts = np.flatnonzero(~is_repeat)
+        counts = np.diff(np.append(starts, len(dates)))
+        with np.errstate(invalid='ignore'):
+            spreads = np.fmax.reduceat(values, starts) - np.fmin.reduceat(values, starts)
+        duplicated = counts > 1
+        starts = starts[duplicated]
+        return self._to_issues(
+            'duplicate_date', segments[starts], dates[starts], dates[starts], counts[duplicated], spreads[duplicated],
+        )
+
+    def _scan_calendar_gaps(self, segments: np.ndarray, dates: np.ndarray) -> pd.DataFrame:
+        """Runs of shared calendar dates missing between two consecutive dates of an asset."""
+        calendar = np.unique(dates)
+        positions = np.searchsorted(calendar, dates)
+        missing = np.diff(positions) - 1
+        flagged = (segments[1:] == segments[:-1]) & (missing >= self.min_gap_length) & (missing > 0)
+        rows = np.flatnonzero(flagged)
+        return self._to_issues(
+            'calendar_gap', segments[rows], calendar[positions[rows] + 1], calendar[positions[rows + 1] - 1],
+            missing[rows], np.nan,
+        )
+
+    def _scan_stale_runs(self, segments: np.ndarray, dates: np.ndarray, values: np.ndarray) -> pd.DataFrame:
+        """Runs of consecutive observations with the same value."""
+        is_unchanged = np.append(False, (segments[1:] == segments[:-1]) & (values[1:] == values[:-1]))
+        starts = np.flatnonzero(~is_unchanged)
+        ends = np.append(starts[1:], len(values)) - 1
+        lengths = ends - starts + 1
+        stale = lengths >= self.stale_run_length
+        starts, ends = starts[stale], ends[stale]
+        return self._to_issues('stale', segments[starts], dates[starts], dates[ends], lengths[stale], values[starts])
+
+    def _scan_outlier_moves(self, segments: np.ndarray, dates: np.ndarray, values: np.ndarray) -> pd.DataFrame:
+        """Moves far from the typical move of the asset, measured on robust statistics of its log returns."""
+        is_usable = np.isfinite(values) & (values > 0)
+        has_move = np.flatnonzero((segments[1:] == segments[:-1]) & is_usable[1:] & is_usable[:-1]) + 1
+        move_segments = segments[has_move]
+        log_returns = np.log(values[has_move] / values[has_move - 1])
+
+        medians = self._get_segment_medians(log_returns, move_segments)
+        deviations = np.abs(log_returns - medians[move_segments])
+        scales = np.maximum(self.MAD_SCALE * self._get_segment_medians(deviations, move_segments), self.MIN_MOVE_SCALE)
+        flagged = deviations > self.outlier_z * scales[move_segments]
+
+        rows = has_move[flagged]
+        return self._to_issues(
+            'outlier_move', segments[rows], dates[rows - 1], dates[rows], 1, np.expm1(log_returns[flagged]),
+        )
+
+    def _get_segment_medians(self, values: np.ndarray, segments: np.ndarray) -> np.ndarray:
+        """Median of the values of every series, NaN for a series without values.
+
+        The values, grouped by series, are laid out as the rows of a
+        NaN-padded matrix, which sorts far faster row by row than a lexical
+        sort of the flat arrays.
+        """
+        counts = np.bincount(segments, minlength=len(self.series))
+        if not len(values):
+            return np.full(len(self.series), np.nan)
+        starts = np.cumsum(counts) - counts
+        matrix = np.full((len(self.series), counts.max()), np.nan)
+        matrix[segments, np.arange(len(values)) - starts[segments]] = values
+        matrix.sort(axis=1)
+
+        rows = np.arange(len(self.series))
+        lower = np.maximum((counts - 1) // 2, 0)
+        medians = (matrix[rows, lower] + matrix[rows, counts // 2]) / 2
+        return np.where(counts > 0, medians, np.nan)
+
+    def _to_issues(self, check, segments, start_dates, end_dates, counts, values, mask=None) -> pd.DataFrame:
+        if mask is not None:
+            segments, start_dates, end_dates = segments[mask], start_dates[mask], end_dates[mask]
+            values = values[mask] if np.ndim(values) else values
+        return pd.DataFrame({
+            'code': self.codes[segments],
+            'check': check,
+            'start_date': np.asarray(start_dates, dtype='datetime64[D]').astype(object),
+            'end_date': np.asarray(end_dates, dtype='datetime64[D]').astype(object),
+            'count': np.broadcast_to(counts, len(segments)).astype(np.int64),
+            'value': np.broadcast_to(values, len(segments)).astype(np.float64),
+        }, columns=self.ISSUE_COLUMNS)
+
+    def _to_issue_table(self, issues: List[pd.DataFrame]) -> pd.DataFrame:
+        issues = [table for table in issues if len(table)]
+        if not issues:
+            return pd.DataFrame(columns=self.ISSUE_COLUMNS)
+        table = pd.concat(issues, ignore_index=True)
+        table['check'] = pd.Categorical(table['check'], categories=self.CHECKS)
+        table = table.sort_values(['code', 'start_date', 'check'], kind='stable', ignore_index=True)
+        table['check'] = table['check'].astype(str)
+        return table
+
+    def _check_validity(self) -> bool:
+        if not isinstance(self.stale_run_length, int) or self.stale_run_length < 2:
+            raise ValueError("Stale run length must be an integer of at least 2.")
+        if not isinstance(self.outlier_z, (int, float)) or not self.outlier_z > 0:
+            raise ValueError("Outlier threshold must be a positive number.")
+        if not isinstance(self.min_gap_length, int) or self.min_gap_length < 1:
+            raise ValueError("Minimum gap length must be a positive integer.")
+        for code, dates, values in self.series:
+            if len(dates) != len(values):
+                raise ValueError(f"Dates and price values of asset {code} must have the same amount of elements.")
+        return True
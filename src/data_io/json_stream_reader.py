@@ -0,0 +1,140 @@
+"""
+custom-portfolio-analyzer - A tool to model, back-test, and compare the performance of your own custom portfolios.
+Copyright (C) 2025  Fevzi Babaoğlu
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Lesser General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""
+
+
+import json
+import re
+from typing import Iterator, Optional, TextIO
+
+
+class JSONStreamReader:
+    """Yield the items of a JSON array, or of a JSON Lines file, one at a time.
+
+    Only the item being decoded and the chunks read for it are held in memory, so
+    the size of the file does not matter.
+    """
+
+    WHITESPACE = re.compile(r'[ \t\n\r]*')
+    DELIMITERS = ' \t\n\r,]'
+
+    def __init__(self, file: TextIO, chunk_size: int = 64 * 1024):
+        self.file = file
+        self.chunk_size = chunk_size
+        self.decoder = json.JSONDecoder()
+        self.buffer = ''
+        self.position = 0
+        self.eof = False
+
+    def iter_lines(self) -> Iterator[object]:
+        for line_number, line in enumerate(self.file, start=1):
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"Invalid JSON on line {line_number}: {e}") from e
+
+    def iter_array(self) -> Iterator[object]:
+        self._skip_whitespace()
+        if not self._peek() == '[':
+            raise ValueError("Expected a JSON array at the top level.")
+        self.position += 1
+
+        self._skip_whitespace()
+        if self._peek() == ']':
+            self.position += 1
+            self._check_end()
+            return
+
+        while True:
+            yield self._decode_item()
+
+            self._skip_whitespace()
+            separator = self._peek()
+            self.position += 1
+            if separator == ']':
+                self._check_end()
+                return
+            if separator != ',':
+                raise ValueError(
+                    "Unterminated JSON array." if separator is None
+                    else f"Expected ',' or ']' between array items, found {separator!r}."
+                )
+            self._skip_whitespace()
+
+    def _decode_item(self) -> object:
+        # Every failed attempt decodes the item again from its start, so the read size doubles
+        # each time to keep the total work linear in the size of the item.
+        read_size = self.chunk_size
+        while True:
+            try:
+                item, end = self.decoder.raw_decode(self.buffer, self.position)
+            except json.JSONDecodeError:
+                # The item may simply continue in the next chunk
+                if self._fill(read_size):
+                    read_size *= 2
+                    continue
+                raise
+
+            # A number that is not followed by a delimiter may continue in the next chunk
+            if (
+                not isinstance(item, (dict, list, str))
+                and (end == len(self.buffer) or self.buffer[end] not in self.DELIMITERS)
+                and self._fill(read_size)
+            ):
+                read_size *= 2
+                continue
+
+            self.position = end
+            return item
+
+    def _check_end(self):
+        self._skip_whitespace()
+        if self._peek() is not None:
+            raise ValueError("Unexpected data after the end of the JSON array.")
+
+    def _peek(self):
+        if self.position >= len(self.buffer) and not self._fill():
+            return None
+        return self.buffer[self.position]
+
+    def _skip_whitespace(self):
+        while True:
+            self.position = self.WHITESPACE.match(self.buffer, self.position).end()
+            if self.position < len(self.buffer) or not self._fill():
+                return
+
+    def _fill(self, size: Optional[int] = None) -> bool:
+        """Read at least `size` more characters (one chunk by default), dropping everything already
+        consumed. Returns False at end of file."""
+        if self.eof:
+            return False
+        chunks = [self.buffer[self.position:]]
+        remaining = size or self.chunk_size
+        while remaining > 0:
+            chunk = self.file.read(self.chunk_size)
+            if not chunk:
+                self.eof = True
+                break
+            chunks.append(chunk)
+            remaining -= len(chunk)
+        if len(chunks) == 1:
+            return False
+        self.buffer = ''.join(chunks)
+        self.position = 0
+        return True
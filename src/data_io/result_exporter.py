@@ -0,0 +1,64 @@
+"""
+custom-portfolio-analyzer - A tool to model, back-test, and compare the performance of your own custom portfolios.
+Copyright (C) 2025  Fevzi Babaoğlu
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Lesser General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""
+
+
+import csv
+from typing import Iterable
+
+from data_struct import DateUtils, PerformancePortfolioComparison
+
+
+class ResultExporter:
+    """Write analysis results as a long-format CSV table, one row per portfolio and date."""
+
+    COLUMNS = [
+        'comparison', 'start_date', 'end_date', 'portfolio_code', 'portfolio_title',
+        'set_default', 'date', 'profit_ratio',
+    ]
+
+    def __init__(self, output_path: str):
+        self.output_path = output_path
+        self.file = open(output_path, 'w', encoding='utf-8', newline='')
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(self.COLUMNS)
+
+    def __enter__(self) -> 'ResultExporter':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        self.file.close()
+
+    def write_comparison(self, title: str, performance_portfolio_comparisons: Iterable[PerformancePortfolioComparison]):
+        for ppc in performance_portfolio_comparisons:
+            date_range = ppc.get_date_range()
+            start_date = DateUtils.format_date(date_range.get_start_date())
+            end_date = DateUtils.format_date(date_range.get_end_date())
+
+            for performance_asset in ppc.get_performance_assets():
+                asset = performance_asset.get_asset()
+                dates = DateUtils.format_dates(asset.get_dates())
+                self.writer.writerows(
+                    (
+                        title, start_date, end_date, asset.get_code(), asset.get_name(),
+                        performance_asset.is_set_default(), price_date, profit_ratio,
+                    )
+                    for price_date, profit_ratio in zip(dates, performance_asset.get_profit_ratios())
+                )
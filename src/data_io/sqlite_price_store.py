@@ -0,0 +1,401 @@
+"""
+custom-portfolio-analyzer - A tool to model, back-test, and compare the performance of your own custom portfolios.
+Copyright (C) 2025  Fevzi Babaoğlu
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Lesser General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""
+
+
+import itertools
+import math
+import numpy as np
+import sqlite3
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from data_struct import Asset, DateRange, Price, TradingCalendar
+
+
+class SQLitePriceStore:
+    """Price history stored in a local SQLite database.
+
+    Prices are kept in a single table keyed by ``(code, date)``, with dates
+    encoded as days since the Unix epoch so that they map directly onto
+    ``datetime64[D]`` arrays. Distribution events are kept the same way in a
+    second table. Every write bumps a store-wide data version and
+    the version of each touched asset, which caches can use as their key.
+    """
+
+    SCHEMA = (
+        """
+        CREATE TABLE IF NOT EXISTS assets (
+            code TEXT PRIMARY KEY,
+            name TEXT NOT NULL,
+            version INTEGER NOT NULL DEFAULT 0
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS prices (
+            code TEXT NOT NULL,
+            date INTEGER NOT NULL,
+            value REAL NOT NULL,
+            PRIMARY KEY (code, date)
+        ) WITHOUT ROWID
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS distributions (
+            code TEXT NOT NULL,
+            date INTEGER NOT NULL,
+            amount REAL NOT NULL,
+            PRIMARY KEY (code, date)
+        ) WITHOUT ROWID
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS metadata (
+            key TEXT PRIMARY KEY,
+            value INTEGER NOT NULL
+        )
+        """,
+    )
+
+    # Columns added after the first schema version, created on older databases
+    MIGRATIONS = {
+        'assets': (
+            ('version', 'INTEGER NOT NULL DEFAULT 0'),
+            ('currency', 'TEXT'),
+        ),
+    }
+
+    PRICE_DTYPE = np.dtype([('date', np.int64), ('value', np.float64)])
+    DISTRIBUTION_DTYPE = np.dtype([('date', np.int64), ('amount', np.float64)])
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        # Callers sharing a store across threads serialize access themselves
+        self.connection = sqlite3.connect(db_path, check_same_thread=False)
+        self._create_schema()
+
+    def __enter__(self) -> 'SQLitePriceStore':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        self.connection.close()
+
+    def get_codes(self) -> List[str]:
+        cursor = self.connection.execute("SELECT code FROM assets ORDER BY code")
+        return [row[0] for row in cursor]
+
+    def get_name(self, code: str) -> Optional[str]:
+        row = self.connection.execute(
+            "SELECT name FROM assets WHERE code = ?", (code,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def get_currency(self, code: str) -> Optional[str]:
+        row = self.connection.execute(
+            "SELECT currency FROM assets WHERE code = ?", (code,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def get_data_version(self) -> int:
+        row = self.connection.execute(
+            "SELECT value FROM metadata WHERE key = 'data_version'"
+        ).fetchone()
+        return row[0] if row else 0
+
+    @classmethod
+    def read_data_version(cls, db_path: str) -> int:
+        """Data version of the store at ``db_path``, read over a short-lived connection of its own."""
+        with cls(db_path) as price_store:
+            return price_store.get_data_version()
+
+    def get_asset_version(self, code: str) -> Optional[int]:
+        row = self.connection.execute(
+            "SELECT version FROM assets WHERE code = ?", (code,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def get_last_date(self, code: str) -> Optional[date]:
+        row = self.connection.execute(
+            "SELECT MAX(date) FROM prices WHERE code = ?", (code,)
+        ).fetchone()
+        return self.day_to_date(row[0]) if row[0] is not None else None
+
+    def get_last_dates(self) -> Dict[str, Optional[date]]:
+        """Return the last stored date of every asset in one query, None for assets without prices."""
+        cursor = self.connection.execute(
+            "SELECT assets.code, MAX(prices.date) FROM assets "
+            "LEFT JOIN prices ON prices.code = assets.code GROUP BY assets.code"
+        )
+        return {
+            code: self.day_to_date(day) if day is not None else None
+            for code, day in cursor
+        }
+
+    def get_date_range(self, code: str, date_range: Optional[DateRange] = None) -> Optional[DateRange]:
+        """Return the first and last stored dates of an asset, optionally within a date range."""
+        if date_range is None:
+            row = self.connection.execute(
+                "SELECT MIN(date), MAX(date) FROM prices WHERE code = ?", (code,)
+            ).fetchone()
+        else:
+            row = self.connection.execute(
+                "SELECT MIN(date), MAX(date) FROM prices WHERE code = ? AND date BETWEEN ? AND ?",
+                (
+                    code,
+                    self.date_to_day(date_range.get_start_date()),
+                    self.date_to_day(date_range.get_end_date()),
+                ),
+            ).fetchone()
+
+        if row[0] is None:
+            return None
+        return DateRange(start_date=self.day_to_date(row[0]), end_date=self.day_to_date(row[1]))
+
+    def read_prices(
+        self,
+        code: str,
+        date_range: Optional[DateRange] = None,
+        precision: str = 'float64',
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Return the ``(dates, values)`` arrays of an asset, optionally limited to a date range.
+
+        Values are stored as float64 and converted to ``precision`` on read.
+        """
+        if date_range is None:
+            cursor = self.connection.execute(
+                "SELECT date, value FROM prices WHERE code = ? ORDER BY date",
+                (code,),
+            )
+        else:
+            cursor = self.connection.execute(
+                "SELECT date, value FROM prices WHERE code = ? AND date BETWEEN ? AND ? ORDER BY date",
+                (
+                    code,
+                    self.date_to_day(date_range.get_start_date()),
+                    self.date_to_day(date_range.get_end_date()),
+                ),
+            )
+
+        records = np.fromiter(cursor, dtype=self.PRICE_DTYPE)
+        return records['date'].astype('datetime64[D]'), records['value'].astype(precision, copy=False)
+
+    def read_raw_series(self) -> List[Tuple[str, np.ndarray, np.ndarray]]:
+        """Return the ``(code, dates, values)`` of every stored asset without validating the prices."""
+        counts = self.connection.execute(
+            "SELECT code, COUNT(*) FROM prices GROUP BY code ORDER BY code"
+        ).fetchall()
+        records = np.fromiter(
+            self.connection.execute("SELECT date, value FROM prices ORDER BY code, date"),
+            dtype=self.PRICE_DTYPE,
+        )
+        dates = records['date'].astype('datetime64[D]')
+        ends = np.cumsum([count for _, count in counts], dtype=np.int64)
+        return [
+            (code, dates[end - count:end], records['value'][end - count:end])
+            for (code, count), end in zip(counts, ends)
+        ]
+
+    def read_distributions(
+        self,
+        code: str,
+        date_range: Optional[DateRange] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Return the ``(dates, amounts)`` arrays of the distribution events of an asset."""
+        if date_range is None:
+            cursor = self.connection.execute(
+                "SELECT date, amount FROM distributions WHERE code = ? ORDER BY date",
+                (code,),
+            )
+        else:
+            cursor = self.connection.execute(
+                "SELECT date, amount FROM distributions WHERE code = ? AND date BETWEEN ? AND ? ORDER BY date",
+                (
+                    code,
+                    self.date_to_day(date_range.get_start_date()),
+                    self.date_to_day(date_range.get_end_date()),
+                ),
+            )
+
+        records = np.fromiter(cursor, dtype=self.DISTRIBUTION_DTYPE)
+        return records['date'].astype('datetime64[D]'), records['amount']
+
+    def load_asset(
+        self,
+        code: str,
+        date_range: Optional[DateRange] = None,
+        precision: str = 'float64',
+    ) -> Optional[Asset]:
+        """Build an ``Asset`` from the stored prices, or return None if nothing is stored."""
+        name = self.get_name(code)
+        if name is None:
+            return None
+
+        dates, values = self.read_prices(code, date_range, precision)
+        if not len(dates):
+            return None
+
+        Price.validate_batch(dates, values)
+        asset = Asset.from_arrays(
+            code=code, name=name, dates=dates, values=values, currency=self.get_currency(code),
+        )
+        asset.set_distributions(*self.read_distributions(code, date_range))
+        return asset
+
+    def load_assets(self, date_range: Optional[DateRange] = None, precision: str = 'float64') -> List[Asset]:
+        series = []
+        for code in self.get_codes():
+            dates, values = self.read_prices(code, date_range, precision)
+            if len(dates):
+                try:
+                    Price.validate_batch(dates, values)
+                except ValueError as e:
+                    raise ValueError(f"Asset {code}: {e} Run src/validate_data.py for a full report.") from e
+                series.append((code, self.get_name(code), self.get_currency(code), dates, values))
+
+        # Grow the shared calendar once for the whole universe rather than per asset
+        if series:
+            TradingCalendar.extend(np.concatenate([dates for _, _, _, dates, _ in series]))
+
+        assets = []
+        for code, name, currency, dates, values in series:
+            asset = Asset.from_arrays(code=code, name=name, dates=dates, values=values, currency=currency)
+            asset.set_distributions(*self.read_distributions(code, date_range))
+            assets.append(asset)
+        return assets
+
+    def write_assets(self, assets: Iterable[Asset]):
+        """Insert or replace the full price and distribution history of each asset in one transaction."""
+        with self.connection:
+            version = self._bump_data_version()
+            for asset in assets:
+                self.connection.execute(
+                    "INSERT OR REPLACE INTO assets (code, name, version, currency) VALUES (?, ?, ?, ?)",
+                    (asset.get_code(), asset.get_name(), version, asset.get_currency()),
+                )
+                self.connection.execute(
+                    "DELETE FROM prices WHERE code = ?", (asset.get_code(),)
+                )
+                self.connection.executemany(
+                    "INSERT INTO prices (code, date, value) VALUES (?, ?, ?)",
+                    zip(
+                        itertools.repeat(asset.get_code()),
+                        asset.get_dates().astype(np.int64).tolist(),
+                        asset.get_values().tolist(),
+                    ),
+                )
+                distribution_dates, distribution_amounts = asset.get_distributions()
+                self.connection.execute(
+                    "DELETE FROM distributions WHERE code = ?", (asset.get_code(),)
+                )
+                self.connection.executemany(
+                    "INSERT INTO distributions (code, date, amount) VALUES (?, ?, ?)",
+                    zip(
+                        itertools.repeat(asset.get_code()),
+                        distribution_dates.astype(np.int64).tolist(),
+                        distribution_amounts.tolist(),
+                    ),
+                )
+
+    def merge_prices(self, observations: Iterable[Tuple[str, date, float]]) -> int:
+        """Append new ``(code, date, value)`` observations to the stored histories.
+
+        The whole delta is validated before anything is written: values must be
+        positive, dates must be strictly increasing per asset and later than the
+        last stored date, and every code must already exist in the store. Only
+        the tail of each touched asset is looked up, so the cost scales with the
+        size of the delta rather than the size of the store.
+
+        Returns the new data version, or the current one if the delta is empty.
+        """
+        observations_by_code: Dict[str, List[Tuple[int, float]]] = {}
+        for code, price_date, value in observations:
+            if not isinstance(value, float) or not math.isfinite(value) or value <= 0:
+                raise ValueError(f"Invalid price value {value!r} for {code} on {price_date}.")
+            observations_by_code.setdefault(code, []).append((self.date_to_day(price_date), value))
+
+        for code, rows in observations_by_code.items():
+            if self.get_name(code) is None:
+                raise ValueError(f"Unknown asset code in delta: {code}.")
+
+            for (previous_day, _), (day, _) in zip(rows, rows[1:]):
+                if day == previous_day:
+                    raise ValueError(f"Duplicate date {self.day_to_date(day)} for {code} in delta.")
+                if day < previous_day:
+                    raise ValueError(f"Dates for {code} in delta are out of order at {self.day_to_date(day)}.")
+
+            last_date = self.get_last_date(code)
+            if last_date is not None:
+                first_date = self.day_to_date(rows[0][0])
+                if self._has_price(code, rows[0][0]):
+                    raise ValueError(f"Duplicate date {first_date} for {code}: already stored.")
+                if first_date < last_date:
+                    raise ValueError(
+                        f"Date {first_date} for {code} is not after the last stored date {last_date}."
+                    )
+
+        # Nothing is written, so caches keyed by the version stay valid
+        if not observations_by_code:
+            return self.get_data_version()
+
+        with self.connection:
+            version = self._bump_data_version()
+            for code, rows in observations_by_code.items():
+                self.connection.executemany(
+                    "INSERT INTO prices (code, date, value) VALUES (?, ?, ?)",
+                    ((code, day, value) for day, value in rows),
+                )
+                self.connection.execute(
+                    "UPDATE assets SET version = ? WHERE code = ?", (version, code)
+                )
+
+        return version
+
+    @staticmethod
+    def date_to_day(date_obj: date) -> int:
+        return int(np.datetime64(date_obj, 'D').astype(np.int64))
+
+    @staticmethod
+    def day_to_date(day: int) -> date:
+        return np.datetime64(day, 'D').astype(object)
+
+    def _has_price(self, code: str, day: int) -> bool:
+        row = self.connection.execute(
+            "SELECT 1 FROM prices WHERE code = ? AND date = ?", (code, day)
+        ).fetchone()
+        return row is not None
+
+    def _bump_data_version(self) -> int:
+        version = self.get_data_version() + 1
+        self.connection.execute(
+            "INSERT OR REPLACE INTO metadata (key, value) VALUES ('data_version', ?)",
+            (version,),
+        )
+        return version
+
+    def _create_schema(self):
+        with self.connection:
+            for statement in self.SCHEMA:
+                self.connection.execute(statement)
+
+            for table, columns in self.MIGRATIONS.items():
+                existing_columns = {
+                    row[1] for row in self.connection.execute(f"PRAGMA table_info({table})")
+                }
+                for column, definition in columns:
+                    if column not in existing_columns:
+                        self.connection.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
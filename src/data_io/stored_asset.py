@@ -0,0 +1,103 @@
+"""
+custom-portfolio-analyzer - A tool to model, back-test, and compare the performance of your own custom portfolios.
+Copyright (C) 2025  Fevzi Babaoğlu
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Lesser General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""
+
+
+import numpy as np
+import threading
+from typing import List, Optional, Tuple
+
+from data_struct import Asset, DateRange, Price, TradingCalendar
+from .sqlite_price_store import SQLitePriceStore
+
+
+class StoredAsset(Asset):
+    """An asset whose prices stay in the SQLite store.
+
+    Only the code, name and date range are kept in memory. Every price access
+    is a range query against the store, so holding many of these costs almost
+    nothing and memory use follows what is being computed at the moment.
+    """
+
+    __slots__ = ('price_store', 'price_store_lock', 'store_date_range', 'precision')
+
+    def __init__(
+        self,
+        price_store: SQLitePriceStore,
+        price_store_lock: threading.Lock,
+        code: str,
+        name: str,
+        date_range: DateRange,
+        precision: str = 'float64',
+        currency: Optional[str] = None,
+    ):
+        self.code = code
+        self.name = name
+        self.currency = currency
+        self._check_identity()
+
+        self.price_store = price_store
+        self.price_store_lock = price_store_lock
+        self.precision = precision
+        # The part of the stored history this asset exposes
+        self.store_date_range = date_range
+        self.date_range = date_range
+
+    def get_prices(self, date_range: Optional[DateRange] = None) -> List[Price]:
+        dates, values = self._read(date_range)
+        return Price.bulk_from_trusted(dates.astype(object), values.tolist())
+
+    def get_dated_series(self, date_range: Optional[DateRange] = None) -> Tuple[np.ndarray, np.ndarray]:
+        return self._read(date_range)
+
+    def get_values_on(self, dates: np.ndarray) -> np.ndarray:
+        stored_dates, values = self._read(DateRange.from_trusted(
+            start_date=dates[0].astype(object),
+            end_date=dates[-1].astype(object),
+        ))
+        return values[np.searchsorted(stored_dates, dates)]
+
+    def get_distributions(self, date_range: Optional[DateRange] = None) -> Tuple[np.ndarray, np.ndarray]:
+        # An empty intersection selects no rows, so it needs no special case here
+        with self.price_store_lock:
+            return self.price_store.read_distributions(self.code, self._get_query_range(date_range))
+
+    def _slice(self, date_range: Optional[DateRange]) -> Tuple[np.ndarray, np.ndarray]:
+        dates, values = self._read(date_range)
+        date_offsets, _ = TradingCalendar.register(dates)
+        return date_offsets, values
+
+    def _get_query_range(self, date_range: Optional[DateRange]) -> DateRange:
+        """Intersect a requested date range with the exposed part of the stored history; it may end up empty."""
+        if date_range is None:
+            return self.store_date_range
+        return DateRange.from_trusted(
+            start_date=max(date_range.get_start_date(), self.store_date_range.get_start_date()),
+            end_date=min(date_range.get_end_date(), self.store_date_range.get_end_date()),
+        )
+
+    def _read(self, date_range: Optional[DateRange]) -> Tuple[np.ndarray, np.ndarray]:
+        query_range = self._get_query_range(date_range)
+        if query_range.get_start_date() > query_range.get_end_date():
+            return np.empty(0, dtype='datetime64[D]'), np.empty(0, dtype=self.precision)
+
+        with self.price_store_lock:
+            dates, values = self.price_store.read_prices(self.code, query_range, self.precision)
+        # A window with no trading days (a holiday, say) simply has no rows, as in the in-memory asset
+        if len(values):
+            Price.validate_batch(dates, values)
+        return dates, values
@@ -18,6 +18,7 @@ along with this program. If not, see <https://www.gnu.org/licenses/>.
 
 
 from .asset import Asset
+from .contribution_schedule import ContributionSchedule
 from .date_range import DateRange
 from .date_utils import DateUtils
 from .performance_asset import PerformanceAsset
@@ -26,10 +27,14 @@ from .portfolio_asset import PortfolioAsset
 from .portfolio_comparison import PortfolioComparison
 from .portfolio import Portfolio
 from .price import Price
+from .return_attribution import ReturnAttribution
+from .scenario import Scenario
+from .trading_calendar import TradingCalendar
 
 
 __all__ = [
     "Asset",
+    "ContributionSchedule",
     "DateRange",
     "DateUtils",
     "PerformanceAsset",
@@ -38,4 +43,7 @@ __all__ = [
     "PortfolioComparison",
     "Portfolio",
     "Price",
+    "ReturnAttribution",
+    "Scenario",
+    "TradingCalendar",
 ]
@@ -17,23 +17,61 @@ along with this program. If not, see <https://www.gnu.org/licenses/>.
 """
 
 
-from typing import List, Optional
+import numpy as np
+from typing import List, Optional, Tuple
 
 from .date_range import DateRange
 from .price import Price
+from .trading_calendar import TradingCalendar
 
 
 class Asset:
-    def __init__(self, code: str, name: str, prices: List[Price]):
+    """A named price series.
+
+    Dates are kept as offsets into the shared ``TradingCalendar`` next to a
+    value array; ``Price`` objects are only materialized when requested.
+    Distribution events (dividends, fund payouts) are a second, usually much
+    shorter series of dates and cash amounts per unit.
+    """
+
+    __slots__ = (
+        'code', 'name', 'currency', 'calendar_offsets', 'values', 'date_range',
+        'distribution_dates', 'distribution_amounts',
+    )
+
+    # Value precisions an asset can hold; float32 is opt-in for large sweeps
+    PRECISIONS = ('float64', 'float32')
+
+    def __init__(self, code: str, name: str, prices: List[Price], currency: Optional[str] = None):
         self.code = code
         self.name = name
-        self.prices = prices
-        self._check_validity()
+        self.currency = currency
+        self._check_validity(prices)
 
-        self.date_range = DateRange(
-            start_date=prices[0].get_date(),
-            end_date=prices[-1].get_date(),
+        self._set_series(
+            dates=np.array([price.get_date() for price in prices], dtype='datetime64[D]'),
+            values=np.array([price.get_value() for price in prices], dtype=np.float64),
         )
+        self.set_distributions(np.empty(0, dtype='datetime64[D]'), np.empty(0))
+
+    @classmethod
+    def from_arrays(
+        cls,
+        code: str,
+        name: str,
+        dates: np.ndarray,
+        values: np.ndarray,
+        currency: Optional[str] = None,
+    ) -> 'Asset':
+        """Create an asset from a series that already passed ``Price.validate_batch``."""
+        asset = cls.__new__(cls)
+        asset.code = code
+        asset.name = name
+        asset.currency = currency
+        asset._check_identity()
+        asset._set_series(dates=dates, values=values)
+        asset.set_distributions(np.empty(0, dtype='datetime64[D]'), np.empty(0))
+        return asset
 
     def get_code(self) -> str:
         return self.code
@@ -41,19 +79,117 @@ class Asset:
     def get_name(self) -> str:
         return self.name
 
+    def get_currency(self) -> Optional[str]:
+        """ISO 4217 code of the price currency, or None if it is not known."""
+        return self.currency
+
     def get_prices(self, date_range: Optional[DateRange] = None) -> List[Price]:
-        if date_range is None:
-            return self.prices
+        date_offsets, calendar_dates = self._get_current_offsets()
+        start, end = self._get_slice_bounds(date_offsets, calendar_dates, date_range)
+        return Price.bulk_from_trusted(
+            TradingCalendar.to_date_objects(date_offsets[start:end], calendar_dates),
+            self.values[start:end].tolist(),
+        )
 
-        return [
-            p for p in self.prices
-            if date_range.get_start_date() <= p.get_date() <= date_range.get_end_date()
-        ]
+    def get_series(self, date_range: Optional[DateRange] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Return the calendar offsets and values of the asset, optionally limited to a date range."""
+        return self._slice(date_range)
+
+    def get_date_offsets(self, date_range: Optional[DateRange] = None) -> np.ndarray:
+        return self._slice(date_range)[0]
+
+    def get_dates(self, date_range: Optional[DateRange] = None) -> np.ndarray:
+        return self.get_dated_series(date_range)[0]
+
+    def get_dated_series(self, date_range: Optional[DateRange] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Return the ``datetime64`` dates and values of the asset, optionally limited to a date range.
+
+        Unlike calendar offsets, the dates stay valid when the calendar grows,
+        so they can be compared with those of other assets.
+        """
+        date_offsets, calendar_dates = self._get_current_offsets()
+        start, end = self._get_slice_bounds(date_offsets, calendar_dates, date_range)
+        return calendar_dates[date_offsets[start:end]], self.values[start:end]
+
+    def get_values(self, date_range: Optional[DateRange] = None) -> np.ndarray:
+        return self._slice(date_range)[1]
+
+    def get_values_on(self, dates: np.ndarray) -> np.ndarray:
+        """Return the values on the given ``datetime64`` dates, all of which must be present."""
+        date_offsets, calendar_dates = self._get_current_offsets()
+        return self.values[np.searchsorted(date_offsets, np.searchsorted(calendar_dates, dates))]
 
     def get_date_range(self) -> DateRange:
         return self.date_range
 
-    def _check_validity(self) -> bool:
+    def get_distributions(self, date_range: Optional[DateRange] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Return the dates and per-unit cash amounts of the distribution events, optionally limited to a date range."""
+        if date_range is None:
+            return self.distribution_dates, self.distribution_amounts
+
+        start = np.searchsorted(self.distribution_dates, np.datetime64(date_range.get_start_date(), 'D'), side='left')
+        end = np.searchsorted(self.distribution_dates, np.datetime64(date_range.get_end_date(), 'D'), side='right')
+        return self.distribution_dates[start:end], self.distribution_amounts[start:end]
+
+    def set_distributions(self, dates: np.ndarray, amounts: np.ndarray):
+        """Replace the distribution events; each date is the ex-date the amount per unit is paid for."""
+        dates = np.asarray(dates, dtype='datetime64[D]')
+        amounts = np.asarray(amounts, dtype=np.float64)
+        self._check_distributions(dates, amounts)
+
+        order = np.argsort(dates, kind='stable')
+        self.distribution_dates = dates[order]
+        self.distribution_amounts = amounts[order]
+
+    def _set_series(self, dates: np.ndarray, values: np.ndarray):
+        dates = np.asarray(dates, dtype='datetime64[D]')
+        values = np.asarray(values)
+        values = values.astype(np.float32 if values.dtype == np.float32 else np.float64, copy=False)
+
+        # Keep the series sorted so that range slicing is a binary search
+        if np.any(dates[1:] < dates[:-1]):
+            order = np.argsort(dates, kind='stable')
+            dates, values = dates[order], values[order]
+
+        self.calendar_offsets = TradingCalendar.register(dates)
+        self.values = values
+        self.date_range = DateRange.from_trusted(
+            start_date=dates[0].astype(object),
+            end_date=dates[-1].astype(object),
+        )
+
+    def _get_current_offsets(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Return the offsets of the asset together with the calendar dates of the version they refer to."""
+        # Offsets and version are kept in one attribute so that another thread never sees them mismatched.
+        # They are read before the snapshot, whose version can therefore only be the same or newer.
+        date_offsets, calendar_version = self.calendar_offsets
+        calendar_dates, version = TradingCalendar.get_snapshot()
+        if calendar_version != version:
+            calendar_offsets = TradingCalendar.remap(date_offsets, calendar_version, version)
+            self.calendar_offsets = calendar_offsets
+            date_offsets = calendar_offsets[0]
+        return date_offsets, calendar_dates
+
+    @staticmethod
+    def _get_slice_bounds(
+        date_offsets: np.ndarray,
+        calendar_dates: np.ndarray,
+        date_range: Optional[DateRange],
+    ) -> Tuple[int, int]:
+        if date_range is None:
+            return 0, len(date_offsets)
+        lower, upper = TradingCalendar.get_offset_bounds(date_range, calendar_dates)
+        return (
+            int(np.searchsorted(date_offsets, lower, side='left')),
+            int(np.searchsorted(date_offsets, upper, side='left')),
+        )
+
+    def _slice(self, date_range: Optional[DateRange]) -> Tuple[np.ndarray, np.ndarray]:
+        date_offsets, calendar_dates = self._get_current_offsets()
+        start, end = self._get_slice_bounds(date_offsets, calendar_dates, date_range)
+        return date_offsets[start:end], self.values[start:end]
+
+    def _check_identity(self) -> bool:
         if not self.get_code():
             raise ValueError("Asset code cannot be empty.")
         if not isinstance(self.get_code(), str):
@@ -62,10 +198,30 @@ class Asset:
             raise ValueError("Asset name cannot be empty.")
         if not isinstance(self.get_name(), str):
             raise ValueError("Asset name must be a string.")
-        if not self.get_prices():
+        if self.get_currency() is not None and not (
+            isinstance(self.get_currency(), str) and len(self.get_currency()) == 3 and self.get_currency().isupper()
+        ):
+            raise ValueError("Asset currency must be a three-letter uppercase currency code.")
+        return True
+
+    @staticmethod
+    def _check_distributions(dates: np.ndarray, amounts: np.ndarray) -> bool:
+        if len(dates) != len(amounts):
+            raise ValueError("Distribution dates and amounts must have the same amount of elements.")
+        if np.any(np.isnat(dates)):
+            raise ValueError("Distribution date cannot be empty.")
+        if len(np.unique(dates)) != len(dates):
+            raise ValueError("Distribution dates must be unique.")
+        if not np.all(np.isfinite(amounts) & (amounts > 0)):
+            raise ValueError("Distribution amount must be a positive number.")
+        return True
+
+    def _check_validity(self, prices: List[Price]) -> bool:
+        self._check_identity()
+        if not prices:
             raise ValueError("Prices cannot be empty.")
-        if not isinstance(self.get_prices(), list):
+        if not isinstance(prices, list):
             raise ValueError("Prices must be a list.")
-        if not all(isinstance(price, Price) for price in self.get_prices()):
+        if not all(isinstance(price, Price) for price in prices):
             raise ValueError("All prices must be instances of the Price class.")
         return True
@@ -0,0 +1,66 @@
+"""
+custom-portfolio-analyzer - A tool to model, back-test, and compare the performance of your own custom portfolios.
+Copyright (C) 2025  Fevzi Babaoğlu
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Lesser General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""
+
+
+from typing import Optional
+
+from .date_range import DateRange
+
+
+class ContributionSchedule:
+    """A fixed amount invested in a portfolio on the first trading day of every period.
+
+    The first contribution is made on the first day of the date range and is
+    ``initial_amount`` when given, or the regular ``amount`` otherwise.
+    """
+
+    __slots__ = ('amount', 'frequency', 'initial_amount')
+
+    # Periods a contribution can be made in, as in the analysis frequencies
+    FREQUENCIES = DateRange.FREQUENCIES
+
+    def __init__(self, amount: float, frequency: str = 'monthly', initial_amount: Optional[float] = None):
+        self.amount = amount
+        self.frequency = frequency
+        self.initial_amount = initial_amount
+        self._check_validity()
+
+    def get_amount(self) -> float:
+        return self.amount
+
+    def get_frequency(self) -> str:
+        return self.frequency
+
+    def get_initial_amount(self) -> float:
+        return self.amount if self.initial_amount is None else self.initial_amount
+
+    def _check_validity(self) -> bool:
+        if self.get_amount() is None:
+            raise ValueError("Contribution amount cannot be empty.")
+        if not isinstance(self.get_amount(), (int, float)) or isinstance(self.get_amount(), bool):
+            raise ValueError("Contribution amount must be a number.")
+        if not self.get_amount() > 0:
+            raise ValueError("Contribution amount must be positive.")
+        if self.get_frequency() not in self.FREQUENCIES:
+            raise ValueError(f"Contribution frequency must be one of {', '.join(self.FREQUENCIES)}.")
+        if self.initial_amount is not None:
+            if not isinstance(self.initial_amount, (int, float)) or isinstance(self.initial_amount, bool):
+                raise ValueError("Initial contribution amount must be a number.")
+            if not self.initial_amount > 0:
+                raise ValueError("Initial contribution amount must be positive.")
+        return True
@@ -21,11 +21,26 @@ from datetime import date
 
 
 class DateRange:
-    def __init__(self, start_date: date, end_date: date):
+    __slots__ = ('start_date', 'end_date', 'frequency')
+
+    # Observation frequencies a range can be analyzed at
+    FREQUENCIES = ('daily', 'weekly', 'monthly')
+
+    def __init__(self, start_date: date, end_date: date, frequency: str = 'daily'):
         self.start_date = start_date
         self.end_date = end_date
+        self.frequency = frequency
         self._check_validity()
 
+    @classmethod
+    def from_trusted(cls, start_date: date, end_date: date, frequency: str = 'daily') -> 'DateRange':
+        """Create a date range without validation. The caller must have validated the inputs."""
+        date_range = cls.__new__(cls)
+        date_range.start_date = start_date
+        date_range.end_date = end_date
+        date_range.frequency = frequency
+        return date_range
+
     def get_start_date(self) -> date:
         return self.start_date
 
@@ -40,6 +55,9 @@ class DateRange:
         self.end_date = end_date
         self._check_validity()
 
+    def get_frequency(self) -> str:
+        return self.frequency
+
     def _check_validity(self) -> bool:
         if not self.get_start_date():
             raise ValueError("Start date cannot be empty.")
@@ -51,4 +69,6 @@ class DateRange:
             raise ValueError("End date must be an instance of the date class.")
         if self.get_start_date() > self.get_end_date():
             raise ValueError("Start date must be before end date.")
+        if self.get_frequency() not in self.FREQUENCIES:
+            raise ValueError(f"Frequency must be one of {', '.join(self.FREQUENCIES)}.")
         return True
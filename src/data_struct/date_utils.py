@@ -17,29 +17,207 @@ along with this program. If not, see <https://www.gnu.org/licenses/>.
 """
 
 
+import numpy as np
 from datetime import datetime, date
+from functools import lru_cache
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+
+class _FixedWidthLayout(NamedTuple):
+    width: int
+    fields: Dict[str, Tuple[int, int]]
+    literals: Dict[int, str]
 
 
 class DateUtils:
     DATE_FORMAT = "%d.%m.%Y"
+    PARSE_CACHE_SIZE = 16384
+
+    # Directives the fixed-width fast path understands, with their field name and width
+    FIXED_WIDTH_DIRECTIVES = {
+        '%d': ('day', 2),
+        '%m': ('month', 2),
+        '%Y': ('year', 4),
+    }
+
+    _parser_format: Optional[str] = None
+    _fixed_width_layout: Optional[_FixedWidthLayout] = None
+    _cached_parser: Optional[Callable[[str], date]] = None
 
     @classmethod
     def set_date_format(cls, date_format: str):
         cls.DATE_FORMAT = date_format
+        cls._build_parser()
 
     @classmethod
     def get_date_format(cls) -> str:
         return cls.DATE_FORMAT
 
 
-    @staticmethod
-    def parse_date(date_str: str) -> date:
-        return datetime.strptime(date_str, DateUtils.DATE_FORMAT).date()
+    @classmethod
+    def parse_date(cls, date_str: str) -> date:
+        # DATE_FORMAT may also be assigned directly, so the parser is rebuilt lazily
+        if cls._parser_format != cls.DATE_FORMAT:
+            cls._build_parser()
+        return cls._cached_parser(date_str)
+
+    @classmethod
+    def parse_dates(cls, date_strs: Sequence[str]) -> np.ndarray:
+        """Parse a sequence of date strings into a ``datetime64[D]`` array.
+
+        Fixed-width formats are decoded with array operations; anything the
+        fast path rejects falls back to ``parse_date``, which raises on
+        invalid input exactly like the scalar API.
+        """
+        if cls._parser_format != cls.DATE_FORMAT:
+            cls._build_parser()
+
+        date_strs = np.asarray(date_strs, dtype=str)
+        flat_strs = date_strs.ravel()
+
+        if cls._fixed_width_layout is not None and flat_strs.size:
+            dates, valid = cls._parse_fixed_width_array(flat_strs, cls._fixed_width_layout)
+        else:
+            dates = np.empty(flat_strs.shape, dtype='datetime64[D]')
+            valid = np.zeros(flat_strs.shape, dtype=bool)
+
+        for index in np.flatnonzero(~valid):
+            dates[index] = cls.parse_date(str(flat_strs[index]))
+
+        return dates.reshape(date_strs.shape)
 
     @staticmethod
     def format_date(date_obj: date) -> str:
         return date_obj.strftime(DateUtils.DATE_FORMAT)
 
+    @classmethod
+    def format_dates(cls, dates: np.ndarray) -> List[str]:
+        """Format a ``datetime64[D]`` array, formatting each distinct date only once."""
+        unique_dates, inverse = np.unique(np.asarray(dates, dtype='datetime64[D]'), return_inverse=True)
+        formatted = np.array([cls.format_date(unique_date) for unique_date in unique_dates.astype(object)], dtype=object)
+        return formatted[inverse.ravel()].tolist()
+
+    @staticmethod
+    def get_periods(dates: np.ndarray, frequency: str) -> np.ndarray:
+        """The day, week (Monday to Sunday) or month of every date of a ``datetime64[D]`` array."""
+        if frequency == 'daily':
+            return dates
+        if frequency == 'weekly':
+            # Weeks of datetime64[W] start on Thursdays, so shift Mondays onto them
+            return (dates + np.timedelta64(3, 'D')).astype('datetime64[W]')
+        if frequency == 'monthly':
+            return dates.astype('datetime64[M]')
+        raise ValueError(f"Unsupported frequency: {frequency}")
+
+    @staticmethod
+    def get_resample_indices(dates: np.ndarray, frequency: str) -> np.ndarray:
+        """Indices of the observations of a sorted ``datetime64[D]`` array kept at a frequency.
+
+        The first observation is always kept as the base of the series. After
+        it, only the last observation of every week (Monday to Sunday) or
+        month is kept.
+        """
+        if frequency == 'daily' or len(dates) == 0:
+            return np.arange(len(dates))
+        periods = DateUtils.get_periods(dates, frequency)
+
+        is_period_last = np.append(periods[1:] != periods[:-1], True)
+        is_period_last[0] = True
+        return np.flatnonzero(is_period_last)
+
     @staticmethod
     def get_today() -> date:
         return date.today()
+
+    @classmethod
+    def _build_parser(cls):
+        """Compile the parser for the current format and drop every memoized result."""
+        date_format = cls.DATE_FORMAT
+        layout = cls._compile_fixed_width_layout(date_format)
+
+        def parse(date_str: str) -> date:
+            if layout is not None:
+                parsed = cls._parse_fixed_width(date_str, layout)
+                if parsed is not None:
+                    return parsed
+            return datetime.strptime(date_str, date_format).date()
+
+        cls._cached_parser = lru_cache(maxsize=cls.PARSE_CACHE_SIZE)(parse)
+        cls._fixed_width_layout = layout
+        cls._parser_format = date_format
+
+    @classmethod
+    def _compile_fixed_width_layout(cls, date_format: str) -> Optional[_FixedWidthLayout]:
+        """Return the field positions of a format made of day, month, year and separators only."""
+        fields = {}
+        literals = {}
+        position = 0
+        index = 0
+
+        while index < len(date_format):
+            if date_format[index] == '%':
+                directive = date_format[index:index + 2]
+                if directive not in cls.FIXED_WIDTH_DIRECTIVES:
+                    return None
+                name, width = cls.FIXED_WIDTH_DIRECTIVES[directive]
+                if name in fields:
+                    return None
+                fields[name] = (position, position + width)
+                position += width
+                index += 2
+            else:
+                # strptime matches whitespace loosely, so leave such formats to it
+                if date_format[index].isspace() or date_format[index].isdigit():
+                    return None
+                literals[position] = date_format[index]
+                position += 1
+                index += 1
+
+        if len(fields) != len(cls.FIXED_WIDTH_DIRECTIVES):
+            return None
+        return _FixedWidthLayout(width=position, fields=fields, literals=literals)
+
+    @staticmethod
+    def _parse_fixed_width(date_str: str, layout: _FixedWidthLayout) -> Optional[date]:
+        if len(date_str) != layout.width or not date_str.isascii():
+            return None
+        for position, literal in layout.literals.items():
+            if date_str[position] != literal:
+                return None
+
+        values = {}
+        for name, (start, end) in layout.fields.items():
+            part = date_str[start:end]
+            if not part.isdigit():
+                return None
+            values[name] = int(part)
+
+        return date(**values)
+
+    @staticmethod
+    def _parse_fixed_width_array(date_strs: np.ndarray, layout: _FixedWidthLayout) -> Tuple[np.ndarray, np.ndarray]:
+        """Decode fixed-width date strings, returning the dates and a mask of decoded rows."""
+        width = layout.width
+        valid = np.char.str_len(date_strs) == width
+        chars = date_strs.astype(f'U{width}').view(np.uint32).reshape(len(date_strs), width)
+
+        for position, literal in layout.literals.items():
+            valid &= chars[:, position] == ord(literal)
+
+        digits = chars.astype(np.int64) - ord('0')
+        values = {}
+        for name, (start, end) in layout.fields.items():
+            field_digits = digits[:, start:end]
+            valid &= ((field_digits >= 0) & (field_digits <= 9)).all(axis=1)
+            values[name] = field_digits @ (10 ** np.arange(end - start - 1, -1, -1))
+
+        year, month, day = values['year'], values['month'], values['day']
+        valid &= (year >= 1) & (month >= 1) & (month <= 12) & (day >= 1)
+
+        months = np.where(valid, (year - 1970) * 12 + month - 1, 0)
+        month_start = months.astype('datetime64[M]').astype('datetime64[D]')
+        next_month_start = (months + 1).astype('datetime64[M]').astype('datetime64[D]')
+        dates = month_start + np.where(valid, day - 1, 0)
+        valid &= dates < next_month_start
+
+        return np.where(valid, dates, np.datetime64('NaT', 'D')), valid
@@ -17,15 +17,22 @@ along with this program. If not, see <https://www.gnu.org/licenses/>.
 """
 
 
-from typing import List
+from typing import List, Optional
 
 from .asset import Asset
+from .return_attribution import ReturnAttribution
 
 
 class PerformanceAsset:
-    def __init__(self, asset: Asset, is_set_default: bool = False):
+    def __init__(
+        self,
+        asset: Asset,
+        is_set_default: bool = False,
+        attribution: Optional[ReturnAttribution] = None,
+    ):
         self.asset = asset
         self._is_set_default = is_set_default
+        self.attribution = attribution
         self._check_validity()
 
         self.profit_ratios = self.calculate_profit_ratios()
@@ -36,6 +43,13 @@ class PerformanceAsset:
     def is_set_default(self) -> bool:
         return self._is_set_default
 
+    def get_attribution(self) -> Optional[ReturnAttribution]:
+        """Per-holding contributions to the profit ratios, if they were requested.
+
+        Unlike the profit ratios these are never made relative to the default portfolio.
+        """
+        return self.attribution
+
     def get_profit_ratios(self) -> List[float]:
         return self.profit_ratios
 
@@ -43,9 +57,9 @@ class PerformanceAsset:
         self.profit_ratios = profit_ratios
 
     def calculate_profit_ratios(self) -> List[float]:
-        prices = [price.get_value() for price in self.asset.get_prices()]
+        prices = self.asset.get_values()
         initial_price = prices[0]
-        return [price / initial_price - 1 for price in prices]
+        return (prices / initial_price - 1).tolist()
 
     def _check_validity(self) -> bool:
         if not self.asset:
@@ -56,4 +70,6 @@ class PerformanceAsset:
             raise ValueError("is_set_default cannot be empty.")
         if not isinstance(self.is_set_default(), bool):
             raise ValueError("is_set_default must be a boolean.")
+        if self.attribution is not None and not isinstance(self.attribution, ReturnAttribution):
+            raise ValueError("Attribution must be an instance of the ReturnAttribution class.")
         return True
@@ -17,16 +17,26 @@ along with this program. If not, see <https://www.gnu.org/licenses/>.
 """
 
 
-from typing import List
+from typing import List, Optional
 
+from .contribution_schedule import ContributionSchedule
 from .portfolio_asset import PortfolioAsset
 
 
 class Portfolio:
-    def __init__(self, title: str, assets: List[PortfolioAsset], is_set_default: bool = False):
+    __slots__ = ('title', 'assets', '_is_set_default', 'contribution_schedule')
+
+    def __init__(
+        self,
+        title: str,
+        assets: List[PortfolioAsset],
+        is_set_default: bool = False,
+        contribution_schedule: Optional[ContributionSchedule] = None,
+    ):
         self.title = title
         self.assets = assets
         self._is_set_default = is_set_default
+        self.contribution_schedule = contribution_schedule
         self._check_validity()
 
     def get_title(self) -> str:
@@ -38,6 +48,9 @@ class Portfolio:
     def is_set_default(self) -> bool:
         return self._is_set_default
 
+    def get_contribution_schedule(self) -> Optional[ContributionSchedule]:
+        return self.contribution_schedule
+
     def _check_validity(self) -> bool:
         if not self.get_title():
             raise ValueError("Portfolio title cannot be empty.")
@@ -53,6 +66,8 @@ class Portfolio:
             raise ValueError("is_set_default cannot be empty.")
         if not isinstance(self.is_set_default(), bool):
             raise ValueError("is_set_default must be a boolean.")
+        if self.get_contribution_schedule() is not None and not isinstance(self.get_contribution_schedule(), ContributionSchedule):
+            raise ValueError("Contribution schedule must be an instance of the ContributionSchedule class.")
 
         total_weight = sum(asset.get_weight() for asset in self.get_assets())
         if total_weight != 1.0:
@@ -21,6 +21,8 @@ from .asset import Asset
 
 
 class PortfolioAsset:
+    __slots__ = ('asset', 'weight', 'withholding_tax_rate')
+
     def __init__(self, asset: Asset, weight: float, withholding_tax_rate: float):
         self.asset = asset
         self.weight = weight
@@ -17,15 +17,56 @@ along with this program. If not, see <https://www.gnu.org/licenses/>.
 """
 
 
+import numpy as np
 from datetime import date
+from typing import List, Sequence
 
 
 class Price:
+    __slots__ = ('date', 'value')
+
     def __init__(self, date: date, value: float):
         self.date = date
         self.value = value
         self._check_validity()
 
+    @classmethod
+    def bulk_from_trusted(cls, dates: Sequence[date], values: Sequence[float]) -> List['Price']:
+        """Create prices for inputs that already passed ``validate_batch``."""
+        new = cls.__new__
+        prices = []
+        for price_date, value in zip(dates, values):
+            price = new(cls)
+            price.date = price_date
+            price.value = value
+            prices.append(price)
+        return prices
+
+    @staticmethod
+    def validate_batch(dates: Sequence[date], values: Sequence[float]) -> bool:
+        """Apply the per-price validity rules to a whole series of dates (or a ``datetime64`` array) and values."""
+        if not len(values):
+            raise ValueError("Prices cannot be empty.")
+        if len(dates) != len(values):
+            raise ValueError("Dates and price values must have the same amount of elements.")
+        if isinstance(dates, np.ndarray) and dates.dtype.kind == 'M':
+            if np.any(np.isnat(dates)):
+                raise ValueError("Date cannot be empty.")
+        elif not all(isinstance(price_date, date) for price_date in dates):
+            raise ValueError("Date must be instance of the date class.")
+
+        # The same rule as the scalar check: every value must be a float, not just convertible to one
+        if isinstance(values, np.ndarray):
+            if values.dtype.kind != 'f':
+                raise ValueError("Price value must be a float number.")
+        elif not all(isinstance(value, float) for value in values):
+            raise ValueError("Price value must be a float number.")
+
+        values = np.asarray(values, dtype=np.float64)
+        if not np.all(values > 0):
+            raise ValueError("Price value must be positive.")
+        return True
+
     def get_date(self) -> date:
         return self.date
 
@@ -0,0 +1,59 @@
+"""
+custom-portfolio-analyzer - A tool to model, back-test, and compare the performance of your own custom portfolios.
+Copyright (C) 2025  Fevzi Babaoğlu
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Lesser General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""
+
+
+import numpy as np
+from typing import List
+
+
+class ReturnAttribution:
+    """Contribution of each holding to the profit ratio of a portfolio, per date.
+
+    Rows follow the dates of the portfolio performance series and columns the
+    holdings of the portfolio. The contributions of a date add up to the
+    profit ratio of the portfolio on that date; the tax costs are what the
+    withholding tax took from each holding's contribution.
+    """
+
+    __slots__ = ('asset_codes', 'contributions', 'tax_costs')
+
+    def __init__(self, asset_codes: List[str], contributions: np.ndarray, tax_costs: np.ndarray):
+        self.asset_codes = asset_codes
+        self.contributions = contributions
+        self.tax_costs = tax_costs
+        self._check_validity()
+
+    def get_asset_codes(self) -> List[str]:
+        return self.asset_codes
+
+    def get_contributions(self) -> np.ndarray:
+        return self.contributions
+
+    def get_tax_costs(self) -> np.ndarray:
+        return self.tax_costs
+
+    def _check_validity(self) -> bool:
+        if not self.asset_codes:
+            raise ValueError("Asset codes cannot be empty.")
+        if not isinstance(self.contributions, np.ndarray) or not isinstance(self.tax_costs, np.ndarray):
+            raise ValueError("Contributions and tax costs must be numpy arrays.")
+        if self.contributions.ndim != 2 or self.contributions.shape[1] != len(self.asset_codes):
+            raise ValueError("Contributions must be a (dates x assets) matrix with one column per asset code.")
+        if self.tax_costs.shape != self.contributions.shape:
+            raise ValueError("Tax costs must have the same shape as the contributions.")
+        return True
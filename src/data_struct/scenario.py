@@ -0,0 +1,46 @@
+"""
+custom-portfolio-analyzer - A tool to model, back-test, and compare the performance of your own custom portfolios.
+Copyright (C) 2025  Fevzi Babaoğlu
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Lesser General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""
+
+
+from .date_range import DateRange
+
+
+class Scenario:
+    """A named historical episode, such as a market crash, to replay portfolios through."""
+
+    __slots__ = ('name', 'date_range')
+
+    def __init__(self, name: str, date_range: DateRange):
+        self.name = name
+        self.date_range = date_range
+        self._check_validity()
+
+    def get_name(self) -> str:
+        return self.name
+
+    def get_date_range(self) -> DateRange:
+        return self.date_range
+
+    def _check_validity(self) -> bool:
+        if not self.name:
+            raise ValueError("Scenario name cannot be empty.")
+        if not isinstance(self.name, str):
+            raise ValueError("Scenario name must be a string.")
+        if not isinstance(self.date_range, DateRange):
+            raise ValueError("Date range must be an instance of the DateRange class.")
+        return True
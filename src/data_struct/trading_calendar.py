@@ -0,0 +1,129 @@
+"""
+custom-portfolio-analyzer - A tool to model, back-test, and compare the performance of your own custom portfolios.
+Copyright (C) 2025  Fevzi Babaoğlu
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Lesser General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""
+
+
+import numpy as np
+import threading
+from datetime import date
+from typing import List, Optional, Tuple
+
+from .date_range import DateRange
+
+
+class TradingCalendar:
+    """Process-wide sorted calendar of every date seen across the loaded assets.
+
+    Assets store their dates as integer offsets into this calendar, so date
+    storage is shared across the universe and alignment or range slicing
+    becomes integer array work. The calendar only ever grows; every growth
+    bumps the version and records where dates were inserted, which lets
+    offsets computed against an older version be shifted forward.
+
+    The calendar may grow from another thread at any time, so offsets are
+    only meaningful together with the calendar dates of their version. Use
+    ``get_snapshot`` to read both at once, and compare dates rather than
+    offsets across assets.
+    """
+
+    _dates: np.ndarray = np.empty(0, dtype='datetime64[D]')
+    _date_objects: np.ndarray = None
+    _insertions: List[np.ndarray] = []
+    _lock = threading.Lock()
+
+    @classmethod
+    def get_dates(cls) -> np.ndarray:
+        return cls._dates
+
+    @classmethod
+    def get_version(cls) -> int:
+        return len(cls._insertions)
+
+    @classmethod
+    def get_snapshot(cls) -> Tuple[np.ndarray, int]:
+        """Return the calendar dates together with their version."""
+        with cls._lock:
+            return cls._dates, len(cls._insertions)
+
+    @classmethod
+    def extend(cls, dates: np.ndarray):
+        """Add any unseen dates to the calendar."""
+        dates = np.unique(np.asarray(dates, dtype='datetime64[D]'))
+        with cls._lock:
+            new_dates = np.setdiff1d(dates, cls._dates, assume_unique=True)
+            if not len(new_dates):
+                return
+
+            cls._insertions.append(np.searchsorted(cls._dates, new_dates))
+            cls._dates = np.union1d(cls._dates, new_dates)
+            cls._date_objects = None
+
+    @classmethod
+    def register(cls, dates: np.ndarray) -> Tuple[np.ndarray, int]:
+        """Return the offsets of the dates in the calendar and the calendar version they refer to."""
+        dates = np.asarray(dates, dtype='datetime64[D]')
+        calendar_dates, version = cls.get_snapshot()
+        offsets = np.searchsorted(calendar_dates, dates)
+        known = offsets < len(calendar_dates)
+        known[known] = calendar_dates[offsets[known]] == dates[known]
+
+        if not known.all():
+            cls.extend(dates[~known])
+            calendar_dates, version = cls.get_snapshot()
+            offsets = np.searchsorted(calendar_dates, dates)
+
+        return offsets.astype(np.int32), version
+
+    @classmethod
+    def remap(cls, offsets: np.ndarray, version: int, target_version: Optional[int] = None) -> Tuple[np.ndarray, int]:
+        """Shift offsets computed against an older calendar version onto a newer one (default: the current one)."""
+        with cls._lock:
+            insertions = cls._insertions[version:target_version]
+        for inserted_positions in insertions:
+            offsets = offsets + np.searchsorted(inserted_positions, offsets, side='right').astype(np.int32)
+        return offsets, version + len(insertions)
+
+    @classmethod
+    def get_offset_bounds(
+        cls,
+        date_range: DateRange,
+        calendar_dates: Optional[np.ndarray] = None,
+    ) -> Tuple[int, int]:
+        """Return the half-open offset interval covered by a date range, in a snapshot or the current calendar."""
+        calendar_dates = cls._dates if calendar_dates is None else calendar_dates
+        start = np.datetime64(date_range.get_start_date(), 'D')
+        end = np.datetime64(date_range.get_end_date(), 'D')
+        return (
+            int(np.searchsorted(calendar_dates, start, side='left')),
+            int(np.searchsorted(calendar_dates, end, side='right')),
+        )
+
+    @classmethod
+    def to_dates(cls, offsets: np.ndarray) -> np.ndarray:
+        return cls._dates[offsets]
+
+    @classmethod
+    def to_date_objects(cls, offsets: np.ndarray, calendar_dates: Optional[np.ndarray] = None) -> List[date]:
+        calendar_dates = cls._dates if calendar_dates is None else calendar_dates
+        # Shared date objects, so materialized prices do not each own a copy. The calendar only grows,
+        # so a cache of the same length belongs to the same version.
+        date_objects = cls._date_objects
+        if date_objects is None or len(date_objects) != len(calendar_dates):
+            date_objects = calendar_dates.astype(object)
+            if calendar_dates is cls._dates:
+                cls._date_objects = date_objects
+        return date_objects[offsets].tolist()
@@ -0,0 +1,34 @@
+"""
+custom-portfolio-analyzer - A tool to model, back-test, and compare the performance of your own custom portfolios.
+Copyright (C) 2025  Fevzi Babaoğlu
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Lesser General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""
+
+
+from .http_client import HTTPClient, HTTPProtocolError, HTTPResponse, RateLimiter
+from .price_fetcher import FetchReport, PriceFetcher
+from .price_provider import JSONPriceProvider, PriceProvider
+
+
+__all__ = [
+    "FetchReport",
+    "HTTPClient",
+    "HTTPProtocolError",
+    "HTTPResponse",
+    "JSONPriceProvider",
+    "PriceFetcher",
+    "PriceProvider",
+    "RateLimiter",
+]
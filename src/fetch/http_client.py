@@ -0,0 +1,257 @@
+"""
+custom-portfolio-analyzer - A tool to model, back-test, and compare the performance of your own custom portfolios.
+Copyright (C) 2025  Fevzi Babaoğlu
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Lesser General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""
+
+
+import asyncio
+import ssl
+import time
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+
+class HTTPProtocolError(ValueError):
+    """A response that violates the protocol or the client limits; retrying it would not help."""
+
+
+class HTTPResponse:
+    def __init__(self, status: int, headers: Dict[str, str], body: bytes):
+        self.status = status
+        self.headers = headers
+        self.body = body
+
+    def get_status(self) -> int:
+        return self.status
+
+    def get_header(self, name: str, default: Optional[str] = None) -> Optional[str]:
+        return self.headers.get(name.lower(), default)
+
+    def get_body(self) -> bytes:
+        return self.body
+
+
+class RateLimiter:
+    """Spaces out the requests to one host to at most ``rate`` per second."""
+
+    def __init__(self, rate: float):
+        self.rate = rate
+        self._check_validity()
+
+        self.interval = 1 / rate
+        self.next_slot = 0.0
+
+    async def acquire(self):
+        # Slots are handed out before sleeping, so concurrent callers queue up in order
+        now = time.monotonic()
+        slot = max(now, self.next_slot)
+        self.next_slot = slot + self.interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+    def _check_validity(self) -> bool:
+        if not isinstance(self.rate, (int, float)) or self.rate <= 0:
+            raise ValueError("Rate limit must be a positive number of requests per second.")
+        return True
+
+
+class HTTPClient:
+    """Minimal asyncio HTTP/1.1 client with a keep-alive connection pool per host.
+
+    Connections are returned to the pool after every complete response and
+    reused by the next request to the same host, so a refresh of many codes
+    from one provider pays for the TCP (and TLS) handshake only a few times.
+    At most ``max_connections_per_host`` requests to a host are in flight.
+    """
+
+    MAX_BODY_SIZE = 64 * 1024 * 1024
+
+    def __init__(
+        self,
+        max_connections_per_host: int = 8,
+        timeout: float = 30.0,
+        rate_limit: Optional[float] = None,
+    ):
+        self.max_connections_per_host = max_connections_per_host
+        self.timeout = timeout
+        # Requests per second and host, or None for no limit
+        self.rate_limit = rate_limit
+        self._check_validity()
+
+        self.idle_connections: Dict[Tuple[str, str, int], List[Tuple[asyncio.StreamReader, asyncio.StreamWriter]]] = {}
+        self.host_semaphores: Dict[Tuple[str, str, int], asyncio.Semaphore] = {}
+        self.rate_limiters: Dict[Tuple[str, str, int], RateLimiter] = {}
+        self.connection_count = 0
+
+    async def __aenter__(self) -> 'HTTPClient':
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    def get_connection_count(self) -> int:
+        """Number of connections opened so far."""
+        return self.connection_count
+
+    async def close(self):
+        for connections in self.idle_connections.values():
+            for _, writer in connections:
+                writer.close()
+        self.idle_connections.clear()
+
+    async def get(self, url: str, headers: Optional[Dict[str, str]] = None) -> HTTPResponse:
+        return await self.request('GET', url, headers)
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        body: bytes = b'',
+    ) -> HTTPResponse:
+        parts = urlsplit(url)
+        if parts.scheme not in ('http', 'https') or not parts.hostname:
+            raise ValueError(f"Unsupported URL: {url}")
+        host_key = (parts.scheme, parts.hostname, parts.port or (443 if parts.scheme == 'https' else 80))
+        target = (parts.path or '/') + (f"?{parts.query}" if parts.query else '')
+
+        request_headers = {
+            'Host': parts.netloc,
+            'Connection': 'keep-alive',
+            'Accept-Encoding': 'identity',
+            'Content-Length': str(len(body)),
+        }
+        request_headers.update(headers or {})
+        request_bytes = (
+            f"{method} {target} HTTP/1.1\r\n"
+            + ''.join(f"{name}: {value}\r\n" for name, value in request_headers.items())
+            + "\r\n"
+        ).encode('latin-1') + body
+
+        semaphore = self.host_semaphores.setdefault(host_key, asyncio.Semaphore(self.max_connections_per_host))
+        async with semaphore:
+            if self.rate_limit:
+                await self.rate_limiters.setdefault(host_key, RateLimiter(self.rate_limit)).acquire()
+            return await asyncio.wait_for(self._send(host_key, request_bytes), self.timeout)
+
+    async def _send(self, host_key: Tuple[str, str, int], request_bytes: bytes) -> HTTPResponse:
+        idle = self.idle_connections.setdefault(host_key, [])
+        while idle:
+            reader, writer = idle.pop()
+            try:
+                return await self._exchange(host_key, reader, writer, request_bytes)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                # The server closed the idle connection in the meantime; try the next one
+                writer.close()
+            except BaseException:
+                writer.close()
+                raise
+
+        reader, writer = await self._connect(host_key)
+        try:
+            return await self._exchange(host_key, reader, writer, request_bytes)
+        except BaseException:
+            writer.close()
+            raise
+
+    async def _connect(self, host_key: Tuple[str, str, int]) -> Tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        scheme, host, port = host_key
+        ssl_context = ssl.create_default_context() if scheme == 'https' else None
+        self.connection_count += 1
+        return await asyncio.open_connection(host, port, ssl=ssl_context)
+
+    async def _exchange(
+        self,
+        host_key: Tuple[str, str, int],
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+        request_bytes: bytes,
+    ) -> HTTPResponse:
+        writer.write(request_bytes)
+        await writer.drain()
+
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionResetError("Connection closed before the response.")
+        try:
+            _, status, *_ = status_line.decode('latin-1').split(None, 2)
+            status = int(status)
+        except ValueError:
+            raise HTTPProtocolError(f"Malformed status line: {status_line!r}")
+
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+        keep_alive = headers.get('connection', '').lower() != 'close'
+        if 'chunked' in headers.get('transfer-encoding', '').lower():
+            body = await self._read_chunked(reader)
+        elif 'content-length' in headers:
+            content_length = int(headers['content-length'])
+            if content_length > self.MAX_BODY_SIZE:
+                raise HTTPProtocolError("Response body is too large.")
+            body = await reader.readexactly(content_length)
+        else:
+            # Without a length the body ends with the connection
+            body = await self._read_until_eof(reader)
+            keep_alive = False
+
+        if keep_alive:
+            self.idle_connections[host_key].append((reader, writer))
+        else:
+            writer.close()
+        return HTTPResponse(status, headers, body)
+
+    async def _read_until_eof(self, reader: asyncio.StreamReader) -> bytes:
+        chunks = []
+        size = 0
+        while True:
+            chunk = await reader.read(64 * 1024)
+            if not chunk:
+                return b''.join(chunks)
+            size += len(chunk)
+            if size > self.MAX_BODY_SIZE:
+                raise HTTPProtocolError("Response body is too large.")
+            chunks.append(chunk)
+
+    async def _read_chunked(self, reader: asyncio.StreamReader) -> bytes:
+        chunks = []
+        size = 0
+        while True:
+            chunk_size = int((await reader.readline()).split(b';', 1)[0].strip(), 16)
+            if chunk_size == 0:
+                # Skip the trailer section
+                while (await reader.readline()) not in (b'\r\n', b'\n', b''):
+                    pass
+                return b''.join(chunks)
+            size += chunk_size
+            if size > self.MAX_BODY_SIZE:
+                raise HTTPProtocolError("Response body is too large.")
+            chunks.append(await reader.readexactly(chunk_size))
+            await reader.readexactly(2)
+
+    def _check_validity(self) -> bool:
+        if not isinstance(self.max_connections_per_host, int) or self.max_connections_per_host <= 0:
+            raise ValueError("Maximum connections per host must be a positive integer.")
+        if not isinstance(self.timeout, (int, float)) or self.timeout <= 0:
+            raise ValueError("Timeout must be a positive number of seconds.")
+        if self.rate_limit is not None and (not isinstance(self.rate_limit, (int, float)) or self.rate_limit <= 0):
+            raise ValueError("Rate limit must be a positive number of requests per second.")
+        return True
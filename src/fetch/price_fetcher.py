@@ -0,0 +1,180 @@
+"""
+custom-portfolio-analyzer - A tool to model, back-test, and compare the performance of your own custom portfolios.
+Copyright (C) 2025  Fevzi Babaoğlu
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Lesser General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""
+
+
+import asyncio
+import logging
+import math
+import random
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from data_io import SQLitePriceStore
+from .http_client import HTTPClient, HTTPResponse
+from .price_provider import PriceProvider
+
+
+class FetchReport:
+    def __init__(self, fetched_counts: Dict[str, int], failures: Dict[str, str], data_version: Optional[int]):
+        self.fetched_counts = fetched_counts
+        self.failures = failures
+        self.data_version = data_version
+
+    def get_fetched_counts(self) -> Dict[str, int]:
+        """Number of new prices stored per code."""
+        return self.fetched_counts
+
+    def get_fetched_price_count(self) -> int:
+        return sum(self.fetched_counts.values())
+
+    def get_failures(self) -> Dict[str, str]:
+        """Error message per code that could not be refreshed."""
+        return self.failures
+
+    def get_data_version(self) -> Optional[int]:
+        """Data version of the store after the merge, or None if nothing was merged."""
+        return self.data_version
+
+
+class PriceFetcher:
+    """Refreshes a SQLite price store from a ``PriceProvider``.
+
+    For every code only the tail after the last stored date is requested.
+    Requests run concurrently, at most ``concurrency`` at a time, and
+    transient failures (connection errors, timeouts, 429 and 5xx responses)
+    are retried with exponential backoff. A code that still fails is
+    reported and left as it is; everything else is merged into the store in
+    one transaction at the end.
+    """
+
+    RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+    def __init__(
+        self,
+        price_store: SQLitePriceStore,
+        provider: PriceProvider,
+        http_client: HTTPClient,
+        concurrency: int = 32,
+        retries: int = 3,
+        backoff: float = 0.5,
+    ):
+        self.price_store = price_store
+        self.provider = provider
+        self.http_client = http_client
+        self.concurrency = concurrency
+        self.retries = retries
+        # Seconds before the first retry, doubled for every further one
+        self.backoff = backoff
+        self._check_validity()
+
+    async def refresh(self, codes: Optional[List[str]] = None, until: Optional[date] = None) -> FetchReport:
+        """Fetch and store the missing prices of the given codes (default: every stored asset) up to ``until``."""
+        until = until or date.today()
+        last_dates = self.price_store.get_last_dates()
+        # A code given twice is requested and merged once
+        codes = sorted(last_dates) if codes is None else list(dict.fromkeys(codes))
+
+        failures: Dict[str, str] = {}
+        requests = []
+        for code in codes:
+            if code not in last_dates:
+                failures[code] = "Unknown asset code."
+            elif last_dates[code] is None or last_dates[code] < until:
+                requests.append(code)
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+        results = await asyncio.gather(
+            *(self._fetch_tail(code, last_dates[code], until, semaphore) for code in requests),
+            return_exceptions=True,
+        )
+
+        fetched_counts: Dict[str, int] = {}
+        observations: List[Tuple[str, date, float]] = []
+        for code, result in zip(requests, results):
+            if isinstance(result, Exception):
+                failures[code] = str(result) or type(result).__name__
+                logging.warning(f"Failed to refresh {code}: {failures[code]}")
+                continue
+            fetched_counts[code] = len(result)
+            observations.extend((code, price_date, value) for price_date, value in result)
+
+        data_version = self.price_store.merge_prices(observations) if observations else None
+        return FetchReport(fetched_counts, failures, data_version)
+
+    async def _fetch_tail(
+        self,
+        code: str,
+        last_date: Optional[date],
+        until: date,
+        semaphore: asyncio.Semaphore,
+    ) -> List[Tuple[date, float]]:
+        start_date = last_date + timedelta(days=1) if last_date else None
+        response = await self._get(self.provider.get_url(code, start_date), semaphore)
+        if response.get_status() != 200:
+            raise ValueError(f"HTTP {response.get_status()} from the provider.")
+
+        # Providers may ignore the start date, so anything already stored or after ``until`` is dropped here
+        prices = sorted(
+            (price_date, value) for price_date, value in self.provider.parse_prices(code, response.get_body())
+            if (last_date is None or price_date > last_date) and price_date <= until
+        )
+        for (previous_date, _), (price_date, _) in zip(prices, prices[1:]):
+            if price_date == previous_date:
+                raise ValueError(f"Duplicate date {price_date} in the response.")
+        for price_date, value in prices:
+            if not math.isfinite(value) or value <= 0:
+                raise ValueError(f"Invalid price value {value!r} on {price_date}.")
+        return prices
+
+    async def _get(self, url: str, semaphore: asyncio.Semaphore) -> HTTPResponse:
+        for attempt in range(self.retries + 1):
+            retry_after = None
+            try:
+                async with semaphore:
+                    response = await self.http_client.get(url, self.provider.get_headers())
+            except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError) as e:
+                error = e
+            else:
+                if response.get_status() not in self.RETRY_STATUSES:
+                    return response
+                error = ConnectionError(f"HTTP {response.get_status()} from the provider.")
+                retry_after = response.get_header('retry-after')
+
+            if attempt == self.retries:
+                raise error
+
+            # Jitter keeps many codes that failed together from retrying in lockstep
+            delay = self.backoff * 2 ** attempt * random.uniform(1.0, 1.5)
+            if retry_after and retry_after.isdigit():
+                delay = max(delay, float(retry_after))
+            await asyncio.sleep(delay)
+
+    def _check_validity(self) -> bool:
+        if not isinstance(self.price_store, SQLitePriceStore):
+            raise ValueError("Price store must be an instance of the SQLitePriceStore class.")
+        if not isinstance(self.provider, PriceProvider):
+            raise ValueError("Provider must be an instance of the PriceProvider class.")
+        if not isinstance(self.http_client, HTTPClient):
+            raise ValueError("HTTP client must be an instance of the HTTPClient class.")
+        if not isinstance(self.concurrency, int) or self.concurrency <= 0:
+            raise ValueError("Concurrency must be a positive integer.")
+        if not isinstance(self.retries, int) or self.retries < 0:
+            raise ValueError("Retries must be a non-negative integer.")
+        if not isinstance(self.backoff, (int, float)) or self.backoff < 0:
+            raise ValueError("Backoff must be a non-negative number of seconds.")
+        return True
@@ -0,0 +1,89 @@
+"""
+custom-portfolio-analyzer - A tool to model, back-test, and compare the performance of your own custom portfolios.
+Copyright (C) 2025  Fevzi Babaoğlu
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Lesser General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""
+
+
+import json
+from abc import ABC, abstractmethod
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import quote
+
+from data_struct import DateUtils
+
+
+class PriceProvider(ABC):
+    """An HTTP source of price histories.
+
+    A provider only knows where the prices of a code are and how to read
+    them; fetching, retrying and storing is left to the ``PriceFetcher``.
+    """
+
+    @abstractmethod
+    def get_url(self, code: str, start_date: Optional[date]) -> str:
+        """URL of the prices of ``code`` from ``start_date`` on, or of its whole history for None."""
+
+    def get_headers(self) -> Dict[str, str]:
+        return {}
+
+    @abstractmethod
+    def parse_prices(self, code: str, body: bytes) -> List[Tuple[date, float]]:
+        """Return the ``(date, value)`` pairs of a response body."""
+
+
+class JSONPriceProvider(PriceProvider):
+    """A provider that answers with a JSON list of ``{"date": ..., "value": ...}`` objects.
+
+    The URL template names the code and the first missing date with the
+    ``{code}`` and ``{start}`` placeholders, e.g.
+    ``https://example.com/funds/{code}/prices?start={start}``. Dates are
+    formatted and parsed with the configured date format; ``{start}`` is
+    empty when the whole history is requested.
+    """
+
+    def __init__(self, url_template: str, headers: Optional[Dict[str, str]] = None):
+        self.url_template = url_template
+        self.headers = headers or {}
+        self._check_validity()
+
+    def get_url(self, code, start_date):
+        return self.url_template.format(
+            code=quote(code, safe=''),
+            start=quote(DateUtils.format_date(start_date), safe='') if start_date else '',
+        )
+
+    def get_headers(self):
+        return self.headers
+
+    def parse_prices(self, code, body):
+        payload = json.loads(body)
+        # Also accept the list wrapped in an object, as many APIs do
+        if isinstance(payload, dict):
+            payload = payload.get('prices')
+        if not isinstance(payload, list):
+            raise ValueError(f"Response for {code} is not a list of prices.")
+        return [
+            (DateUtils.parse_date(str(price_dict['date'])), float(price_dict['value']))
+            for price_dict in payload
+        ]
+
+    def _check_validity(self) -> bool:
+        if not isinstance(self.url_template, str) or '{code}' not in self.url_template:
+            raise ValueError("URL template must contain a {code} placeholder.")
+        if not isinstance(self.headers, dict):
+            raise ValueError("Headers must be a dictionary.")
+        return True
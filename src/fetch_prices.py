@@ -0,0 +1,140 @@
+"""
+custom-portfolio-analyzer - A tool to model, back-test, and compare the performance of your own custom portfolios.
+Copyright (C) 2025  Fevzi Babaoğlu
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Lesser General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""
+
+
+import argparse
+import asyncio
+import logging
+import sys
+
+from cli import add_data_arguments, configure_logging
+from data_io import SQLitePriceStore
+from data_struct import DateUtils
+from fetch import HTTPClient, JSONPriceProvider, PriceFetcher
+
+
+configure_logging()
+
+
+async def refresh(args: argparse.Namespace):
+    provider = JSONPriceProvider(args.url_template)
+    with SQLitePriceStore(args.db_path) as store:
+        async with HTTPClient(
+            max_connections_per_host=args.max_connections_per_host,
+            timeout=args.timeout,
+            rate_limit=args.rate_limit,
+        ) as http_client:
+            fetcher = PriceFetcher(
+                store,
+                provider,
+                http_client,
+                concurrency=args.concurrency,
+                retries=args.retries,
+                backoff=args.backoff,
+            )
+            report = await fetcher.refresh(args.codes.split(',') if args.codes else None)
+            connection_count = http_client.get_connection_count()
+
+    logging.info(
+        f"Fetched {report.get_fetched_price_count()} prices for {len(report.get_fetched_counts())} assets "
+        f"over {connection_count} connections into {args.db_path}"
+        + (f" (data version {report.get_data_version()})" if report.get_data_version() is not None else "")
+    )
+    return report
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Fetch the missing prices of the assets in a SQLite price store from an HTTP source."
+    )
+    add_data_arguments(
+        parser,
+        asset_data_path=False,
+        storage_backend=False,
+        date_format_help='Date format string used by the price source',
+    )
+    parser.add_argument(
+        '--db-path',
+        type=str,
+        default='data/asset_data.db',
+        help='Path to the SQLite price store',
+    )
+    parser.add_argument(
+        '--url-template',
+        type=str,
+        required=True,
+        help='Price URL with {code} and {start} placeholders, answering with a JSON list of date/value objects',
+    )
+    parser.add_argument(
+        '--codes',
+        type=str,
+        default=None,
+        help='Comma-separated asset codes to refresh (default: every asset in the store)',
+    )
+    parser.add_argument(
+        '--concurrency',
+        type=int,
+        default=32,
+        help='Maximum number of requests in flight (default: 32)',
+    )
+    parser.add_argument(
+        '--max-connections-per-host',
+        type=int,
+        default=8,
+        help='Maximum number of pooled connections to one host (default: 8)',
+    )
+    parser.add_argument(
+        '--rate-limit',
+        type=float,
+        default=None,
+        help='Maximum requests per second to one host (default: no limit)',
+    )
+    parser.add_argument(
+        '--retries',
+        type=int,
+        default=3,
+        help='Retries of a failed request, with exponential backoff (default: 3)',
+    )
+    parser.add_argument(
+        '--backoff',
+        type=float,
+        default=0.5,
+        help='Seconds before the first retry, doubled for every further one (default: 0.5)',
+    )
+    parser.add_argument(
+        '--timeout',
+        type=float,
+        default=30.0,
+        help='Seconds before a request is abandoned (default: 30)',
+    )
+    args = parser.parse_args()
+
+    DateUtils.set_date_format(args.date_format)
+
+    try:
+        report = asyncio.run(refresh(args))
+    except ValueError as e:
+        logging.error(e)
+        sys.exit(1)
+
+    if report.get_failures():
+        logging.error(f"Could not refresh {len(report.get_failures())} assets: {', '.join(report.get_failures())}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+"""
+custom-portfolio-analyzer - A tool to model, back-test, and compare the performance of your own custom portfolios.
+Copyright (C) 2025  Fevzi Babaoğlu
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Lesser General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""
+
+
+import argparse
+import logging
+
+from cli import add_data_arguments, configure_logging
+from data_io import DataLoader, SQLitePriceStore
+from data_struct import DateUtils
+
+
+configure_logging()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Import an asset data CSV file into a SQLite price store."
+    )
+    add_data_arguments(
+        parser,
+        asset_data_path_help='Path to the asset data CSV file to import',
+        storage_backend=False,
+        date_format_help='Date format string used in the CSV file',
+    )
+    parser.add_argument(
+        '--db-path',
+        type=str,
+        default='data/asset_data.db',
+        help='Path to the SQLite price store (created if missing)',
+    )
+    args = parser.parse_args()
+
+    DateUtils.set_date_format(args.date_format)
+
+    assets = DataLoader.load_asset_data_csv(args.asset_data_path)
+    with SQLitePriceStore(args.db_path) as store:
+        store.write_assets(assets)
+
+    logging.info(
+        f"Imported {len(assets)} assets and "
+        f"{sum(len(asset.get_prices()) for asset in assets)} prices into {args.db_path}"
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+"""
+custom-portfolio-analyzer - A tool to model, back-test, and compare the performance of your own custom portfolios.
+Copyright (C) 2025  Fevzi Babaoğlu
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Lesser General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""
+
+
+import argparse
+import logging
+import sys
+
+from cli import add_data_arguments, configure_logging
+from data_io import DataLoader, SQLitePriceStore
+from data_struct import DateUtils
+
+
+configure_logging()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Merge new price observations into a SQLite price store."
+    )
+    add_data_arguments(
+        parser,
+        asset_data_path=False,
+        storage_backend=False,
+        date_format_help='Date format string used in the delta file',
+    )
+    parser.add_argument(
+        '--db-path',
+        type=str,
+        default='data/asset_data.db',
+        help='Path to the SQLite price store',
+    )
+    parser.add_argument(
+        '--delta-path',
+        type=str,
+        required=True,
+        help='Path to a CSV file with "code,date,value" rows to append',
+    )
+    args = parser.parse_args()
+
+    DateUtils.set_date_format(args.date_format)
+
+    try:
+        observations = DataLoader.load_price_delta_csv(args.delta_path)
+        with SQLitePriceStore(args.db_path) as store:
+            version = store.merge_prices(observations)
+    except ValueError as e:
+        logging.error(e)
+        sys.exit(1)
+
+    logging.info(
+        f"Merged {len(observations)} prices into {args.db_path} (data version {version})"
+    )
+
+
+if __name__ == '__main__':
+    main()
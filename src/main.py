@@ -19,73 +19,318 @@ along with this program. If not, see <https://www.gnu.org/licenses/>.
 
 import argparse
 import logging
+import os
+import sys
+from typing import List, Optional
 
-from analyze import analyzer
-from data_io import DataLoader
-from data_struct import DateUtils
-from visualization import ProfitChartPlotter
+from analyze import (
+    SAPI_BACKEND_CHOICES,
+    ChunkedAnalyzer,
+    PrecisionReport,
+    analyzer,
+    check_sapi_backends,
+    get_sapi_backend,
+)
+from cli import add_data_arguments, configure_logging, parse_memory_size
+from data_io import AttributionExporter, CheckpointStore, DataLoader, ResultExporter
+from data_struct import Asset, DateRange, DateUtils, PerformancePortfolioComparison, PortfolioComparison
+from visualization import ProfitChartPlotter, ProfitChartReport
 
 
 # Configurations
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s [%(levelname)s] %(message)s",
-    handlers=[
-        logging.StreamHandler()
-    ]
-)
+configure_logging()
 
 
-def validate_date_format(fmt: str) -> str:
-    """Validate that the date format is usable with strftime/strptime."""
-    try:
-        DateUtils.get_today().strftime(fmt)
-        return fmt
-    except Exception as e:
-        raise argparse.ArgumentTypeError(f"Invalid date format: {fmt}. Error: {e}")
+def analyze_comparison(
+    portfolio_comparison: PortfolioComparison,
+    args: argparse.Namespace,
+    precision: str,
+) -> List[PerformancePortfolioComparison]:
+    if args.memory_limit:
+        analyzer_instance = ChunkedAnalyzer(
+            portfolio_comparison,
+            memory_limit=args.memory_limit,
+            spill_dir=args.spill_dir,
+            precision=precision,
+            sapi_backend=args.sapi_backend,
+            attribution=args.attribution,
+        )
+    else:
+        analyzer_instance = analyzer.Analyzer(
+            portfolio_comparison,
+            precision=precision,
+            sapi_backend=args.sapi_backend,
+            attribution=args.attribution,
+        )
+    return analyzer_instance.get_performance_portfolio_comparison_list()
+
+def get_data_stamp(path: str, storage_backend: Optional[str] = None) -> list:
+    """Path and stamp of a data file, which change on every write (the data version of a SQLite store)."""
+    return [os.path.abspath(path), *DataLoader.read_data_stamp(path, storage_backend)]
+
+def analyze_date_range(
+    portfolio_comparison: PortfolioComparison,
+    date_range: DateRange,
+    args: argparse.Namespace,
+    checkpoints: Optional[CheckpointStore],
+) -> PerformancePortfolioComparison:
+    """Analyze one (comparison, date range) cell, reusing its checkpoint when resuming."""
+    # The key must be taken before the analysis adjusts the date range
+    key = checkpoints.get_key(portfolio_comparison, date_range) if checkpoints else None
+    if key and args.resume:
+        performance_portfolio_comparison = checkpoints.load(key, date_range)
+        if performance_portfolio_comparison is not None:
+            logging.info(f"Restored {portfolio_comparison.get_title()} from checkpoint {key[:12]}")
+            return performance_portfolio_comparison
+
+    cell = PortfolioComparison(
+        title=portfolio_comparison.get_title(),
+        date_ranges=[date_range],
+        portfolios=portfolio_comparison.get_portfolios(),
+    )
+    performance_portfolio_comparison = analyze_comparison(cell, args, args.precision)[0]
+
+    if args.precision_report:
+        report = PrecisionReport(
+            reference=analyze_comparison(cell, args, 'float64'),
+            reduced=[performance_portfolio_comparison],
+        )
+        for row in report.get_deviation_table().itertuples(index=False):
+            logging.info(
+                f"{row.portfolio_code} {DateUtils.format_date(row.start_date)}-"
+                f"{DateUtils.format_date(row.end_date)}: "
+                f"max profit ratio deviation {row.max_abs_profit_ratio_deviation:.3e}, "
+                f"max index deviation {row.max_rel_index_deviation:.3e}"
+            )
+        logging.info(f"Maximum {args.precision} deviation from float64: {report.get_max_deviation():.3e}")
+
+    if checkpoints:
+        checkpoints.save(key, performance_portfolio_comparison)
+    return performance_portfolio_comparison
 
 def main():
     parser = argparse.ArgumentParser(
         description="Run portfolio performance analysis and chart plotting."
     )
+    add_data_arguments(parser, date_format_help='Date format string for displaying dates')
     parser.add_argument(
-        '--asset-data-path',
+        '--config-path',
         type=str,
-        default='data/asset_data.csv',
-        help='Path to the asset data CSV file',
+        default='data/portfolio_comparison_config.json',
+        help='Path to the portfolio comparison config JSON (or JSON Lines) file',
     )
     parser.add_argument(
-        '--config-path',
+        '--base-currency',
         type=str,
-        default='data/portfolio_comparison_config.json',
-        help='Path to the portfolio comparison config JSON file',
+        default=None,
+        help='Convert every asset with a known currency into this currency, e.g. TRY',
+    )
+    parser.add_argument(
+        '--fx-data-path',
+        type=str,
+        default=None,
+        help='FX rate series (e.g. code USDTRY) in the asset data CSV or SQLite format, used with --base-currency',
+    )
+    parser.add_argument(
+        '--max-fx-stale-days',
+        type=int,
+        default=7,
+        help='Do not convert prices more than this many days after the last known FX rate',
+    )
+    parser.add_argument(
+        '--output-path',
+        type=str,
+        default=None,
+        help='Also write the profit ratios of every comparison to this CSV file',
     )
     parser.add_argument(
-        '--date-format',
-        type=validate_date_format,
-        default='%d.%m.%Y',
-        help='Date format string for displaying dates (default: "%d.%m.%Y")'
+        '--no-charts',
+        action='store_true',
+        help='Do not display charts, e.g. when only exporting results',
+    )
+    parser.add_argument(
+        '--report-path',
+        type=str,
+        default=None,
+        help='Also write the profit ratio charts of every comparison into one .pdf or .html report',
+    )
+    parser.add_argument(
+        '--memory-limit',
+        type=parse_memory_size,
+        default=None,
+        help='Analyze out of core within roughly this much memory, e.g. 512MB (SQLite price store only)',
+    )
+    parser.add_argument(
+        '--spill-dir',
+        type=str,
+        default=None,
+        help='Directory for the memory-mapped chunk files of --memory-limit (default: system temp)',
+    )
+    parser.add_argument(
+        '--attribution',
+        action='store_true',
+        help='Also compute and chart the contribution of every holding to the portfolio profit ratios',
+    )
+    parser.add_argument(
+        '--attribution-path',
+        type=str,
+        default=None,
+        help='Write the per-holding contributions and withholding tax costs to this CSV file (implies --attribution)',
+    )
+    parser.add_argument(
+        '--precision',
+        choices=Asset.PRECISIONS,
+        default='float64',
+        help='Floating point precision of prices and computations (default: float64)',
+    )
+    parser.add_argument(
+        '--precision-report',
+        action='store_true',
+        help='Also compute in float64 and log the maximum deviation of the --precision results',
+    )
+    parser.add_argument(
+        '--sapi-backend',
+        choices=SAPI_BACKEND_CHOICES,
+        default='auto',
+        help='Performance index kernel (default: auto, chosen by input size and precision)',
+    )
+    parser.add_argument(
+        '--check-backends',
+        action='store_true',
+        help='Check every available kernel against the reference on random inputs and exit',
+    )
+    parser.add_argument(
+        '--checkpoint-dir',
+        type=str,
+        default=None,
+        help='Save the result of every comparison and date range to this directory as it completes',
+    )
+    parser.add_argument(
+        '--resume',
+        action='store_true',
+        help='Reuse the results saved in --checkpoint-dir instead of recomputing them',
     )
     args = parser.parse_args()
+    args.attribution = args.attribution or bool(args.attribution_path)
 
     # Set the date format for classes
     DateUtils.set_date_format(args.date_format)
 
+    if args.check_backends:
+        try:
+            check_sapi_backends(precision=args.precision)
+        except ValueError as e:
+            logging.error(e)
+            raise SystemExit(1)
+        return
+
+    storage_backend = args.storage_backend or DataLoader.detect_storage_backend(args.asset_data_path)
+    if args.memory_limit and storage_backend != 'sqlite':
+        parser.error("--memory-limit requires the sqlite storage backend")
+    if args.base_currency:
+        args.base_currency = args.base_currency.upper()
+    if args.fx_data_path and not args.base_currency:
+        parser.error("--fx-data-path requires --base-currency")
+    if args.max_fx_stale_days < 0:
+        parser.error("--max-fx-stale-days must not be negative")
+    if args.base_currency and args.memory_limit:
+        parser.error("--base-currency cannot be combined with --memory-limit")
+    if args.resume and not args.checkpoint_dir:
+        parser.error("--resume requires --checkpoint-dir")
+    if args.report_path and os.path.splitext(args.report_path)[1].lower() not in ('.pdf', '.html'):
+        parser.error("--report-path must end with .pdf or .html")
+    if args.precision_report and args.precision == 'float64':
+        parser.error("--precision-report requires a reduced --precision")
+    try:
+        get_sapi_backend(args.sapi_backend, precision=args.precision, attribution=args.attribution)
+    except ValueError as e:
+        parser.error(str(e))
+
+    # Out of core, prices stay in the store until a chunk needs them
     loader = DataLoader(
         asset_data_path=args.asset_data_path,
-        portfolio_comparison_config_path=args.config_path,
+        portfolio_comparison_config_path=None,
+        storage_backend=storage_backend,
+        lazy_assets=bool(args.memory_limit),
+        # The report compares both precisions on the same float64 input
+        precision='float64' if args.precision_report else args.precision,
+        fx_data_path=args.fx_data_path,
+        base_currency=args.base_currency,
+        max_fx_stale_days=args.max_fx_stale_days,
     )
-    portfolio_comparisons = loader.get_portfolio_comparisons()
+    exporter = ResultExporter(args.output_path) if args.output_path else None
+    attribution_exporter = AttributionExporter(args.attribution_path) if args.attribution_path else None
+    report = ProfitChartReport(args.report_path) if args.report_path else None
+
+    checkpoints = None
+    if args.checkpoint_dir:
+        # Checkpoints are only reused for the same asset data and computation options
+        checkpoints = CheckpointStore(args.checkpoint_dir, fingerprint={
+            'asset_data': get_data_stamp(args.asset_data_path, storage_backend),
+            'fx_data': get_data_stamp(args.fx_data_path) if args.fx_data_path else None,
+            'base_currency': args.base_currency,
+            'max_fx_stale_days': args.max_fx_stale_days,
+            'precision': args.precision,
+            'sapi_backend': args.sapi_backend,
+            'attribution': args.attribution,
+        })
+
+    failure_count = 0
+
+    def skip_comparison(item, error: Exception):
+        nonlocal failure_count
+        failure_count += 1
+        title = item.get('title') if isinstance(item, dict) else None
+        logging.error(f"Skipping portfolio comparison {title!r}: {error}")
+
+    # Comparisons are read, analyzed and released one at a time
+    try:
+        for portfolio_comparison in loader.iter_portfolio_comparisons(args.config_path, on_error=skip_comparison):
+            title = portfolio_comparison.get_title()
+            logging.info(f"Analyzing portfolio comparison: {title}")
 
-    for portfolio_comparison in portfolio_comparisons:
-        logging.info(f"Analyzing portfolio comparison: {portfolio_comparison.get_title()}")
+            # A failing date range is reported and skipped without losing the others
+            performance_portfolio_comparisons = []
+            for date_range in portfolio_comparison.get_date_ranges():
+                start_date = DateUtils.format_date(date_range.get_start_date())
+                end_date = DateUtils.format_date(date_range.get_end_date())
+                try:
+                    performance_portfolio_comparisons.append(
+                        analyze_date_range(portfolio_comparison, date_range, args, checkpoints)
+                    )
+                except Exception as e:
+                    failure_count += 1
+                    logging.error(f"Failed to analyze {title} from {start_date} to {end_date}: {e}")
+            if not performance_portfolio_comparisons:
+                continue
 
-        analyzer_instance = analyzer.Analyzer(portfolio_comparison)
-        performance_portfolio_comparisons = analyzer_instance.get_performance_portfolio_comparison_list()
+            try:
+                if exporter:
+                    exporter.write_comparison(title, performance_portfolio_comparisons)
+                if attribution_exporter:
+                    attribution_exporter.write_comparison(title, performance_portfolio_comparisons)
+                if report:
+                    report.write_comparison(title, performance_portfolio_comparisons)
 
-        plotter = ProfitChartPlotter(performance_portfolio_comparisons=performance_portfolio_comparisons)
-        plotter.plot_charts()
+                if not args.no_charts:
+                    plotter = ProfitChartPlotter(performance_portfolio_comparisons=performance_portfolio_comparisons)
+                    plotter.plot_charts()
+                    if args.attribution:
+                        plotter.plot_attribution_charts()
+            except Exception as e:
+                failure_count += 1
+                logging.error(f"Failed to export or plot {title}: {e}")
+    finally:
+        if exporter:
+            exporter.close()
+        if attribution_exporter:
+            attribution_exporter.close()
+        if report:
+            report.close()
 
+    if failure_count:
+        logging.error(f"{failure_count} failures; rerun with --resume to compute only the remaining work")
+        sys.exit(1)
 
 if __name__ == '__main__':
     main()
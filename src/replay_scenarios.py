@@ -0,0 +1,87 @@
+"""
+custom-portfolio-analyzer - A tool to model, back-test, and compare the performance of your own custom portfolios.
+Copyright (C) 2025  Fevzi Babaoğlu
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Lesser General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""
+
+
+import argparse
+import logging
+
+from analyze import ScenarioReplay
+from cli import add_data_arguments, configure_logging
+from data_io import DataLoader
+from data_struct import DateUtils
+
+
+configure_logging()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Replay every configured portfolio through a library of named historical episodes."
+    )
+    add_data_arguments(parser)
+    parser.add_argument(
+        '--config-path',
+        type=str,
+        default='data/portfolio_comparison_config.json',
+        help='Path to the portfolio comparison config JSON file',
+    )
+    parser.add_argument(
+        '--scenario-path',
+        type=str,
+        default='data/scenarios.json',
+        help='Path to the scenario library JSON file, a list of name/start/end windows',
+    )
+    parser.add_argument(
+        '--output-path',
+        type=str,
+        default='data/scenarios.csv',
+        help='Path of the scenario x portfolio CSV table to write',
+    )
+    parser.add_argument(
+        '--recovery-horizon-days',
+        type=int,
+        default=None,
+        help='Days after a window to look for a recovery (default: until the end of the data)',
+    )
+    args = parser.parse_args()
+
+    DateUtils.set_date_format(args.date_format)
+
+    loader = DataLoader(
+        asset_data_path=args.asset_data_path,
+        storage_backend=args.storage_backend,
+        portfolio_comparison_config_path=args.config_path,
+    )
+    replay = ScenarioReplay(
+        assets=loader.get_asset_data(),
+        portfolio_comparisons=loader.get_portfolio_comparisons(),
+        scenarios=loader.load_scenarios(args.scenario_path),
+        recovery_horizon_days=args.recovery_horizon_days,
+    )
+
+    scenario_table = replay.get_scenario_table()
+    for column in ('start_date', 'end_date', 'peak_date', 'trough_date', 'recovery_date'):
+        scenario_table[column] = scenario_table[column].map(
+            lambda value: DateUtils.format_date(value) if value is not None else None
+        )
+    scenario_table.to_csv(args.output_path, index=False)
+    logging.info(f"Wrote {len(scenario_table)} scenario rows to {args.output_path}")
+
+
+if __name__ == '__main__':
+    main()
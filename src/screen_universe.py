@@ -0,0 +1,85 @@
+"""
+custom-portfolio-analyzer - A tool to model, back-test, and compare the performance of your own custom portfolios.
+Copyright (C) 2025  Fevzi Babaoğlu
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Lesser General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""
+
+
+import argparse
+import logging
+
+from analyze import UniverseScreener
+from cli import add_data_arguments, configure_logging
+from data_io import DataLoader
+from data_struct import DateUtils
+
+
+configure_logging()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Rank every asset in the universe against the default portfolio of each comparison."
+    )
+    add_data_arguments(parser)
+    parser.add_argument(
+        '--config-path',
+        type=str,
+        default='data/portfolio_comparison_config.json',
+        help='Path to the portfolio comparison config JSON file',
+    )
+    parser.add_argument(
+        '--output-path',
+        type=str,
+        default='data/screening.csv',
+        help='Path of the ranked CSV table to write',
+    )
+    parser.add_argument(
+        '--withholding-tax-rate',
+        type=float,
+        default=0.0,
+        help='Withholding tax rate for assets not configured in any portfolio (default: 0.0)',
+    )
+    parser.add_argument(
+        '--max-stale-days',
+        type=int,
+        default=7,
+        help='Leave out assets without a price in this many days before the end of a date range (default: 7)',
+    )
+    args = parser.parse_args()
+
+    DateUtils.set_date_format(args.date_format)
+
+    loader = DataLoader(
+        asset_data_path=args.asset_data_path,
+        storage_backend=args.storage_backend,
+        portfolio_comparison_config_path=args.config_path,
+    )
+    screener = UniverseScreener(
+        assets=loader.get_asset_data(),
+        portfolio_comparisons=loader.get_portfolio_comparisons(),
+        withholding_tax_rate=args.withholding_tax_rate,
+        max_stale_days=args.max_stale_days,
+    )
+
+    screening_table = screener.get_screening_table()
+    for column in ('start_date', 'end_date'):
+        screening_table[column] = screening_table[column].map(DateUtils.format_date)
+    screening_table.to_csv(args.output_path, index=False)
+    logging.info(f"Wrote {len(screening_table)} ranked rows to {args.output_path}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+"""
+custom-portfolio-analyzer - A tool to model, back-test, and compare the performance of your own custom portfolios.
+Copyright (C) 2025  Fevzi Babaoğlu
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Lesser General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""
+
+
+import argparse
+import asyncio
+
+from cli import add_data_arguments, configure_logging
+from data_io import DataLoader
+from data_struct import DateUtils
+from service import AnalysisHTTPServer, AnalysisService
+
+
+configure_logging()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Serve portfolio comparisons over HTTP with the asset data kept in memory."
+    )
+    add_data_arguments(parser, date_format_help='Date format string for parsing and returning dates')
+    parser.add_argument(
+        '--host',
+        type=str,
+        default='127.0.0.1',
+        help='Host to listen on (default: 127.0.0.1)',
+    )
+    parser.add_argument(
+        '--port',
+        type=int,
+        default=8765,
+        help='Port to listen on (default: 8765)',
+    )
+    parser.add_argument(
+        '--unix-socket',
+        type=str,
+        default=None,
+        help='Listen on this Unix socket path instead of a TCP port',
+    )
+    parser.add_argument(
+        '--max-workers',
+        type=int,
+        default=4,
+        help='Number of worker threads running analyses (default: 4)',
+    )
+    parser.add_argument(
+        '--request-timeout',
+        type=float,
+        default=30.0,
+        help='Seconds before an analysis request is answered with a timeout (default: 30)',
+    )
+    parser.add_argument(
+        '--max-queued',
+        type=int,
+        default=16,
+        help='Requests that may wait for a busy worker before new ones are rejected with 503 (default: 16)',
+    )
+    parser.add_argument(
+        '--reload-interval',
+        type=float,
+        default=2.0,
+        help='Seconds between checks of the asset data file for changes (default: 2)',
+    )
+    args = parser.parse_args()
+
+    DateUtils.set_date_format(args.date_format)
+
+    service = AnalysisService(
+        asset_data_path=args.asset_data_path,
+        storage_backend=args.storage_backend,
+        max_workers=args.max_workers,
+        request_timeout=args.request_timeout,
+        max_queued=args.max_queued,
+        reload_interval=args.reload_interval,
+    )
+    server = AnalysisHTTPServer(
+        service=service,
+        host=args.host,
+        port=args.port,
+        unix_socket_path=args.unix_socket,
+    )
+
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,215 @@
+"""
+custom-portfolio-analyzer - A tool to model, back-test, and compare the performance of your own custom portfolios.
+Copyright (C) 2025  Fevzi Babaoğlu
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Lesser General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""
+
+
+import asyncio
+import json
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from analyze import Analyzer
+from data_io import DataLoader
+from data_struct import DateUtils, PerformancePortfolioComparison
+
+
+class ServiceBusyError(RuntimeError):
+    """Raised when every worker is busy and the queue of waiting requests is full."""
+
+
+class AnalysisService:
+    """Keeps the asset universe loaded and answers comparison requests against it.
+
+    Requests use the same schema as the portfolio comparison config file. The
+    analysis itself runs on a thread pool so that all workers share the warm
+    assets, and results are cached per comparison until the asset data
+    changes on disk (the data version of a SQLite store, or the modification
+    time and size of a file), at which point the universe is reloaded in the
+    background and swapped in. A replaced loader is closed once the requests
+    still running on it have finished.
+
+    A request that times out is answered right away, but its analysis keeps
+    its worker until it finishes. Requests beyond the workers and
+    ``max_queued`` waiting ones are rejected with ``ServiceBusyError``.
+    """
+
+    def __init__(
+        self,
+        asset_data_path: str,
+        storage_backend: Optional[str] = None,
+        max_workers: int = 4,
+        request_timeout: float = 30.0,
+        reload_interval: float = 2.0,
+        cache_size: int = 256,
+        max_queued: int = 16,
+    ):
+        self.asset_data_path = asset_data_path
+        self.storage_backend = storage_backend
+        self.max_workers = max_workers
+        self.request_timeout = request_timeout
+        self.reload_interval = reload_interval
+        self.cache_size = cache_size
+        self.max_queued = max_queued
+        self._check_validity()
+
+        self.executor = ThreadPoolExecutor(max_workers=max_workers)
+        self.result_cache: OrderedDict = OrderedDict()
+        self.result_cache_lock = threading.Lock()
+        # Guards the current loader, the requests using each loader and the number of pending requests
+        self.loader_lock = threading.Lock()
+        self.loader_users: Dict[DataLoader, int] = {}
+        self.pending_count = 0
+        self.data_stamp, self.loader = self.load()
+
+    def get_data_stamp(self) -> Tuple[int, int]:
+        return self.data_stamp
+
+    def read_data_stamp(self) -> Tuple[int, int]:
+        return DataLoader.read_data_stamp(self.asset_data_path, self.storage_backend)
+
+    def load(self) -> Tuple[Tuple[int, int], DataLoader]:
+        data_stamp = self.read_data_stamp()
+        loader = DataLoader(
+            asset_data_path=self.asset_data_path,
+            portfolio_comparison_config_path=None,
+            storage_backend=self.storage_backend,
+        )
+        logging.info(f"Loaded asset data from {self.asset_data_path}")
+        return data_stamp, loader
+
+    async def reload(self):
+        loop = asyncio.get_running_loop()
+        data_stamp, loader = await loop.run_in_executor(self.executor, self.load)
+
+        # Swap both at once; requests already running keep the loader they started with
+        with self.loader_lock:
+            previous_loader = self.loader
+            self.data_stamp, self.loader = data_stamp, loader
+            is_unused = previous_loader not in self.loader_users
+        if is_unused:
+            previous_loader.close()
+        with self.result_cache_lock:
+            self.result_cache.clear()
+
+    async def watch_for_changes(self):
+        while True:
+            await asyncio.sleep(self.reload_interval)
+            try:
+                if self.read_data_stamp() != self.data_stamp:
+                    logging.info("Asset data changed on disk, reloading")
+                    await self.reload()
+            except Exception:
+                logging.exception("Reloading asset data failed, keeping the loaded data")
+
+    async def analyze(self, payload) -> List[dict]:
+        """Analyze a comparison, or a list of comparisons, in the config file schema."""
+        items = payload if isinstance(payload, list) else [payload]
+        with self.loader_lock:
+            if self.pending_count >= self.max_workers + self.max_queued:
+                raise ServiceBusyError(
+                    f"All {self.max_workers} workers are busy and {self.max_queued} requests are waiting."
+                )
+            self.pending_count += 1
+            data_stamp, loader = self.data_stamp, self.loader
+            self.loader_users[loader] = self.loader_users.get(loader, 0) + 1
+
+        # Released when the analysis finishes or is cancelled before it starts, even after a timeout
+        future = self.executor.submit(self._analyze_items, items, data_stamp, loader)
+        future.add_done_callback(lambda _: self._release_loader(loader))
+        return await asyncio.wait_for(asyncio.wrap_future(future), timeout=self.request_timeout)
+
+    def close(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        self.loader.close()
+
+    def _release_loader(self, loader: DataLoader):
+        with self.loader_lock:
+            self.pending_count -= 1
+            self.loader_users[loader] -= 1
+            if self.loader_users[loader]:
+                return
+            del self.loader_users[loader]
+            is_replaced = loader is not self.loader
+        if is_replaced:
+            loader.close()
+
+    def _analyze_items(self, items: List[dict], data_stamp: Tuple[int, int], loader: DataLoader) -> List[dict]:
+        results = []
+        for item in items:
+            # "today" in a date range resolves differently from one day to the next
+            key = (data_stamp, DateUtils.get_today(), json.dumps(item, sort_keys=True))
+            with self.result_cache_lock:
+                result = self.result_cache.get(key)
+                if result is not None:
+                    self.result_cache.move_to_end(key)
+
+            if result is None:
+                result = self._analyze_item(item, loader)
+                with self.result_cache_lock:
+                    self.result_cache[key] = result
+                    while len(self.result_cache) > self.cache_size:
+                        self.result_cache.popitem(last=False)
+
+            results.append(result)
+        return results
+
+    def _analyze_item(self, item: dict, loader: DataLoader) -> dict:
+        portfolio_comparison = loader.parse_portfolio_comparisons([item])[0]
+        analyzer_instance = Analyzer(portfolio_comparison)
+        return {
+            'title': portfolio_comparison.get_title(),
+            'date_ranges': [
+                self._serialize_performance_portfolio_comparison(ppc)
+                for ppc in analyzer_instance.get_performance_portfolio_comparison_list()
+            ],
+        }
+
+    @staticmethod
+    def _serialize_performance_portfolio_comparison(ppc: PerformancePortfolioComparison) -> dict:
+        date_range = ppc.get_date_range()
+        return {
+            'start': DateUtils.format_date(date_range.get_start_date()),
+            'end': DateUtils.format_date(date_range.get_end_date()),
+            'portfolios': [
+                {
+                    'code': performance_asset.get_asset().get_code(),
+                    'title': performance_asset.get_asset().get_name(),
+                    'set_default': performance_asset.is_set_default(),
+                    'dates': DateUtils.format_dates(performance_asset.get_asset().get_dates()),
+                    'profit_ratios': performance_asset.get_profit_ratios(),
+                }
+                for performance_asset in ppc.get_performance_assets()
+            ],
+        }
+
+    def _check_validity(self) -> bool:
+        if not self.asset_data_path:
+            raise ValueError("Asset data path cannot be empty.")
+        if not isinstance(self.max_workers, int) or self.max_workers < 1:
+            raise ValueError("Max workers must be a positive integer.")
+        if self.request_timeout <= 0:
+            raise ValueError("Request timeout must be positive.")
+        if self.reload_interval <= 0:
+            raise ValueError("Reload interval must be positive.")
+        if not isinstance(self.cache_size, int) or self.cache_size < 0:
+            raise ValueError("Cache size must be a non-negative integer.")
+        if not isinstance(self.max_queued, int) or self.max_queued < 0:
+            raise ValueError("Max queued must be a non-negative integer.")
+        return True
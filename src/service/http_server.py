@@ -0,0 +1,186 @@
+"""
+custom-portfolio-analyzer - A tool to model, back-test, and compare the performance of your own custom portfolios.
+Copyright (C) 2025  Fevzi Babaoğlu
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Lesser General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""
+
+
+import asyncio
+import json
+import logging
+from typing import Optional, Tuple
+
+from .analysis_service import AnalysisService, ServiceBusyError
+
+
+class HTTPError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class AnalysisHTTPServer:
+    """Minimal HTTP/1.1 JSON front end for an ``AnalysisService``.
+
+    Endpoints:
+        GET  /health   Liveness check with the loaded data stamp.
+        POST /analyze  Body is a comparison, or a list of comparisons, in the config file schema.
+        POST /reload   Reload the asset data immediately.
+    """
+
+    MAX_BODY_SIZE = 64 * 1024 * 1024
+    STATUS_REASONS = {
+        200: 'OK',
+        400: 'Bad Request',
+        404: 'Not Found',
+        405: 'Method Not Allowed',
+        413: 'Payload Too Large',
+        422: 'Unprocessable Entity',
+        500: 'Internal Server Error',
+        503: 'Service Unavailable',
+        504: 'Gateway Timeout',
+    }
+
+    def __init__(
+        self,
+        service: AnalysisService,
+        host: str = '127.0.0.1',
+        port: int = 8765,
+        unix_socket_path: Optional[str] = None,
+    ):
+        self.service = service
+        self.host = host
+        self.port = port
+        self.unix_socket_path = unix_socket_path
+
+    async def serve_forever(self):
+        if self.unix_socket_path:
+            server = await asyncio.start_unix_server(self._handle_connection, path=self.unix_socket_path)
+            logging.info(f"Listening on unix socket {self.unix_socket_path}")
+        else:
+            server = await asyncio.start_server(self._handle_connection, host=self.host, port=self.port)
+            logging.info(f"Listening on http://{self.host}:{self.port}")
+
+        watcher = asyncio.create_task(self.service.watch_for_changes())
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            watcher.cancel()
+            self.service.close()
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                try:
+                    request = await self._read_request(reader)
+                except HTTPError as e:
+                    self._write_response(writer, e.status, {'error': e.message}, keep_alive=False)
+                    await writer.drain()
+                    break
+                if request is None:
+                    break
+
+                method, path, headers, body = request
+                status, payload = await self._route(method, path, body)
+                keep_alive = headers.get('connection', '').lower() != 'close'
+                self._write_response(writer, status, payload, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _read_request(self, reader: asyncio.StreamReader) -> Optional[Tuple[str, str, dict, bytes]]:
+        request_line = await reader.readline()
+        if not request_line.strip():
+            return None
+
+        try:
+            method, path, _ = request_line.decode('latin-1').split()
+        except ValueError:
+            raise HTTPError(400, "Malformed request line.")
+
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+        try:
+            content_length = int(headers.get('content-length', 0))
+        except ValueError:
+            raise HTTPError(400, "Invalid Content-Length header.")
+        if content_length > self.MAX_BODY_SIZE:
+            raise HTTPError(413, "Request body is too large.")
+
+        body = await reader.readexactly(content_length) if content_length else b''
+        return method.upper(), path.split('?', 1)[0], headers, body
+
+    async def _route(self, method: str, path: str, body: bytes) -> Tuple[int, object]:
+        routes = {
+            '/health': ('GET', self._handle_health),
+            '/analyze': ('POST', self._handle_analyze),
+            '/reload': ('POST', self._handle_reload),
+        }
+        if path not in routes:
+            return 404, {'error': f"Unknown path: {path}"}
+
+        expected_method, handler = routes[path]
+        if method != expected_method:
+            return 405, {'error': f"{path} only accepts {expected_method} requests."}
+
+        try:
+            return 200, await handler(body)
+        except HTTPError as e:
+            return e.status, {'error': e.message}
+        except ServiceBusyError as e:
+            return 503, {'error': str(e)}
+        except asyncio.TimeoutError:
+            return 504, {'error': f"Request timed out after {self.service.request_timeout} seconds."}
+        except (KeyError, TypeError, ValueError) as e:
+            return 422, {'error': f"Invalid comparison: {e}"}
+        except Exception as e:
+            logging.exception("Unhandled error while serving request")
+            return 500, {'error': str(e)}
+
+    async def _handle_health(self, body: bytes) -> dict:
+        return {'status': 'ok', 'data_stamp': list(self.service.get_data_stamp())}
+
+    async def _handle_analyze(self, body: bytes) -> list:
+        try:
+            payload = json.loads(body)
+        except (UnicodeDecodeError, json.JSONDecodeError) as e:
+            raise HTTPError(400, f"Request body is not valid JSON: {e}")
+        return await self.service.analyze(payload)
+
+    async def _handle_reload(self, body: bytes) -> dict:
+        await self.service.reload()
+        return await self._handle_health(body)
+
+    def _write_response(self, writer: asyncio.StreamWriter, status: int, payload: object, keep_alive: bool):
+        body = json.dumps(payload).encode('utf-8')
+        headers = [
+            f"HTTP/1.1 {status} {self.STATUS_REASONS.get(status, '')}",
+            "Content-Type: application/json",
+            f"Content-Length: {len(body)}",
+            f"Connection: {'keep-alive' if keep_alive else 'close'}",
+        ]
+        writer.write(('\r\n'.join(headers) + '\r\n\r\n').encode('latin-1') + body)
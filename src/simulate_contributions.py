@@ -0,0 +1,86 @@
+"""
+custom-portfolio-analyzer - A tool to model, back-test, and compare the performance of your own custom portfolios.
+Copyright (C) 2025  Fevzi Babaoğlu
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Lesser General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""
+
+
+import argparse
+import logging
+
+from analyze import ContributionSimulator
+from cli import add_data_arguments, configure_logging
+from data_io import DataLoader
+from data_struct import DateUtils
+
+
+configure_logging()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Simulate periodic contributions into every configured portfolio and compute their money-weighted returns."
+    )
+    add_data_arguments(parser)
+    parser.add_argument(
+        '--config-path',
+        type=str,
+        default='data/portfolio_comparison_config.json',
+        help='Path to the portfolio comparison config JSON file',
+    )
+    parser.add_argument(
+        '--output-path',
+        type=str,
+        default='data/contributions.csv',
+        help='Path of the date range x portfolio CSV table to write',
+    )
+    parser.add_argument(
+        '--value-path-output-path',
+        type=str,
+        default=None,
+        help='Also write the contributed amount and value of every portfolio on every date to this CSV file',
+    )
+    args = parser.parse_args()
+
+    DateUtils.set_date_format(args.date_format)
+
+    loader = DataLoader(
+        asset_data_path=args.asset_data_path,
+        storage_backend=args.storage_backend,
+        portfolio_comparison_config_path=args.config_path,
+    )
+    simulator = ContributionSimulator(
+        assets=loader.get_asset_data(),
+        portfolio_comparisons=loader.get_portfolio_comparisons(),
+    )
+
+    contribution_table = simulator.get_contribution_table()
+    for column in ('start_date', 'end_date', 'first_date', 'last_date'):
+        contribution_table[column] = contribution_table[column].map(
+            lambda value: DateUtils.format_date(value) if value is not None else None
+        )
+    contribution_table.to_csv(args.output_path, index=False)
+    logging.info(f"Wrote {len(contribution_table)} contribution rows to {args.output_path}")
+
+    if args.value_path_output_path:
+        value_path_table = simulator.get_value_path_table()
+        for column in ('start_date', 'end_date', 'date'):
+            value_path_table[column] = value_path_table[column].map(DateUtils.format_date)
+        value_path_table.to_csv(args.value_path_output_path, index=False)
+        logging.info(f"Wrote {len(value_path_table)} value path rows to {args.value_path_output_path}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,123 @@
+"""
+custom-portfolio-analyzer - A tool to model, back-test, and compare the performance of your own custom portfolios.
+Copyright (C) 2025  Fevzi Babaoğlu
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Lesser General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""
+
+
+import argparse
+import logging
+import os
+import sys
+
+from cli import add_data_arguments, configure_logging
+from data_io import DataLoader, DataQualityScanner, SQLitePriceStore
+from data_struct import DateUtils
+
+
+configure_logging()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Scan the raw price series of the asset universe for data problems."
+    )
+    add_data_arguments(parser)
+    parser.add_argument(
+        '--output-path',
+        type=str,
+        default='data/data_issues.csv',
+        help='Path of the CSV table of issues to write, one row per issue',
+    )
+    parser.add_argument(
+        '--summary-path',
+        type=str,
+        default=None,
+        help='Also write a CSV table with the number of issues of every check per asset',
+    )
+    parser.add_argument(
+        '--stale-run-length',
+        type=int,
+        default=5,
+        help='Report runs of at least this many observations with the same value (default: 5)',
+    )
+    parser.add_argument(
+        '--outlier-z',
+        type=float,
+        default=10.0,
+        help='Report moves this many robust standard deviations from the median move of the asset (default: 10)',
+    )
+    parser.add_argument(
+        '--min-gap-length',
+        type=int,
+        default=1,
+        help='Report gaps of at least this many missing calendar dates (default: 1)',
+    )
+    parser.add_argument(
+        '--strict',
+        action='store_true',
+        help='Exit with status 1 if any issue is found',
+    )
+    args = parser.parse_args()
+
+    DateUtils.set_date_format(args.date_format)
+
+    # The raw series are read without the price validation that would stop at the first problem
+    storage_backend = args.storage_backend or DataLoader.detect_storage_backend(args.asset_data_path)
+    if storage_backend == 'sqlite':
+        if not os.path.exists(args.asset_data_path):
+            parser.error(f"Price store not found: {args.asset_data_path}")
+        with SQLitePriceStore(args.asset_data_path) as price_store:
+            series = price_store.read_raw_series()
+    else:
+        series = DataLoader.read_raw_series_csv(args.asset_data_path)
+
+    try:
+        scanner = DataQualityScanner(
+            series,
+            stale_run_length=args.stale_run_length,
+            outlier_z=args.outlier_z,
+            min_gap_length=args.min_gap_length,
+        )
+    except ValueError as e:
+        parser.error(str(e))
+
+    issue_table = scanner.get_issue_table()
+    for column in ('start_date', 'end_date'):
+        issue_table[column] = issue_table[column].map(DateUtils.format_date)
+    issue_table.to_csv(args.output_path, index=False)
+
+    affected_count = issue_table['code'].nunique()
+    logging.info(
+        f"Found {len(issue_table)} issues in {affected_count} of {len(series)} assets, written to {args.output_path}"
+    )
+    for check, count in issue_table['check'].value_counts().items():
+        logging.info(f"{check}: {count}")
+
+    if args.summary_path:
+        summary_table = scanner.get_summary_table()
+        for column in ('first_date', 'last_date'):
+            summary_table[column] = summary_table[column].map(
+                lambda value: DateUtils.format_date(value) if value is not None else None
+            )
+        summary_table.to_csv(args.summary_path, index=False)
+        logging.info(f"Wrote the summary of {len(summary_table)} assets to {args.summary_path}")
+
+    if args.strict and len(issue_table):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
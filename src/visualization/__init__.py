@@ -18,6 +18,10 @@ along with this program. If not, see <https://www.gnu.org/licenses/>.
 
 
 from .profit_chart_plotter import ProfitChartPlotter
+from .profit_chart_report import ProfitChartReport
 
 
-__all__ = ["ProfitChartPlotter"]
\ No newline at end of file
+__all__ = [
+    "ProfitChartPlotter",
+    "ProfitChartReport",
+]
\ No newline at end of file
@@ -19,6 +19,7 @@ along with this program. If not, see <https://www.gnu.org/licenses/>.
 
 import matplotlib.dates as mdates
 import matplotlib.pyplot as plt
+import numpy as np
 from matplotlib.dates import DateFormatter
 from matplotlib.ticker import PercentFormatter
 from typing import List
@@ -43,9 +44,7 @@ class ProfitChartPlotter:
             # Plot each performance asset
             for performance_asset in ppc.get_performance_assets():
                 asset = performance_asset.get_asset()
-                prices = asset.get_prices(date_range)
-
-                dates = [price.get_date() for price in prices]
+                dates = asset.get_dates(date_range)
                 profit_ratios = performance_asset.get_profit_ratios()
 
                 label = f"{asset.get_name()} ({asset.get_code()}){' [Default]' if performance_asset.is_set_default() else ''}"
@@ -70,6 +69,50 @@ class ProfitChartPlotter:
             plt.tight_layout()
             plt.show()
 
+    def plot_attribution_charts(self):
+        """Plot the per-holding contributions of every portfolio with an attribution as stacked areas."""
+        for ppc in self.performance_portfolio_comparisons:
+            date_range = ppc.get_date_range()
+
+            for performance_asset in ppc.get_performance_assets():
+                attribution = performance_asset.get_attribution()
+                if attribution is None:
+                    continue
+
+                asset = performance_asset.get_asset()
+                dates = asset.get_dates()
+                contributions = attribution.get_contributions()
+                labels = attribution.get_asset_codes()
+                colors = plt.rcParams['axes.prop_cycle'].by_key()['color']
+                colors = [colors[i % len(colors)] for i in range(len(labels))]
+
+                fig, ax = plt.subplots(figsize=(12, 6))
+
+                # Gains are stacked above zero and losses below, so that areas never overlap
+                ax.stackplot(dates, np.clip(contributions, 0, None).T, labels=labels, colors=colors, alpha=0.8)
+                ax.stackplot(dates, np.clip(contributions, None, 0).T, colors=colors, alpha=0.8)
+                ax.plot(dates, contributions.sum(axis=1), color='black', linewidth=2, label='Total')
+                ax.plot(dates, attribution.get_tax_costs().sum(axis=1), color='black', linewidth=1,
+                        linestyle='--', label='Withholding tax cost')
+
+                ax.set_title(
+                    f"Contributions to {asset.get_name()} ({asset.get_code()}): "
+                    f"{DateUtils.format_date(date_range.get_start_date())} to "
+                    f"{DateUtils.format_date(date_range.get_end_date())}",
+                    fontsize=14,
+                    weight='bold',
+                )
+                ax.set_xlabel("Date", fontsize=12)
+                ax.set_ylabel("Contribution to Profit Ratio", fontsize=12)
+                ax.yaxis.set_major_formatter(PercentFormatter(xmax=1.0))
+                ax.xaxis.set_major_formatter(DateFormatter(DateUtils.get_date_format()))
+                ax.xaxis.set_major_locator(mdates.AutoDateLocator())
+
+                ax.grid(True, which='major', axis='y', linestyle='--', alpha=0.5)
+                ax.legend(title="Assets", fontsize=10)
+                plt.tight_layout()
+                plt.show()
+
     def _check_validity(self):
         if not self.performance_portfolio_comparisons:
             raise ValueError("Performance portfolio comparisons cannot be empty.")
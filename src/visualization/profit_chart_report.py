@@ -0,0 +1,160 @@
+"""
+custom-portfolio-analyzer - A tool to model, back-test, and compare the performance of your own custom portfolios.
+Copyright (C) 2025  Fevzi Babaoğlu
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Lesser General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""
+
+
+import base64
+import html
+import io
+import os
+import matplotlib.dates as mdates
+import matplotlib.pyplot as plt
+from matplotlib.backends.backend_pdf import PdfPages
+from matplotlib.dates import DateFormatter
+from matplotlib.figure import Figure
+from matplotlib.ticker import PercentFormatter
+from typing import Iterable, List
+
+from data_struct import DateUtils, PerformancePortfolioComparison
+
+
+class ProfitChartReport:
+    """Write the profit ratio charts of a whole run into one multi-page PDF or static HTML file.
+
+    Unlike ``ProfitChartPlotter``, which builds a new figure for every date
+    range, the report sets up a single figure once and only swaps the line
+    data, title and legend of each chart before writing it out. The format
+    follows the file extension.
+    """
+
+    FORMATS = ('pdf', 'html')
+    HTML_DPI = 100
+
+    def __init__(self, output_path: str):
+        self.output_path = output_path
+        self.format = os.path.splitext(output_path)[1].lower().lstrip('.')
+        self._check_validity()
+
+        self.figure, self.ax = self._create_template()
+        self.lines = []
+        self.legend_labels = None
+        self.chart_count = 0
+
+        if self.format == 'pdf':
+            self.pdf = PdfPages(output_path)
+        else:
+            self.file = open(output_path, 'w', encoding='utf-8')
+            self.file.write(
+                "<!DOCTYPE html>\n<html>\n<head>\n<meta charset=\"utf-8\">\n"
+                "<title>Portfolio Comparison Report</title>\n"
+                "<style>body { font-family: sans-serif; } img { max-width: 100%; }</style>\n"
+                "</head>\n<body>\n"
+            )
+
+    def __enter__(self) -> 'ProfitChartReport':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def get_chart_count(self) -> int:
+        return self.chart_count
+
+    def close(self):
+        if self.format == 'pdf':
+            self.pdf.close()
+        else:
+            self.file.write("</body>\n</html>\n")
+            self.file.close()
+
+    def write_comparison(self, title: str, performance_portfolio_comparisons: Iterable[PerformancePortfolioComparison]):
+        if self.format == 'html':
+            self.file.write(f"<h1>{html.escape(title)}</h1>\n")
+
+        for ppc in performance_portfolio_comparisons:
+            date_range = ppc.get_date_range()
+            chart_title = (
+                f"{title} - Profit Ratios: {DateUtils.format_date(date_range.get_start_date())} "
+                f"to {DateUtils.format_date(date_range.get_end_date())}"
+            )
+            self._update_chart(chart_title, ppc)
+
+            if self.format == 'pdf':
+                self.pdf.savefig(self.figure)
+            else:
+                buffer = io.BytesIO()
+                self.figure.savefig(buffer, format='png', dpi=self.HTML_DPI)
+                image = base64.b64encode(buffer.getvalue()).decode('ascii')
+                self.file.write(
+                    f"<figure><img alt=\"{html.escape(chart_title)}\" src=\"data:image/png;base64,{image}\"></figure>\n"
+                )
+            self.chart_count += 1
+
+    def _create_template(self):
+        # Not registered with pyplot, so no window or GUI backend is involved
+        figure = Figure(figsize=(12, 6))
+        ax = figure.add_subplot()
+        ax.set_xlabel("Date", fontsize=12)
+        ax.set_ylabel("Profit Ratio", fontsize=12)
+        ax.yaxis.set_major_formatter(PercentFormatter(xmax=1.0))
+        ax.xaxis_date()
+        ax.xaxis.set_major_formatter(DateFormatter(DateUtils.get_date_format()))
+        ax.xaxis.set_major_locator(mdates.AutoDateLocator())
+        ax.grid(True, which='major', axis='y', linestyle='--', alpha=0.5)
+        # A fixed layout, as running tight_layout for every chart would cost as much as a new figure
+        figure.subplots_adjust(left=0.08, right=0.97, top=0.92, bottom=0.1)
+        return figure, ax
+
+    def _update_chart(self, chart_title: str, ppc: PerformancePortfolioComparison):
+        date_range = ppc.get_date_range()
+        performance_assets = ppc.get_performance_assets()
+        colors = plt.rcParams['axes.prop_cycle'].by_key()['color']
+
+        # Lines are created once and reused by every chart with at least as many portfolios
+        while len(self.lines) < len(performance_assets):
+            line, = self.ax.plot([], [], linewidth=2, color=colors[len(self.lines) % len(colors)])
+            self.lines.append(line)
+
+        labels = []
+        for line, performance_asset in zip(self.lines, performance_assets):
+            asset = performance_asset.get_asset()
+            line.set_data(mdates.date2num(asset.get_dates(date_range)), performance_asset.get_profit_ratios())
+            line.set_visible(True)
+            labels.append(
+                f"{asset.get_name()} ({asset.get_code()}){' [Default]' if performance_asset.is_set_default() else ''}"
+            )
+        for line in self.lines[len(performance_assets):]:
+            line.set_visible(False)
+
+        self.ax.set_title(chart_title, fontsize=14, weight='bold')
+        self.ax.relim(visible_only=True)
+        self.ax.autoscale_view()
+
+        # Consecutive ranges of a comparison share their portfolios, and so their legend
+        labels = tuple(labels)
+        if labels != self.legend_labels:
+            for line, label in zip(self.lines, labels):
+                line.set_label(label)
+            self.ax.legend(handles=self.lines[:len(labels)], title="Assets", fontsize=10, loc='upper left')
+            self.legend_labels = labels
+
+    def _check_validity(self) -> bool:
+        if not self.output_path:
+            raise ValueError("Report output path cannot be empty.")
+        if self.format not in self.FORMATS:
+            raise ValueError(f"Report file extension must be one of {', '.join('.' + f for f in self.FORMATS)}.")
+        return True
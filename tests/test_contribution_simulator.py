@@ -0,0 +1,55 @@
+"""
+custom-portfolio-analyzer - A tool to model, back-test, and compare the performance of your own custom portfolios.
+Copyright (C) 2025  Fevzi Babaoğlu
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Lesser General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""
+
+
+import numpy as np
+from datetime import date
+
+from analyze import ContributionSimulator, PortfolioPerformanceGenerator
+from data_struct import Asset, DateRange, Portfolio, PortfolioAsset, PortfolioComparison
+
+
+def make_asset(code, dates, values):
+    return Asset.from_arrays(
+        code=code,
+        name=f"Fund {code}",
+        dates=np.array(dates, dtype='datetime64[D]'),
+        values=np.array(values, dtype=np.float64),
+    )
+
+
+def test_lump_sum_matches_the_analyzer_for_distribution_paying_holdings():
+    dates = ['2001-09-03', '2001-09-04', '2001-09-05', '2001-09-06', '2001-09-07', '2001-09-10', '2001-09-11']
+    paying = make_asset('C01', dates, [8.0, 8.3, 7.6, 7.9, 8.1, 7.7, 8.4])
+    paying.set_distributions(
+        np.array(['2001-09-05', '2001-09-08'], dtype='datetime64[D]'), np.array([0.6, 0.4]),
+    )
+    other = make_asset('C02', dates, [12.0, 11.8, 12.1, 12.6, 12.2, 12.5, 12.9])
+    portfolio = Portfolio('Lump Sum', [PortfolioAsset(paying, 0.6, 0.2), PortfolioAsset(other, 0.4, 0.1)])
+    date_range = DateRange(date(2001, 9, 3), date(2001, 9, 11))
+
+    table = ContributionSimulator(
+        [paying, other], [PortfolioComparison('Distributions', [date_range], [portfolio])],
+    ).get_contribution_table()
+
+    values = PortfolioPerformanceGenerator(
+        portfolio, date_range,
+    ).get_portfolio_performance_asset().get_asset().get_values()
+    np.testing.assert_allclose(table['lump_sum_return'][0], values[-1] / values[0] - 1, rtol=1e-12)
+    # Without a schedule a single unit is invested, so the value path ends at the lump sum
+    np.testing.assert_allclose(table['final_value'][0], values[-1] / values[0], rtol=1e-12)
@@ -0,0 +1,51 @@
+"""
+custom-portfolio-analyzer - A tool to model, back-test, and compare the performance of your own custom portfolios.
+Copyright (C) 2025  Fevzi Babaoğlu
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Lesser General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""
+
+
+import numpy as np
+
+from analyze import CorrelationMatrixCalculator
+from data_struct import Asset
+
+
+def make_asset(code, dates, values):
+    return Asset.from_arrays(code=code, name=f"Fund {code}", dates=dates, values=values)
+
+
+def test_sparse_asset_is_correlated_on_its_own_returns():
+    rng = np.random.default_rng(7)
+    dates = np.arange(np.datetime64('1995-03-01'), np.datetime64('1995-03-01') + 60)
+    daily = np.exp(np.cumsum(rng.normal(0.0, 0.01, len(dates))))
+    other = np.exp(np.cumsum(rng.normal(0.0, 0.01, len(dates))))
+    # Priced every other day only, so it never has prices on two consecutive calendar dates
+    sparse_dates, sparse_values = dates[::2], 2 * daily[::2]
+
+    matrix = CorrelationMatrixCalculator([
+        make_asset('S1', dates, daily),
+        make_asset('S2', sparse_dates, sparse_values),
+        make_asset('S3', dates, other),
+    ]).get_matrix()
+
+    assert not np.isnan(matrix).any()
+    np.testing.assert_allclose(np.diag(matrix), 1.0)
+
+    # Pairwise over the dates the sparse asset has a return on: its two-day returns against the daily ones
+    sparse_returns = sparse_values[1:] / sparse_values[:-1] - 1
+    daily_returns = (daily[1:] / daily[:-1] - 1)[np.searchsorted(dates[1:], sparse_dates[1:])]
+    np.testing.assert_allclose(matrix[0, 1], np.corrcoef(daily_returns, sparse_returns)[0, 1])
+    np.testing.assert_allclose(matrix[0, 1], matrix[1, 0])
@@ -0,0 +1,54 @@
+"""
+custom-portfolio-analyzer - A tool to model, back-test, and compare the performance of your own custom portfolios.
+Copyright (C) 2025  Fevzi Babaoğlu
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Lesser General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""
+
+
+import logging
+
+import numpy as np
+
+from data_io import CurrencyConverter
+from data_struct import Asset
+
+
+def make_asset(code, dates, values, currency=None):
+    return Asset.from_arrays(
+        code=code, name=f"Fund {code}", dates=np.array(dates, dtype='datetime64[D]'),
+        values=np.array(values), currency=currency,
+    )
+
+
+def test_rates_past_a_gap_in_the_fx_series_are_not_carried_forward(caplog):
+    # No USDTRY rate between 1997-02-04 and 1997-03-03
+    fx_asset = make_asset('USDTRY', ['1997-02-03', '1997-02-04', '1997-03-03'], [2.0, 2.5, 4.0])
+    asset = make_asset(
+        'U01', ['1997-02-03', '1997-02-10', '1997-02-12', '1997-02-20', '1997-03-03'],
+        [10.0, 11.0, 12.0, 13.0, 14.0], currency='USD',
+    )
+
+    with caplog.at_level(logging.WARNING):
+        converted = CurrencyConverter([fx_asset], 'TRY', max_stale_days=7).convert(asset)
+
+    dates, values = converted.get_dated_series()
+    # 1997-02-12 and 1997-02-20 are more than 7 days past the last rate
+    np.testing.assert_array_equal(dates, np.array(['1997-02-03', '1997-02-10', '1997-03-03'], dtype='datetime64[D]'))
+    np.testing.assert_allclose(values, [20.0, 27.5, 56.0])
+    assert "No USDTRY rate within 7 days before 2 of the dates" in caplog.text
+
+    # Without a limit the last rate is carried forward through the gap
+    unlimited = CurrencyConverter([fx_asset], 'TRY', max_stale_days=None).convert(asset)
+    np.testing.assert_allclose(unlimited.get_values(), [20.0, 27.5, 30.0, 32.5, 56.0])
@@ -0,0 +1,52 @@
+"""
+custom-portfolio-analyzer - A tool to model, back-test, and compare the performance of your own custom portfolios.
+Copyright (C) 2025  Fevzi Babaoğlu
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Lesser General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""
+
+
+import io
+import json
+import time
+
+import pytest
+
+from data_io import JSONStreamReader
+
+
+ITEMS = [{"a": [1, 2.5e-3, "x\\\"y ]", None, True]}, 123456789, -1.25e10, "str ]", [], {}, [[[]]], 0]
+
+
+@pytest.mark.parametrize('chunk_size', [1, 2, 3, 7, 64])
+def test_items_split_across_chunks(chunk_size):
+    text = json.dumps(ITEMS)
+    assert list(JSONStreamReader(io.StringIO(text), chunk_size).iter_array()) == ITEMS
+
+
+def test_large_item_is_read_in_linear_time():
+    item = {"portfolios": [{"title": f"P{i}", "weights": [0.25] * 8} for i in range(60000)]}
+    text = json.dumps([item, 1])
+
+    start = time.perf_counter()
+    json.loads(text)
+    loads_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    items = list(JSONStreamReader(io.StringIO(text), chunk_size=4 * 1024).iter_array())
+    stream_time = time.perf_counter() - start
+
+    assert items == [item, 1]
+    # Decoding again from the start after every 4 KB chunk would take hundreds of times longer
+    assert stream_time < 20 * loads_time + 0.05
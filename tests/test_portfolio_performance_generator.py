@@ -0,0 +1,71 @@
+"""
+custom-portfolio-analyzer - A tool to model, back-test, and compare the performance of your own custom portfolios.
+Copyright (C) 2025  Fevzi Babaoğlu
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Lesser General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""
+
+
+import numpy as np
+from datetime import date
+
+from analyze import PortfolioPerformanceGenerator
+from data_struct import Asset, DateRange, Portfolio, PortfolioAsset, TradingCalendar
+
+
+class CalendarGrowingAsset(Asset):
+    """An asset that adds a date to the shared calendar before each of its reads, as a concurrent load would."""
+
+    __slots__ = ('pending_dates',)
+
+    def _get_current_offsets(self):
+        if self.pending_dates:
+            TradingCalendar.extend(np.array([self.pending_dates.pop(0)], dtype='datetime64[D]'))
+        return super()._get_current_offsets()
+
+
+def make_asset(code, dates, values, asset_class=Asset):
+    return asset_class.from_arrays(
+        code=code,
+        name=f"Fund {code}",
+        dates=np.array(dates, dtype='datetime64[D]'),
+        values=np.array(values, dtype=np.float64),
+    )
+
+
+def test_calendar_growth_during_a_computation_keeps_every_common_date():
+    dates = ['1994-01-03', '1994-01-05', '1994-01-07']
+    first = make_asset('G1', dates, [1.0, 2.0, 4.0])
+    second = make_asset('G2', dates, [1.0, 1.0, 1.0], CalendarGrowingAsset)
+    second.pending_dates = ['1994-01-04', '1994-01-06', '1994-01-02']
+    portfolio = Portfolio('Growth Pair', [PortfolioAsset(first, 0.5, 0.0), PortfolioAsset(second, 0.5, 0.0)])
+
+    performance_asset = PortfolioPerformanceGenerator(
+        portfolio, DateRange(date(1994, 1, 1), date(1994, 1, 31)),
+    ).get_portfolio_performance_asset()
+
+    np.testing.assert_array_equal(performance_asset.get_asset().get_dates(), np.array(dates, dtype='datetime64[D]'))
+    # Half of the portfolio doubles twice while the other half stays flat
+    np.testing.assert_allclose(performance_asset.get_profit_ratios(), [0.0, 0.5, 1.5])
+
+
+def test_asset_reads_follow_calendar_growth():
+    asset = make_asset('G3', ['1994-02-01', '1994-02-03'], [1.0, 2.0])
+    TradingCalendar.extend(np.array(['1994-02-02'], dtype='datetime64[D]'))
+
+    dates, values = asset.get_dated_series(DateRange(date(1994, 2, 2), date(1994, 2, 28)))
+    np.testing.assert_array_equal(dates, np.array(['1994-02-03'], dtype='datetime64[D]'))
+    np.testing.assert_array_equal(values, [2.0])
+    assert [price.get_date() for price in asset.get_prices()] == [date(1994, 2, 1), date(1994, 2, 3)]
+    np.testing.assert_array_equal(asset.get_values_on(np.array(['1994-02-03'], dtype='datetime64[D]')), [2.0])
@@ -0,0 +1,39 @@
+"""
+custom-portfolio-analyzer - A tool to model, back-test, and compare the performance of your own custom portfolios.
+Copyright (C) 2025  Fevzi Babaoğlu
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Lesser General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""
+
+
+import pytest
+
+from analyze import check_sapi_backends
+from analyze.sapi_backends import CHECK_TOLERANCES, SAPI_BACKENDS
+
+
+@pytest.mark.parametrize('precision', ['float64', 'float32'])
+@pytest.mark.parametrize('name', list(SAPI_BACKENDS))
+def test_backend_matches_reference(name, precision):
+    backend = SAPI_BACKENDS[name]
+    if name == 'numba':
+        pytest.importorskip('numba')
+    if precision not in backend.precisions:
+        pytest.skip(f"The {name} SAPI backend does not support {precision}.")
+    assert backend.is_available()
+
+    # Raises ValueError if any available backend exceeds the tolerance of the precision
+    deviations = check_sapi_backends(trials=50, seed=1, precision=precision)
+    assert deviations[name] is not None
+    assert deviations[name] <= CHECK_TOLERANCES[precision]
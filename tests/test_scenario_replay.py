@@ -0,0 +1,64 @@
+"""
+custom-portfolio-analyzer - A tool to model, back-test, and compare the performance of your own custom portfolios.
+Copyright (C) 2025  Fevzi Babaoğlu
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Lesser General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""
+
+
+import numpy as np
+from datetime import date
+
+from analyze import PortfolioPerformanceGenerator, ScenarioReplay
+from data_struct import Asset, DateRange, Portfolio, PortfolioAsset, PortfolioComparison, Scenario
+
+
+def make_asset(code, dates, values):
+    return Asset.from_arrays(
+        code=code,
+        name=f"Fund {code}",
+        dates=np.array(dates, dtype='datetime64[D]'),
+        values=np.array(values, dtype=np.float64),
+    )
+
+
+def test_replay_matches_the_analyzer_for_distribution_paying_holdings():
+    dates = [
+        '1999-06-01', '1999-06-02', '1999-06-03', '1999-06-04', '1999-06-07',
+        '1999-06-08', '1999-06-09', '1999-06-10', '1999-06-11', '1999-06-14',
+    ]
+    paying = make_asset('R01', dates, [20.0, 20.4, 19.1, 19.5, 18.2, 18.9, 19.6, 18.8, 19.9, 20.3])
+    paying.set_distributions(
+        np.array(['1999-06-02', '1999-06-04', '1999-06-09'], dtype='datetime64[D]'), np.array([0.5, 0.9, 1.1]),
+    )
+    other = make_asset('R02', dates, [3.0, 3.1, 3.0, 2.9, 3.2, 3.3, 3.1, 3.2, 3.4, 3.3])
+    portfolio = Portfolio(
+        'Income Mix', [PortfolioAsset(paying, 0.7, 0.15), PortfolioAsset(other, 0.3, 0.1)], is_set_default=True,
+    )
+    # Starts on the first ex-date, which the analyzer does not reinvest
+    date_range = DateRange(date(1999, 6, 2), date(1999, 6, 14))
+
+    table = ScenarioReplay(
+        [paying, other],
+        [PortfolioComparison('Income', [date_range], [portfolio])],
+        [Scenario('June', date_range)],
+    ).get_scenario_table()
+
+    values = PortfolioPerformanceGenerator(
+        portfolio, date_range,
+    ).get_portfolio_performance_asset().get_asset().get_values()
+    np.testing.assert_allclose(table['return'][0], values[-1] / values[0] - 1, rtol=1e-12)
+    np.testing.assert_allclose(
+        table['max_drawdown'][0], np.min(values / np.maximum.accumulate(values) - 1), rtol=1e-12,
+    )
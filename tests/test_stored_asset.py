@@ -0,0 +1,49 @@
+"""
+custom-portfolio-analyzer - A tool to model, back-test, and compare the performance of your own custom portfolios.
+Copyright (C) 2025  Fevzi Babaoğlu
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Lesser General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""
+
+
+import threading
+from datetime import date
+
+import numpy as np
+
+from data_io import SQLitePriceStore, StoredAsset
+from data_struct import Asset, DateRange
+
+
+def test_window_without_prices_matches_in_memory_asset(tmp_path):
+    # Friday and the following Monday, so the weekend in between has no rows
+    dates = np.array(['1996-05-03', '1996-05-06'], dtype='datetime64[D]')
+    asset = Asset.from_arrays(code='H01', name="Fund H01", dates=dates, values=np.array([1.5, 1.6]))
+    weekend = DateRange(start_date=date(1996, 5, 4), end_date=date(1996, 5, 5))
+
+    with SQLitePriceStore(str(tmp_path / 'prices.db')) as price_store:
+        price_store.write_assets([asset])
+        stored_asset = StoredAsset(
+            price_store=price_store,
+            price_store_lock=threading.Lock(),
+            code='H01',
+            name="Fund H01",
+            date_range=price_store.get_date_range('H01'),
+        )
+
+        for candidate in (asset, stored_asset):
+            stored_dates, values = candidate.get_dated_series(weekend)
+            assert len(stored_dates) == 0 and len(values) == 0
+            assert candidate.get_prices(weekend) == []
+            assert len(candidate.get_values(weekend)) == 0
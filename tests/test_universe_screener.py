@@ -0,0 +1,56 @@
+"""
+custom-portfolio-analyzer - A tool to model, back-test, and compare the performance of your own custom portfolios.
+Copyright (C) 2025  Fevzi Babaoğlu
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Lesser General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""
+
+
+import numpy as np
+from datetime import date
+
+from analyze import PortfolioPerformanceGenerator, UniverseScreener
+from data_struct import Asset, DateRange, Portfolio, PortfolioAsset, PortfolioComparison
+
+
+def make_asset(code, dates, values):
+    return Asset.from_arrays(
+        code=code,
+        name=f"Fund {code}",
+        dates=np.array(dates, dtype='datetime64[D]'),
+        values=np.array(values, dtype=np.float64),
+    )
+
+
+def test_assets_are_ranked_on_their_total_return():
+    dates = ['1998-03-02', '1998-03-03', '1998-03-04', '1998-03-05', '1998-03-06', '1998-03-09']
+    paying = make_asset('D01', dates, [10.0, 10.5, 10.0, 9.6, 9.5, 9.8])
+    # Drops by its distributions, so on prices alone it would rank below the flat asset
+    paying.set_distributions(
+        np.array(['1998-03-03', '1998-03-05'], dtype='datetime64[D]'), np.array([0.4, 1.0]),
+    )
+    flat = make_asset('F01', dates, [5.0] * len(dates))
+    date_range = DateRange(date(1998, 3, 3), date(1998, 3, 9))
+    default_portfolio = Portfolio('Paying Fund', [PortfolioAsset(paying, 1.0, 0.15)], is_set_default=True)
+
+    table = UniverseScreener(
+        [flat, paying], [PortfolioComparison('Distributions', [date_range], [default_portfolio])],
+    ).get_screening_table()
+
+    analyzer_return = PortfolioPerformanceGenerator(
+        default_portfolio, date_range,
+    ).get_portfolio_performance_asset().get_profit_ratios()[-1]
+    assert list(table['code']) == ['D01', 'F01']
+    np.testing.assert_allclose(table['return'][0], analyzer_return, rtol=1e-12)
+    np.testing.assert_allclose(table['excess_return'][0], 0.0, atol=1e-12)